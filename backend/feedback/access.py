@@ -0,0 +1,120 @@
+"""
+Board visibility: the set of board ids a user may read, cached per user.
+
+Cache keys embed two generation tokens, one shared by everybody (bumped when any
+board is created, deleted or changes visibility) and one per user (bumped when the
+user's memberships change). Invalidating is a single cache write, stale entries
+simply expire.
+
+The entries live in the 'access' cache (settings.ACCESS_CACHE_BACKEND). An invalidation
+only reaches the processes that share that cache: with the per-process locmem backend
+another worker keeps its entries until ACCESS_CACHE_TIMEOUT, so run several workers only
+with a shared (file or redis) backend.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+
+from .models import Board
+from .permissions import is_admin_or_moderator
+
+ACCESS_CACHE_ALIAS = 'access'
+PUBLIC_GENERATION_KEY = 'board-access:public-gen'
+
+
+def access_cache():
+    return caches[ACCESS_CACHE_ALIAS]
+
+
+def _user_generation_key(user_id):
+    return f'board-access:user-gen:{user_id}'
+
+
+def _generation(key):
+    cache = access_cache()
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+async def _ageneration(key):
+    cache = access_cache()
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, uuid.uuid4().hex, None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def invalidate_public_access():
+    access_cache().set(PUBLIC_GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_user_access(*user_ids):
+    access_cache().set_many({_user_generation_key(user_id): uuid.uuid4().hex for user_id in user_ids}, None)
+
+
+def _visible_boards(user):
+    if user.is_authenticated:
+        visible = Q(is_public=True) | Q(members=user) | Q(created_by=user)
+    else:
+        visible = Q(is_public=True)
+    return Board.objects.filter(visible).values_list('id', flat=True).distinct()
+
+
+def _access_key(user, public_generation, user_generation=None):
+    if user.is_authenticated:
+        return f'board-access:user:{user.pk}:{public_generation}:{user_generation}'
+    return f'board-access:anonymous:{public_generation}'
+
+
+def accessible_board_ids(user):
+    """
+    None if the user can read every board (Admin/Moderator), otherwise a frozenset of
+    ids: public boards plus boards the user is a member or the creator of.
+    """
+    if user.is_authenticated and is_admin_or_moderator(user):
+        return None
+    user_generation = _generation(_user_generation_key(user.pk)) if user.is_authenticated else None
+    key = _access_key(user, _generation(PUBLIC_GENERATION_KEY), user_generation)
+
+    cache = access_cache()
+    board_ids = cache.get(key)
+    if board_ids is None:
+        board_ids = frozenset(_visible_boards(user))
+        cache.set(key, board_ids, settings.ACCESS_CACHE_TIMEOUT)
+    return board_ids
+
+
+async def aaccessible_board_ids(user):
+    """accessible_board_ids for async views (expects the roles loaded with aget_role_names)."""
+    if user.is_authenticated and is_admin_or_moderator(user):
+        return None
+    user_generation = await _ageneration(_user_generation_key(user.pk)) if user.is_authenticated else None
+    key = _access_key(user, await _ageneration(PUBLIC_GENERATION_KEY), user_generation)
+
+    cache = access_cache()
+    board_ids = await cache.aget(key)
+    if board_ids is None:
+        board_ids = frozenset([board_id async for board_id in _visible_boards(user)])
+        await cache.aset(key, board_ids, settings.ACCESS_CACHE_TIMEOUT)
+    return board_ids
+
+
+def _restrict(queryset, board_ids, board_field):
+    if board_ids is None:
+        return queryset
+    return queryset.filter(**{f'{board_field}__in': board_ids})
+
+
+def filter_accessible(queryset, user, board_field='board_id'):
+    """Restrict queryset to rows on boards the user can read, as a plain `board_id IN (...)`."""
+    return _restrict(queryset, accessible_board_ids(user), board_field)
+
+
+async def afilter_accessible(queryset, user, board_field='board_id'):
+    return _restrict(queryset, await aaccessible_board_ids(user), board_field)
@@ -11,7 +11,7 @@ class BoardAdmin(admin.ModelAdmin):
 
 @admin.register(Feedback)
 class FeedbackAdmin(admin.ModelAdmin):
-    list_display = ('id','title','board','created_by','status','created_at',)
+    list_display = ('id','title','board','created_by','status','upvotes_count','created_at',)
     search_fields = ('title','body','created_by__username','board__name',)
     list_filter = ('status','board','created_at',)
     ordering = ('-created_at',)
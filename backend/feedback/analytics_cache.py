@@ -0,0 +1,140 @@
+"""
+Response cache for the analytics endpoints.
+
+Entries are keyed by endpoint, query parameters and the current version of the board
+they read (or of "all boards" when no board is given). Writes that change analytics
+bump those versions (invalidate_boards), which also changes the ETag, so clients
+revalidating with If-None-Match get a 304 until the data actually changes.
+"""
+import hashlib
+import inspect
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from .permissions import is_admin_or_moderator
+
+ANALYTICS_CACHE_ALIAS = 'analytics'
+ALL_BOARDS = 'all'
+
+
+def analytics_cache():
+    return caches[ANALYTICS_CACHE_ALIAS]
+
+
+def _version_key(board_id):
+    return f'analytics:version:{board_id}'
+
+
+def board_version(board_id):
+    """(token, last modified timestamp) for one board, or ALL_BOARDS."""
+    cache = analytics_cache()
+    version = cache.get(_version_key(board_id))
+    if version is None:
+        cache.add(_version_key(board_id), (uuid.uuid4().hex, time.time()), None)
+        version = cache.get(_version_key(board_id))
+    return version
+
+
+async def aboard_version(board_id):
+    cache = analytics_cache()
+    version = await cache.aget(_version_key(board_id))
+    if version is None:
+        await cache.aadd(_version_key(board_id), (uuid.uuid4().hex, time.time()), None)
+        version = await cache.aget(_version_key(board_id))
+    return version
+
+
+def invalidate_boards(*board_ids):
+    """Drop cached analytics for the given boards and for the all-boards views."""
+    version = (uuid.uuid4().hex, time.time())
+    keys = {_version_key(board_id) for board_id in board_ids}
+    keys.add(_version_key(ALL_BOARDS))
+    analytics_cache().set_many(dict.fromkeys(keys, version), None)
+
+
+def _cache_digest(request, endpoint, params, token):
+    values = [request.query_params.get(name, '') for name in ('board', 'from', 'to', *params)]
+    # default ranges are relative to today, so the date is part of the key
+    today = datetime.now(timezone.utc).date().isoformat()
+    return hashlib.sha1(json.dumps([endpoint, token, today, values]).encode()).hexdigest()
+
+
+def _finish(response, etag, modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(modified)
+    # browsers keep the response but must revalidate it on every use
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def cached_analytics(endpoint, params=()):
+    """
+    Cache a GET analytics view. `params` are the endpoint specific query parameters
+    (granularity, by, limit...) on top of board/from/to. Works for the async views as
+    well (async_views.py), which share the cache entries.
+    """
+    def decorator(view):
+        if inspect.iscoroutinefunction(view):
+            return _async_cached(view, endpoint, params)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # forbidden responses come from the view itself and are never cached
+            if not (request.user.is_authenticated and is_admin_or_moderator(request.user)):
+                return view(request, *args, **kwargs)
+
+            token, modified = board_version(request.query_params.get('board') or ALL_BOARDS)
+            digest = _cache_digest(request, endpoint, params, token)
+            etag = f'"{digest}"'
+
+            if etag in request.headers.get('If-None-Match', ''):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                cache = analytics_cache()
+                data = cache.get(f'analytics:{digest}')
+                if data is None:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+                    cache.set(f'analytics:{digest}', response.data)
+                else:
+                    response = Response(data)
+            return _finish(response, etag, modified)
+        return wrapper
+    return decorator
+
+
+def _async_cached(view, endpoint, params):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not (request.user.is_authenticated and is_admin_or_moderator(request.user)):
+            return await view(request, *args, **kwargs)
+
+        token, modified = await aboard_version(request.query_params.get('board') or ALL_BOARDS)
+        digest = _cache_digest(request, endpoint, params, token)
+        etag = f'"{digest}"'
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache = analytics_cache()
+            data = await cache.aget(f'analytics:{digest}')
+            if data is None:
+                response = await view(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                await cache.aset(f'analytics:{digest}', response.data)
+            else:
+                response = Response(data)
+        return _finish(response, etag, modified)
+    return wrapper
@@ -0,0 +1,185 @@
+"""
+Columnar analytics over feedback rows (the /analytics/time_to_complete/, funnel/,
+upvote_velocity/ and rolling/ endpoints).
+
+The rollup table (rollups.py) only keeps counts per (board, day, status), which is not
+enough for durations or per-item rates. Instead of one ORM query per metric, the few
+columns these reports need are read once with values_list into NumPy arrays, and
+percentiles, histograms, cohort funnels and rolling windows are computed on the arrays.
+
+Time is handled as UTC epoch seconds (float64), days and weeks as integer offsets from
+the epoch, so grouping by day/week/board is np.unique/np.bincount over int arrays.
+
+Time to complete is measured up to the last update of completed feedback, and the funnel
+stages come from the current status; the exact lead and cycle times come from the status
+log instead (status_history.py, /analytics/cycle_time/).
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from django.utils import timezone
+
+from .models import Board, Feedback
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+PERCENTILES = (50, 75, 90, 95)
+# upper edges (hours) of the time-to-complete histogram bins, the last bin is open
+TIME_TO_COMPLETE_BINS = (1, 4, 12, 24, 48, 96, 168, 336, 720)
+# velocity is upvotes per day of age, counting at least one day so new items do not spike
+MIN_AGE_DAYS = 1
+DEFAULT_WINDOW = 7
+MAX_WINDOW = 90
+
+STARTED = (Feedback.STATUS_IN_PROGRESS, Feedback.STATUS_COMPLETED)
+
+
+class FeedbackColumns:
+    """One array per column, all of the same length (one entry per feedback)."""
+
+    FIELDS = ('board_id', 'status', 'created_at', 'updated_at', 'upvotes_count')
+
+    def __init__(self, rows):
+        board_ids, statuses, created, updated, upvotes = zip(*rows) if rows else ((),) * 5
+        self.board_id = np.fromiter(board_ids, dtype=np.int64, count=len(rows))
+        self.status = np.array(statuses, dtype=object)
+        self.created = np.fromiter((dt.timestamp() for dt in created), dtype=np.float64, count=len(rows))
+        self.updated = np.fromiter((dt.timestamp() for dt in updated), dtype=np.float64, count=len(rows))
+        self.upvotes = np.fromiter(upvotes, dtype=np.int64, count=len(rows))
+
+    def __len__(self):
+        return len(self.board_id)
+
+    @classmethod
+    def fetch(cls, queryset):
+        return cls(list(queryset.values_list(*cls.FIELDS)))
+
+    def status_in(self, statuses):
+        return np.isin(self.status, statuses)
+
+
+def _day(day_number):
+    return (date(1970, 1, 1) + timedelta(days=int(day_number))).isoformat()
+
+
+def _round(value, digits=2):
+    return round(float(value), digits)
+
+
+def percentile_summary(values):
+    if not len(values):
+        return {f'p{pct}': None for pct in PERCENTILES}
+    return {f'p{pct}': _round(value) for pct, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def group_percentiles(groups, values, group_count, pct):
+    """
+    np.percentile(values[groups == g], pct) (linear interpolation) for every group g in
+    one pass: sort by (group, value) and interpolate inside each group's slice.
+    """
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    position = starts + (pct / 100) * np.maximum(counts - 1, 0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, starts + np.maximum(counts - 1, 0))
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def time_to_complete(columns):
+    """Percentiles and histogram (hours) of created -> completed for completed feedback."""
+    completed = columns.status_in([Feedback.STATUS_COMPLETED])
+    hours = (columns.updated[completed] - columns.created[completed]) / SECONDS_PER_HOUR
+    edges = np.array((0, *TIME_TO_COMPLETE_BINS, np.inf))
+    counts, _ = np.histogram(hours, bins=edges)
+    return {
+        'count': int(completed.sum()),
+        'mean_hours': _round(hours.mean()) if len(hours) else None,
+        'percentiles_hours': percentile_summary(hours),
+        'histogram': [
+            {'le_hours': None if np.isinf(upper) else int(upper), 'count': int(count)}
+            for upper, count in zip(edges[1:], counts)
+        ],
+    }
+
+
+def funnel(columns):
+    """Weekly cohorts (by creation week, starting Monday): created -> started -> completed."""
+    days = np.floor_divide(columns.created, SECONDS_PER_DAY).astype(np.int64)
+    # 1970-01-01 was a Thursday, shift by 3 days so weeks start on Monday
+    weeks = np.floor_divide(days + 3, 7)
+    cohorts, cohort_of = np.unique(weeks, return_inverse=True)
+    created = np.bincount(cohort_of, minlength=len(cohorts))
+    started = np.bincount(cohort_of, weights=columns.status_in(STARTED), minlength=len(cohorts))
+    completed = np.bincount(cohort_of, weights=columns.status_in([Feedback.STATUS_COMPLETED]), minlength=len(cohorts))
+
+    def stages(created, started, completed):
+        return {
+            'created': int(created),
+            'started': int(started),
+            'completed': int(completed),
+            'started_rate': _round(started / created, 3) if created else 0.0,
+            'completed_rate': _round(completed / created, 3) if created else 0.0,
+        }
+
+    return {
+        'total': stages(created.sum(), started.sum(), completed.sum()),
+        'cohorts': [
+            {'cohort': _day(week * 7 - 3), **stages(*counts)}
+            for week, *counts in zip(cohorts, created, started, completed)
+        ],
+    }
+
+
+def upvote_velocity(columns, now=None):
+    """Upvotes per day of age, per board: mean, p50 and p90 over the board's feedback."""
+    now = (now or timezone.now()).timestamp()
+    age_days = np.maximum((now - columns.created) / SECONDS_PER_DAY, MIN_AGE_DAYS)
+    velocity = columns.upvotes / age_days
+    boards, board_of = np.unique(columns.board_id, return_inverse=True)
+    counts = np.bincount(board_of, minlength=len(boards))
+    upvotes = np.bincount(board_of, weights=columns.upvotes, minlength=len(boards))
+    means = np.bincount(board_of, weights=velocity, minlength=len(boards)) / np.maximum(counts, 1)
+    p50 = group_percentiles(board_of, velocity, len(boards), 50)
+    p90 = group_percentiles(board_of, velocity, len(boards), 90)
+
+    names = dict(Board.objects.filter(id__in=boards.tolist()).values_list('id', 'name'))
+    result = [
+        {'board_id': int(board_id), 'board_name': names.get(int(board_id)), 'feedback': int(count),
+         'upvotes': int(total), 'mean_per_day': _round(mean, 3), 'p50_per_day': _round(median, 3),
+         'p90_per_day': _round(high, 3)}
+        for board_id, count, total, mean, median, high in zip(boards, counts, upvotes, means, p50, p90)
+    ]
+    result.sort(key=lambda row: (-row['mean_per_day'], row['board_id']))
+    return result
+
+
+def rolling(columns, start, end, window=DEFAULT_WINDOW):
+    """
+    Per day between start and end (dates, inclusive): feedback created, feedback completed
+    (on the day of its last update), and their means over the trailing `window` days.
+    Days before start count as empty.
+    """
+    first = (start - date(1970, 1, 1)).days
+    length = (end - start).days + 1
+    if length <= 0:
+        return []
+
+    def per_day(timestamps):
+        days = np.floor_divide(timestamps, SECONDS_PER_DAY).astype(np.int64) - first
+        return np.bincount(days[(days >= 0) & (days < length)], minlength=length)
+
+    def trailing_mean(counts):
+        sums = np.cumsum(counts)
+        sums[window:] = sums[window:] - sums[:-window]
+        return sums / window
+
+    created = per_day(columns.created)
+    completed = per_day(columns.updated[columns.status_in([Feedback.STATUS_COMPLETED])])
+    created_mean, completed_mean = trailing_mean(created), trailing_mean(completed)
+    return [
+        {'day': _day(first + offset), 'created': int(created[offset]), 'completed': int(completed[offset]),
+         'created_rolling': _round(created_mean[offset]), 'completed_rolling': _round(completed_mean[offset])}
+        for offset in range(length)
+    ]
@@ -1,15 +1,18 @@
 # backend/feedback/analytics_views.py
-from datetime import datetime, timedelta
-from django.db.models import Count
-from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
+from datetime import datetime, time, timedelta
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek, TruncMonth
+from django.utils import timezone
 from django.utils.dateparse import parse_date
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework import permissions, status
 from rest_framework.response import Response
 
-from .models import Feedback, Board
+from .models import Feedback, FeedbackDailyStat
 from .permissions import is_admin_or_moderator
+from .analytics_cache import cached_analytics
+from . import analytics_engine, status_history
 
 # helper: parse date range strings into date objects (YYYY-MM-DD)
 def parse_date_range(from_s, to_s, default_days=30):
@@ -28,57 +31,59 @@ def parse_date_range(from_s, to_s, default_days=30):
         end = datetime.utcnow().date()
     return start, end
 
+def daily_stats(board_id, start, end):
+    """Rollup rows (see rollups.py) for feedback created between start and end, inclusive."""
+    qs = FeedbackDailyStat.objects.filter(day__gte=start, day__lte=end)
+    if board_id:
+        qs = qs.filter(board_id=board_id)
+    return qs
+
+def day_bounds(start, end):
+    """[start, end) datetimes covering the days start..end (inclusive)."""
+    return (timezone.make_aware(datetime.combine(start, time.min)),
+            timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)))
+
+def created_between(start, end):
+    """created_at range for the days start..end (inclusive) as plain datetime bounds,
+    so the created_at indexes apply (created_at__date wraps the column in a function)."""
+    low, high = day_bounds(start, end)
+    return {"created_at__gte": low, "created_at__lt": high}
+
 def require_admin_mod(request):
     return request.user and request.user.is_authenticated and is_admin_or_moderator(request.user)
 
 
-@api_view(["GET"])
-@permission_classes([permissions.IsAuthenticated])
-def analytics_summary(request):
-    """Return counts: total, open, in_progress, completed"""
-    if not require_admin_mod(request):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
-    board_id = request.query_params.get("board")
-    from_s = request.query_params.get("from")
-    to_s = request.query_params.get("to")
-    start, end = parse_date_range(from_s, to_s, default_days=90)
+# Each endpoint is split into a query (lazy queryset built from the query params) and a
+# shaping step over the fetched rows, so the async views (async_views.py) share them.
 
-    qs = Feedback.objects.filter(created_at__date__gte=start, created_at__date__lte=end)
-    if board_id:
-        qs = qs.filter(board_id=board_id)
+def summary_query(params):
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=90)
+    return daily_stats(params.get("board"), start, end).values("status").annotate(
+        count=Sum("created_count"), upvotes=Sum("upvote_count"), comments=Sum("comment_count"))
 
-    total = qs.count()
-    by_status = qs.values("status").annotate(count=Count("id"))
+def summary_data(by_status):
     status_map = {r["status"]: r["count"] for r in by_status}
-
-    return Response({
-        "total": total,
+    return {
+        "total": sum(status_map.values()),
         "open": status_map.get("open", 0),
         "in_progress": status_map.get("in_progress", 0),
         "completed": status_map.get("completed", 0),
-    })
-
+        "upvotes": sum(r["upvotes"] for r in by_status),
+        "comments": sum(r["comments"] for r in by_status),
+    }
 
-@api_view(["GET"])
-@permission_classes([permissions.IsAuthenticated])
-def analytics_top_voted(request):
-    """Return top N feedback by upvotes in range"""
-    if not require_admin_mod(request):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+def top_voted_query(params):
+    board_id = params.get("board")
+    limit = int(params.get("limit", 5))
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=365)
 
-    board_id = request.query_params.get("board")
-    limit = int(request.query_params.get("limit", 5))
-    from_s = request.query_params.get("from")
-    to_s = request.query_params.get("to")
-    start, end = parse_date_range(from_s, to_s, default_days=365)
-
-    qs = Feedback.objects.annotate(upvotes_count=Count("upvotes"))\
-         .filter(created_at__date__gte=start, created_at__date__lte=end)
+    qs = Feedback.objects.select_related("board").filter(**created_between(start, end))
     if board_id:
         qs = qs.filter(board_id=board_id)
+    # newest first among ties; -id matches the (-upvotes_count, -id) indexes
+    return qs.order_by("-upvotes_count", "-id")[:limit]
 
-    top = qs.order_by("-upvotes_count", "-created_at")[:limit]
+def top_voted_data(top):
     result = []
     for f in top:
         result.append({
@@ -90,39 +95,20 @@ def analytics_top_voted(request):
             "status": f.status,
             "created_at": f.created_at,
         })
-    return Response(result)
+    return result
 
-
-@api_view(["GET"])
-@permission_classes([permissions.IsAuthenticated])
-def analytics_trends(request):
-    """
-    Return time series of created feedback counts.
-    Query params:
-      - granularity: daily | weekly | monthly
-      - board: optional board id
-      - from, to: YYYY-MM-DD
-    """
-    if not require_admin_mod(request):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
-    gran = request.query_params.get("granularity", "daily")
-    board_id = request.query_params.get("board")
-    from_s = request.query_params.get("from")
-    to_s = request.query_params.get("to")
-    start, end = parse_date_range(from_s, to_s, default_days=30)
-
-    qs = Feedback.objects.filter(created_at__date__gte=start, created_at__date__lte=end)
-    if board_id:
-        qs = qs.filter(board_id=board_id)
+def trends_query(params):
+    gran = params.get("granularity", "daily")
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=30)
+    qs = daily_stats(params.get("board"), start, end)
 
     if gran == "weekly":
-        series = qs.annotate(period=TruncWeek("created_at")).values("period").annotate(count=Count("id")).order_by("period")
-    elif gran == "monthly":
-        series = qs.annotate(period=TruncMonth("created_at")).values("period").annotate(count=Count("id")).order_by("period")
-    else:
-        series = qs.annotate(period=TruncDay("created_at")).values("period").annotate(count=Count("id")).order_by("period")
+        return qs.annotate(period=TruncWeek("day")).values("period").annotate(count=Sum("created_count")).order_by("period")
+    if gran == "monthly":
+        return qs.annotate(period=TruncMonth("day")).values("period").annotate(count=Sum("created_count")).order_by("period")
+    return qs.values(period=F("day")).annotate(count=Sum("created_count")).order_by("period")
 
+def trends_data(series):
     data = []
     for row in series:
         period = row["period"]
@@ -135,11 +121,83 @@ def analytics_trends(request):
             except Exception:
                 period_val = str(period)
         data.append({"period": period_val, "count": row["count"]})
-    return Response(data)
+    return data
+
+def distribution_query(params):
+    """None when there is nothing to group by."""
+    by = params.get("by", "status")
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=365)
+    qs = daily_stats(params.get("board"), start, end)
+
+    if by == "board":
+        return qs.values("board_id", "board__name").annotate(count=Sum("created_count")).order_by("-count")
+    if by == "tag":
+        # Feedback has no tags yet, nothing to group by
+        return None
+    return qs.values("status").annotate(count=Sum("created_count")).order_by("-count")
+
+def columns_query(params, default_days=90):
+    """Feedback created in the range, for the column reports (see analytics_engine.py)."""
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=default_days)
+    qs = Feedback.objects.filter(**created_between(start, end))
+    if params.get("board"):
+        qs = qs.filter(board_id=params.get("board"))
+    return qs
+
+def window_param(params):
+    try:
+        window = int(params.get("window", analytics_engine.DEFAULT_WINDOW))
+    except (TypeError, ValueError):
+        return analytics_engine.DEFAULT_WINDOW
+    return min(max(window, 1), analytics_engine.MAX_WINDOW)
+
+def distribution_data(agg, by):
+    if agg is None:
+        return []
+    if by == "board":
+        return [{"key": (r["board__name"] or r["board_id"]), "count": r["count"]} for r in agg]
+    return [{"key": r["status"], "count": r["count"]} for r in agg]
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("summary", params=())
+def analytics_summary(request):
+    """Return counts: total, open, in_progress, completed"""
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    return Response(summary_data(list(summary_query(request.query_params))))
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("top_voted", params=("limit",))
+def analytics_top_voted(request):
+    """Return top N feedback by upvotes in range"""
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    return Response(top_voted_data(list(top_voted_query(request.query_params))))
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("trends", params=("granularity",))
+def analytics_trends(request):
+    """
+    Return time series of created feedback counts.
+    Query params:
+      - granularity: daily | weekly | monthly
+      - board: optional board id
+      - from, to: YYYY-MM-DD
+    """
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    return Response(trends_data(list(trends_query(request.query_params))))
 
 
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@cached_analytics("distribution", params=("by",))
 def analytics_distribution(request):
     """
     Distribution counts grouped by 'status' (default), 'board' or 'tag'.
@@ -149,26 +207,95 @@ def analytics_distribution(request):
     """
     if not require_admin_mod(request):
         return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
+    agg = distribution_query(request.query_params)
     by = request.query_params.get("by", "status")
-    board_id = request.query_params.get("board")
-    from_s = request.query_params.get("from")
-    to_s = request.query_params.get("to")
-    start, end = parse_date_range(from_s, to_s, default_days=365)
+    return Response(distribution_data(None if agg is None else list(agg), by))
 
-    qs = Feedback.objects.filter(created_at__date__gte=start, created_at__date__lte=end)
-    if board_id:
-        qs = qs.filter(board_id=board_id)
 
-    if by == "board":
-        agg = qs.values("board_id", "board__name").annotate(count=Count("id")).order_by("-count")
-        data = [{"key": (r["board__name"] or r["board_id"]), "count": r["count"]} for r in agg]
-    elif by == "tag":
-        # If you don't have tags M2M, replace this block with appropriate field.
-        agg = qs.values("tags__name").annotate(count=Count("id")).order_by("-count")
-        data = [{"key": (r["tags__name"] or "Unknown"), "count": r["count"]} for r in agg]
-    else:
-        agg = qs.values("status").annotate(count=Count("id")).order_by("-count")
-        data = [{"key": r["status"], "count": r["count"]} for r in agg]
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("time_to_complete", params=())
+def analytics_time_to_complete(request):
+    """Percentiles and histogram of the hours from creation to completion (board, from, to optional)"""
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    columns = analytics_engine.FeedbackColumns.fetch(columns_query(request.query_params))
+    return Response(analytics_engine.time_to_complete(columns))
 
-    return Response(data)
\ No newline at end of file
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("funnel", params=())
+def analytics_funnel(request):
+    """Created -> started -> completed counts per weekly creation cohort (board, from, to optional)"""
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    columns = analytics_engine.FeedbackColumns.fetch(columns_query(request.query_params))
+    return Response(analytics_engine.funnel(columns))
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("upvote_velocity", params=())
+def analytics_upvote_velocity(request):
+    """Upvotes per day of age for each board, over feedback created in range (board, from, to optional)"""
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    columns = analytics_engine.FeedbackColumns.fetch(columns_query(request.query_params, default_days=365))
+    return Response(analytics_engine.upvote_velocity(columns))
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("rolling", params=("window",))
+def analytics_rolling(request):
+    """
+    Daily created / completed counts with trailing means.
+    Params:
+      - window: days in the trailing mean (default 7, max 90)
+      - board, from, to optional
+    """
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    params = request.query_params
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=90)
+    columns = analytics_engine.FeedbackColumns.fetch(columns_query(params))
+    return Response(analytics_engine.rolling(columns, start, end, window_param(params)))
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("cycle_time", params=())
+def analytics_cycle_time(request):
+    """
+    Lead time (created -> completed) and cycle time (in progress -> completed) percentiles in
+    hours for the feedback completed in range, overall and per board. Reads the status log only.
+    Params: board, from, to optional
+    """
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    params = request.query_params
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=90)
+    rows = status_history.completions_query(*day_bounds(start, end), board_id=params.get("board"))
+    return Response(status_history.cycle_time_data(list(rows)))
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@cached_analytics("throughput", params=("status",))
+def analytics_throughput(request):
+    """
+    Weekly count of feedback moved to a status (default completed) per board, from the status log.
+    Params:
+      - status: open | in_progress | completed
+      - board, from, to optional
+    """
+    if not require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    params = request.query_params
+    to_status = params.get("status", Feedback.STATUS_COMPLETED)
+    if to_status not in dict(Feedback.STATUS_CHOICES):
+        return Response({"status": ["Expected one of open, in_progress, completed."]}, status=status.HTTP_400_BAD_REQUEST)
+    start, end = parse_date_range(params.get("from"), params.get("to"), default_days=90)
+    rows = status_history.throughput_query(*day_bounds(start, end), to_status, board_id=params.get("board"))
+    return Response(status_history.throughput_data(list(rows)))
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class FeedbackConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'feedback'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .sqlite import configure_connection
+
+        connection_created.connect(configure_connection, dispatch_uid='feedback.sqlite.configure_connection')
@@ -0,0 +1,219 @@
+"""
+Async read endpoints, mounted under /feedback-api/v1/async/ next to the DRF ones.
+
+They run the DRF viewsets' own query building (get_queryset(), filter backends, paginator,
+serializers and the comment grouping/thread helpers), so both return the same payloads,
+but they reach the database through the async ORM (aget, aiterator, async iteration) and
+apply the board visibility with afilter_accessible, so under the ASGI server a request
+waiting on the database does not hold a worker thread. DRF views are sync only, hence
+plain Django views behind async_api_view, which does authentication, errors and rendering.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from . import analytics_views
+from .access import afilter_accessible
+from .analytics_cache import cached_analytics
+from .pagination import ThreadPagination
+from .permissions import aget_role_names
+from .serializers import UserSerializer
+from .views import CommentViewSet, FeedbackViewSet
+
+
+async def authenticate(request):
+    """The user of a Bearer access token (as JWTAuthentication) or of the session."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return await request.auser()
+
+    validated = authentication.get_validated_token(raw_token)
+    try:
+        user_id = validated[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise exceptions.AuthenticationFailed('Token contained no recognizable user identification')
+    try:
+        user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        raise exceptions.AuthenticationFailed('User not found')
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed('User is inactive')
+    return user
+
+
+def render(response):
+    if response.data is None:
+        rendered = HttpResponse(status=response.status_code)
+    else:
+        rendered = HttpResponse(JSONRenderer().render(response.data), status=response.status_code,
+                                content_type='application/json')
+    for header, value in response.items():
+        rendered[header] = value
+    return rendered
+
+
+def async_api_view(view):
+    """GET only; view(request) gets a DRF Request with .user set and returns a DRF Response."""
+    @require_GET
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            user = await authenticate(request)
+            # loads the roles once, every later role check is a memo hit
+            await aget_role_names(user)
+            api_request = Request(request)
+            api_request.user = user
+            response = await view(api_request, *args, **kwargs)
+        except (exceptions.APIException, Http404) as exc:
+            response = exception_handler(exc, {})
+        return render(response)
+    return wrapper
+
+
+def _viewset(viewset_class, request, action='list', **kwargs):
+    """Viewset instance set up as for dispatching request to action, without dispatching it."""
+    view = viewset_class(action_map={'get': action}, format_kwarg=None, args=(), kwargs=kwargs)
+    view.request, view.action = request, action
+    return view
+
+
+def _require_authenticated(request):
+    if not request.user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+
+
+async def _get_queryset(view):
+    """view.get_queryset(), with the board visibility filter applied by afilter_accessible."""
+    return await afilter_accessible(view.get_unrestricted_queryset(), view.request.user,
+                                    board_field=view.access_board_field)
+
+
+async def _filtered_queryset(view):
+    """
+    view.filter_queryset(view.get_queryset()). The filter backends only build the query, but
+    django-filter validates a ?board= choice with a query of its own, hence the thread.
+    """
+    return await sync_to_async(view.filter_queryset)(await _get_queryset(view))
+
+
+async def _get_object(view):
+    """view.get_object(): lookup in the filtered queryset and the object permissions."""
+    queryset = await _filtered_queryset(view)
+    try:
+        obj = await queryset.aget(pk=view.kwargs['pk'])
+    except queryset.model.DoesNotExist:
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+    view.check_object_permissions(view.request, obj)
+    return obj
+
+
+async def _paginated_response(view, queryset, paginator):
+    page = await paginator.apaginate_queryset(queryset, view.request, view)
+    return paginator.get_paginated_response(view.get_serializer(page, many=True).data)
+
+
+@async_api_view
+async def feedback_list(request):
+    view = _viewset(FeedbackViewSet, request)
+    return await _paginated_response(view, await _filtered_queryset(view), view.paginator)
+
+
+@async_api_view
+async def feedback_detail(request, pk):
+    view = _viewset(FeedbackViewSet, request, 'retrieve', pk=pk)
+    return Response(view.get_serializer(await _get_object(view)).data)
+
+
+@async_api_view
+async def comment_list(request):
+    view = _viewset(CommentViewSet, request)
+    if 'feedback__in' in request.query_params:
+        ids, per_feedback = view.grouped_params(request)
+        comments = view.grouped_query(ids, per_feedback, queryset=await _get_queryset(view))
+        return Response(view.grouped_data(ids, [comment async for comment in comments]))
+    return await _paginated_response(view, await _filtered_queryset(view), view.paginator)
+
+
+@async_api_view
+async def comment_thread(request):
+    view = _viewset(CommentViewSet, request, 'thread')
+    view.require_thread_feedback(request)
+    # ThreadPagination is given no view, as in CommentViewSet.thread_page
+    paginator = ThreadPagination()
+    page = await paginator.apaginate_queryset(await _get_queryset(view), request)
+    return paginator.get_paginated_response(view.get_serializer(page, many=True).data)
+
+
+@async_api_view
+async def comment_subtree(request, pk):
+    view = _viewset(CommentViewSet, request, 'subtree', pk=pk)
+    paginator = ThreadPagination()
+    page = await paginator.apaginate_queryset(view.subtree_query(await _get_object(view)), request)
+    return paginator.get_paginated_response(view.get_serializer(page, many=True).data)
+
+
+@async_api_view
+async def me_view(request):
+    _require_authenticated(request)
+    user = await User.objects.prefetch_related('groups').aget(pk=request.user.pk)
+    return Response(UserSerializer(user, context={'request': request}).data)
+
+
+def _forbidden_unless_admin_mod(request):
+    _require_authenticated(request)
+    if not analytics_views.require_admin_mod(request):
+        return Response({"detail": "Forbidden"}, status=403)
+    return None
+
+
+@async_api_view
+@cached_analytics("summary", params=())
+async def analytics_summary(request):
+    forbidden = _forbidden_unless_admin_mod(request)
+    if forbidden:
+        return forbidden
+    rows = [row async for row in analytics_views.summary_query(request.query_params)]
+    return Response(analytics_views.summary_data(rows))
+
+
+@async_api_view
+@cached_analytics("top_voted", params=("limit",))
+async def analytics_top_voted(request):
+    forbidden = _forbidden_unless_admin_mod(request)
+    if forbidden:
+        return forbidden
+    rows = [row async for row in analytics_views.top_voted_query(request.query_params)]
+    return Response(analytics_views.top_voted_data(rows))
+
+
+@async_api_view
+@cached_analytics("trends", params=("granularity",))
+async def analytics_trends(request):
+    forbidden = _forbidden_unless_admin_mod(request)
+    if forbidden:
+        return forbidden
+    rows = [row async for row in analytics_views.trends_query(request.query_params)]
+    return Response(analytics_views.trends_data(rows))
+
+
+@async_api_view
+@cached_analytics("distribution", params=("by",))
+async def analytics_distribution(request):
+    forbidden = _forbidden_unless_admin_mod(request)
+    if forbidden:
+        return forbidden
+    agg = analytics_views.distribution_query(request.query_params)
+    rows = None if agg is None else [row async for row in agg]
+    return Response(analytics_views.distribution_data(rows, request.query_params.get("by", "status")))
@@ -0,0 +1,122 @@
+"""Small helpers shared by the bench_* management commands."""
+import logging
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "login page slow export csv dashboard mobile app crash notification email search filter "
+    "dark mode theme upload image video payment invoice billing account password reset sso "
+    "integration slack github api webhook timeout error sync calendar report chart analytics "
+    "permission role admin board feedback comment vote kanban status roadmap release bug "
+    "feature request improve support language translation keyboard shortcut accessibility "
+    "performance memory battery offline cache settings profile avatar onboarding tutorial"
+).split()
+
+
+def zipf_words(rng, count, vocabulary=WORDS, skew=1.1):
+    """Random words with a Zipf-like skew, so a few words are very common like in real text."""
+    weights = [1 / (rank ** skew) for rank in range(1, len(vocabulary) + 1)]
+    return rng.choices(vocabulary, weights=weights, k=count)
+
+
+def random_sentence(rng, min_words, max_words):
+    return ' '.join(zipf_words(rng, rng.randint(min_words, max_words)))
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms):
+    return {
+        'runs': len(samples_ms),
+        'mean_ms': round(statistics.fmean(samples_ms), 3) if samples_ms else 0.0,
+        'p50_ms': round(percentile(samples_ms, 50), 3),
+        'p95_ms': round(percentile(samples_ms, 95), 3),
+        'p99_ms': round(percentile(samples_ms, 99), 3),
+    }
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def scratch_data(keep=False):
+    """Run a benchmark inside a transaction that is rolled back unless keep=True."""
+    try:
+        with transaction.atomic():
+            yield
+            if not keep:
+                raise Rollback
+    except Rollback:
+        pass
+
+
+@contextmanager
+def execute_on_commit(using=DEFAULT_DB_ALIAS):
+    """
+    Run the transaction.on_commit() callbacks registered inside the block when it ends, as
+    TestCase.captureOnCommitCallbacks(execute=True) does: inside scratch_data() nothing
+    commits, so the work they defer (events, rollups, cache invalidation) would never run.
+    Callbacks registered by the callbacks run too.
+    """
+    connection = connections[using]
+    start = len(connection.run_on_commit)
+    yield
+    while len(connection.run_on_commit) > start:
+        pending = connection.run_on_commit[start:]
+        start = len(connection.run_on_commit)
+        for _, callback, robust in pending:
+            if not robust:
+                callback()
+                continue
+            try:
+                callback()
+            except Exception:
+                logger.exception("Error calling %s in on_commit() (%s).", callback.__qualname__, callback)
+
+
+def seeded_rng(seed):
+    return random.Random(seed)
+
+
+@contextmanager
+def preset_timestamps(*fields):
+    """Let bulk_create keep the values set on auto_now/auto_now_add fields, e.g. to backdate rows."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def cumulative_zipf(count, skew):
+    """Cumulative Zipf weights for rng.choices(..., cum_weights=...): rank 1 is the most likely."""
+    total, weights = 0.0, []
+    for rank in range(1, count + 1):
+        total += 1 / (rank ** skew)
+        weights.append(total)
+    return weights
@@ -0,0 +1,264 @@
+"""
+Bulk feedback import and export (FeedbackViewSet.bulk_import / .export).
+
+Import reads the request body line by line (NDJSON or CSV with a header row), validates
+rows in chunks, checks board access once per board and inserts each chunk with a single
+bulk_create in its own transaction. bulk_create skips the save signals, so the
+search and duplicate indexes, analytics rollups and hot scores are updated here instead.
+
+Export streams `.values()` rows through `.iterator(chunk_size=...)`, so memory use does
+not depend on the size of the board. Under ASGI the response gets the async variants
+(`.aiterator()`): the ASGI handler reads a sync streaming iterator into a list before
+sending anything.
+
+Status changes for many feedbacks at once (FeedbackViewSet.bulk_set_status) are a single
+UPDATE; the rollup groups the rows leave and enter are refreshed after commit.
+"""
+import codecs
+import csv
+import json
+from collections import Counter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from . import events
+from .duplicates import index_similarity
+from .models import Board, Feedback
+from .permissions import is_admin_or_moderator
+from .ranking import hot_score
+from .rollups import rollup_key, schedule_feedback_refresh, schedule_refresh
+from .search import index_feedback
+from .status_history import record_changes, record_created
+from .serializers import FeedbackImportSerializer
+
+IMPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+
+STATUS_UPDATED = 'updated'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_NOT_FOUND = 'not_found'
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/jsonl')
+CSV_CONTENT_TYPES = ('text/csv',)
+EXPORT_FIELDS = ['id', 'board_id', 'title', 'body', 'status', 'upvotes_count', 'created_by__username', 'created_at']
+
+
+def read_lines(stream, encoding='utf-8'):
+    """Decoded lines of a file-like object (e.g. the HttpRequest), without reading it all."""
+    return codecs.iterdecode(stream, encoding)
+
+
+def parse_ndjson(lines):
+    """(line_number, row or None) per non-blank line; None for lines that are not a JSON object."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+def parse_csv(lines):
+    """(line_number, row) per CSV record, keyed by the header row."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class FeedbackImporter:
+    """Validates and inserts parsed rows for one user; board access is resolved once per board."""
+
+    def __init__(self, user, batch_size=IMPORT_BATCH_SIZE):
+        self.user = user
+        self.batch_size = batch_size
+        self.can_moderate = is_admin_or_moderator(user)
+        self.board_access = {}  # board id -> True (may post) / False (missing or not allowed)
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows):
+        for chunk in _chunks(rows, self.batch_size):
+            self._import_chunk(chunk)
+        errors = sorted(self.errors, key=lambda error: error['line'])
+        return {'created': self.created, 'failed': self.failed, 'errors': errors}
+
+    def _error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def _resolve_boards(self, board_ids):
+        missing = set(board_ids) - self.board_access.keys()
+        if not missing:
+            return
+        boards = Board.objects.filter(id__in=missing)
+        if not self.can_moderate:
+            # same rule as perform_create: members and the board creator may post
+            is_member = Exists(Board.members.through.objects.filter(board_id=OuterRef('pk'), user_id=self.user.pk))
+            boards = boards.filter(Q(created_by_id=self.user.pk) | is_member)
+        allowed = set(boards.values_list('id', flat=True))
+        for board_id in missing:
+            self.board_access[board_id] = board_id in allowed
+
+    def _import_chunk(self, chunk):
+        valid = []
+        for line, row in chunk:
+            if row is None:
+                self._error(line, {'non_field_errors': ['Expected a JSON object.']})
+                continue
+            if 'board' not in row and 'board_id' in row:
+                # rows produced by export
+                row = {**row, 'board': row['board_id']}
+            serializer = FeedbackImportSerializer(data=row)
+            if not serializer.is_valid():
+                self._error(line, serializer.errors)
+                continue
+            data = serializer.validated_data
+            if data.get('status', Feedback.STATUS_OPEN) != Feedback.STATUS_OPEN and not self.can_moderate:
+                self._error(line, {'status': ['Only Admin or Moderator can import feedback with a status.']})
+                continue
+            valid.append((line, data))
+
+        self._resolve_boards(data['board'] for _, data in valid)
+        feedbacks = []
+        # bulk_create skips the pre_save hook that scores new feedback
+        initial_score = hot_score(0, 0, timezone.now())
+        for line, data in valid:
+            if not self.board_access[data['board']]:
+                self._error(line, {'board': ['Board does not exist or you are not a member of it.']})
+                continue
+            feedbacks.append(Feedback(
+                board_id=data['board'], title=data['title'], body=data['body'],
+                status=data.get('status', Feedback.STATUS_OPEN), created_by=self.user, hot_score=initial_score,
+            ))
+        if not feedbacks:
+            return
+        with transaction.atomic():
+            created = Feedback.objects.bulk_create(feedbacks)
+            index_feedback(created)
+            index_similarity(created)
+            record_created(created)
+            schedule_feedback_refresh(created)
+            # one summary event per board instead of one per imported row
+            for board_id, count in Counter(feedback.board_id for feedback in created).items():
+                events.publish_on_commit(events.FEEDBACK_IMPORTED, board_id, {'count': count})
+        self.created += len(created)
+
+
+def import_feedback(rows, user, batch_size=IMPORT_BATCH_SIZE):
+    """Import parsed (line, row) pairs. Returns {'created', 'failed', 'errors'}."""
+    return FeedbackImporter(user, batch_size=batch_size).run(rows)
+
+
+def _export_values(queryset):
+    return queryset.prefetch_related(None).order_by('id').values(*EXPORT_FIELDS)
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    return _export_values(queryset).iterator(chunk_size=chunk_size)
+
+
+def aexport_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """export_rows as an async iterator, for responses sent by the ASGI handler."""
+    return _export_values(queryset).aiterator(chunk_size=chunk_size)
+
+
+def _rename(row):
+    row['created_by'] = row.pop('created_by__username')
+    return row
+
+
+def _ndjson_line(row):
+    return json.dumps(_rename(row), cls=DjangoJSONEncoder) + '\n'
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield _ndjson_line(row)
+
+
+async def andjson_lines(rows):
+    async for row in rows:
+        yield _ndjson_line(row)
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_writer():
+    header = [field for field in EXPORT_FIELDS if field != 'created_by__username'] + ['created_by']
+    writer = csv.DictWriter(_Echo(), fieldnames=header)
+    return writer, writer.writerow(dict(zip(header, header)))
+
+
+def csv_lines(rows):
+    writer, header_line = _csv_writer()
+    yield header_line
+    for row in rows:
+        yield writer.writerow(_rename(row))
+
+
+async def acsv_lines(rows):
+    writer, header_line = _csv_writer()
+    yield header_line
+    async for row in rows:
+        yield writer.writerow(_rename(row))
+
+
+def set_status_bulk(feedback_ids, status, changed_by=None):
+    """
+    Move the given feedbacks to `status` with one UPDATE (and one insert into the status
+    log). Returns [{'id', 'result'}] in input order.
+    """
+    feedback_ids = list(dict.fromkeys(feedback_ids))
+    with transaction.atomic():
+        current = {
+            feedback.pk: feedback for feedback in
+            Feedback.objects.select_for_update().filter(pk__in=feedback_ids).only('board_id', 'created_at', 'status')
+        }
+        changed = [feedback for feedback in current.values() if feedback.status != status]
+        if changed:
+            now = timezone.now()
+            Feedback.objects.filter(pk__in=[feedback.pk for feedback in changed]).update(
+                status=status, updated_at=now)
+            record_changes(changed, {feedback.pk: feedback.status for feedback in changed}, status, now, changed_by)
+            # the old (board, day, status) groups lose these rows, the new ones gain them
+            schedule_refresh([rollup_key(feedback) for feedback in changed] +
+                             [rollup_key(feedback, status=status) for feedback in changed])
+            for feedback in changed:
+                events.publish_on_commit(events.FEEDBACK_STATUS_CHANGED, feedback.board_id,
+                                         {'id': feedback.pk, 'status': status, 'previous_status': feedback.status})
+
+    changed_ids = {feedback.pk for feedback in changed}
+    results = []
+    for pk in feedback_ids:
+        if pk in changed_ids:
+            result = STATUS_UPDATED
+        elif pk in current:
+            result = STATUS_UNCHANGED
+        else:
+            result = STATUS_NOT_FOUND
+        results.append({'id': pk, 'result': result})
+    return results
@@ -0,0 +1,38 @@
+"""
+Denormalized counters on Feedback (upvotes_count, comments_count, last_comment).
+
+Each sync recomputes the counters of the given feedbacks from the source tables with a
+single UPDATE, so concurrent writes and cascades cannot leave them drifted. Called from
+the signal handlers in signals.py and after merges (duplicates.py).
+"""
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from . import events
+from .models import Comment, Feedback
+from .ranking import update_hot_scores
+from .rollups import rollup_key, schedule_refresh
+
+
+def sync_upvotes_count(feedback_ids):
+    """Recompute Feedback.upvotes_count from the upvotes through table."""
+    through = Feedback.upvotes.through
+    counts = (through.objects.filter(feedback_id=OuterRef('pk')).order_by()
+              .values('feedback_id').annotate(c=Count('user_id')).values('c'))
+    Feedback.objects.filter(pk__in=feedback_ids).update(upvotes_count=Coalesce(Subquery(counts), 0))
+    update_hot_scores(feedback_ids)
+    feedbacks = list(Feedback.objects.filter(pk__in=feedback_ids).only('board_id', 'created_at', 'status', 'upvotes_count'))
+    schedule_refresh(rollup_key(f) for f in feedbacks)
+    for feedback in feedbacks:
+        events.publish_on_commit(events.FEEDBACK_UPVOTES_CHANGED, feedback.board_id,
+                                 {'id': feedback.pk, 'upvotes_count': feedback.upvotes_count})
+
+
+def sync_comment_stats(feedback_ids):
+    """Recompute Feedback.comments_count and last_comment (then the hot score) from the comments table."""
+    comments = Comment.objects.filter(feedback_id=OuterRef('pk')).order_by()
+    Feedback.objects.filter(pk__in=feedback_ids).update(
+        comments_count=Coalesce(Subquery(comments.values('feedback_id').annotate(c=Count('id')).values('c')), 0),
+        last_comment=Subquery(comments.order_by('-created_at', '-id').values('id')[:1]),
+    )
+    update_hot_scores(feedback_ids)
@@ -0,0 +1,181 @@
+"""
+Near-duplicate feedback detection (FeedbackViewSet.similar, the possible_duplicates hint
+on create) and merging of duplicates (FeedbackViewSet.merge).
+
+Each feedback's title and body are normalized and cut into character shingles; the
+MinHash signature (for each of NUM_PERMUTATIONS independent 32-bit hash functions, the
+minimum over the shingle set; all of them come from one SHAKE-128 digest per shingle)
+estimates the Jaccard similarity of two shingle sets as the fraction of equal
+positions. The signature is split into BANDS bands of ROWS_PER_BAND rows; every band is
+hashed into a bucket row of FeedbackSimilarityBucket, indexed by (board, band, bucket).
+Items sharing at least one bucket are candidates (likely above ~(1/BANDS)^(1/ROWS_PER_BAND)
+similarity), and only their signatures are compared, so a lookup costs BANDS index probes
+and a handful of signature reads instead of a scan over every body.
+
+Signatures and buckets are written with the feedback (signals.py, bulk import) and can be
+rebuilt with the rebuild_similarity_index command.
+"""
+import hashlib
+import re
+import struct
+
+from django.db import transaction
+from django.db.models import Q
+
+from . import events
+from .counters import sync_comment_stats, sync_upvotes_count
+from .models import Comment, Feedback, FeedbackSignature, FeedbackSimilarityBucket
+from .rollups import rollup_key, schedule_refresh
+
+SHINGLE_LENGTH = 5
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+# estimated Jaccard similarity from which an item is reported as similar
+SIMILARITY_THRESHOLD = 0.5
+MAX_SIMILAR = 20
+MAX_POSSIBLE_DUPLICATES = 5
+REBUILD_BATCH_SIZE = 500
+
+_SIGNATURE = struct.Struct(f'<{NUM_PERMUTATIONS}I')
+_BAND = struct.Struct(f'<{ROWS_PER_BAND}I')
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def shingles(title, body):
+    text = ' '.join(_TOKEN_RE.findall(f'{title} {body}'.lower()))
+    if len(text) <= SHINGLE_LENGTH:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_LENGTH] for i in range(len(text) - SHINGLE_LENGTH + 1)}
+
+
+def minhash(title, body):
+    """Signature as a tuple of NUM_PERMUTATIONS ints, None for empty text."""
+    hashes = [_SIGNATURE.unpack(hashlib.shake_128(shingle.encode()).digest(_SIGNATURE.size))
+              for shingle in shingles(title, body)]
+    if not hashes:
+        return None
+    # column-wise minimum: position i is the minimum of hash function i
+    return tuple(map(min, zip(*hashes)))
+
+
+def band_buckets(signature):
+    """[(band, bucket)]: a signed 64-bit hash of every band's rows."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(_BAND.pack(*rows), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+
+def similarity(signature, other):
+    return sum(1 for a, b in zip(signature, other) if a == b) / NUM_PERMUTATIONS
+
+
+def encode_signature(signature):
+    return _SIGNATURE.pack(*signature)
+
+
+def decode_signature(data):
+    return _SIGNATURE.unpack(bytes(data))
+
+
+def index_similarity(feedbacks):
+    """(Re)write the signature and buckets of feedback rows."""
+    feedbacks = list(feedbacks)
+    if not feedbacks:
+        return
+    signatures, buckets = [], []
+    for feedback in feedbacks:
+        signature = minhash(feedback.title, feedback.body)
+        if signature is None:
+            continue
+        signatures.append(FeedbackSignature(feedback_id=feedback.pk, minhash=encode_signature(signature)))
+        buckets.extend(FeedbackSimilarityBucket(board_id=feedback.board_id, feedback_id=feedback.pk, band=band, bucket=bucket)
+                       for band, bucket in band_buckets(signature))
+    ids = [feedback.pk for feedback in feedbacks]
+    with transaction.atomic():
+        FeedbackSignature.objects.filter(feedback_id__in=ids).delete()
+        FeedbackSimilarityBucket.objects.filter(feedback_id__in=ids).delete()
+        FeedbackSignature.objects.bulk_create(signatures)
+        FeedbackSimilarityBucket.objects.bulk_create(buckets)
+
+
+def rebuild_similarity_index(batch_size=REBUILD_BATCH_SIZE):
+    """Re-index every feedback in id batches. Returns the number of rows."""
+    total, last_id = 0, 0
+    base = Feedback.objects.only('board_id', 'title', 'body').order_by('id')
+    while True:
+        batch = list(base.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return total
+        index_similarity(batch)
+        total += len(batch)
+        last_id = batch[-1].id
+
+
+def candidates_query(board_id, signature, exclude_id=None):
+    """Ids of the feedbacks on the board sharing at least one band bucket with signature."""
+    # board_id inside every branch, so each one is an exact (board, band, bucket) index probe
+    in_bucket = Q()
+    for band, bucket in band_buckets(signature):
+        in_bucket |= Q(board_id=board_id, band=band, bucket=bucket)
+    candidates = FeedbackSimilarityBucket.objects.filter(in_bucket)
+    if exclude_id is not None:
+        candidates = candidates.exclude(feedback_id=exclude_id)
+    return candidates.values_list('feedback_id', flat=True)
+
+
+def find_similar(queryset, board_id, signature, exclude_id=None, limit=MAX_SIMILAR):
+    """
+    [(feedback, similarity)] from queryset (so visibility rules apply) on the same board,
+    most similar first, at or above SIMILARITY_THRESHOLD.
+    """
+    if signature is None:
+        return []
+    candidate_ids = set(candidates_query(board_id, signature, exclude_id))
+
+    scores = {}
+    for feedback_id, data in FeedbackSignature.objects.filter(feedback_id__in=candidate_ids).values_list('feedback_id', 'minhash'):
+        score = similarity(signature, decode_signature(data))
+        if score >= SIMILARITY_THRESHOLD:
+            scores[feedback_id] = score
+    best = sorted(scores, key=lambda feedback_id: (-scores[feedback_id], -feedback_id))[:limit]
+    feedbacks = queryset.in_bulk(best)
+    return [(feedbacks[feedback_id], scores[feedback_id]) for feedback_id in best if feedback_id in feedbacks]
+
+
+def similar_to(queryset, feedback, limit=MAX_SIMILAR):
+    row = FeedbackSignature.objects.filter(feedback_id=feedback.pk).values_list('minhash', flat=True).first()
+    signature = decode_signature(row) if row is not None else minhash(feedback.title, feedback.body)
+    return find_similar(queryset, feedback.board_id, signature, exclude_id=feedback.pk, limit=limit)
+
+
+def similar_payload(matches):
+    return [
+        {'id': feedback.pk, 'title': feedback.title, 'status': feedback.status,
+         'upvotes_count': feedback.upvotes_count, 'similarity': round(score, 3)}
+        for feedback, score in matches
+    ]
+
+
+def merge_feedback(duplicate, canonical):
+    """
+    Move the upvotes (a user who upvoted both counts once) and comments (threads kept, their
+    paths do not depend on the feedback) of duplicate onto canonical, then delete duplicate.
+    """
+    through = Feedback.upvotes.through
+    duplicate_id = duplicate.pk
+    with transaction.atomic():
+        voters = through.objects.filter(feedback_id=duplicate_id).values_list('user_id', flat=True)
+        through.objects.bulk_create([through(feedback_id=canonical.pk, user_id=user_id) for user_id in voters],
+                                    ignore_conflicts=True)
+        Comment.objects.filter(feedback_id=duplicate_id).update(feedback_id=canonical.pk)
+        duplicate.delete()
+        sync_upvotes_count([canonical.pk])
+        sync_comment_stats([canonical.pk])
+        schedule_refresh([rollup_key(canonical)])
+        events.publish_on_commit(events.FEEDBACK_MERGED, duplicate.board_id, {'id': duplicate_id, 'into': canonical.pk})
+    canonical.refresh_from_db()
+    return canonical
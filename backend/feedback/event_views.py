@@ -0,0 +1,127 @@
+"""
+GET /feedback-api/v1/events/?board=<id>: Server-Sent Events stream of live board events.
+
+Runs as an async view, so it needs the ASGI application (feedback_management/asgi.py)
+served by an ASGI server; under WSGI a never-ending stream ties up a worker.
+EventSource cannot send headers, so the JWT access token may be passed as ?token=.
+"""
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .access import accessible_board_ids
+from .events import broker
+from .models import Board
+from .permissions import clear_role_cache, is_admin_or_moderator
+
+KEEPALIVE_SECONDS = 15
+# board access is re-read (from the access cache) at most this often while streaming
+ACCESS_RECHECK_SECONDS = 15
+RETRY_MILLISECONDS = 3000
+
+
+def _user_from_token(raw_token):
+    authentication = JWTAuthentication()
+    return authentication.get_user(authentication.get_validated_token(raw_token))
+
+
+class Viewer:
+    """What a stream's user may see: readable boards, moderation rights and owned boards."""
+
+    def __init__(self, user):
+        self.user = user
+        self.refresh()
+
+    def refresh(self):
+        # the roles memoized on the user date from the previous check, reload them
+        clear_role_cache(self.user)
+        self.board_ids = accessible_board_ids(self.user)  # None: every board
+        self.can_moderate = self.user.is_authenticated and is_admin_or_moderator(self.user)
+        self.owned_board_ids = (frozenset(Board.objects.filter(created_by_id=self.user.pk).values_list('id', flat=True))
+                                if self.user.is_authenticated else frozenset())
+        self.checked_at = time.monotonic()
+
+    def can_see(self, event):
+        if self.board_ids is not None and event.board_id not in self.board_ids:
+            return False
+        if event.user_id is None:
+            return True
+        return self.can_moderate or event.board_id in self.owned_board_ids or event.user_id == self.user.pk
+
+
+def format_event(event):
+    data = json.dumps({'board': event.board_id, **event.data}, cls=DjangoJSONEncoder)
+    return f'id: {broker.epoch}-{event.id}\nevent: {event.type}\ndata: {data}\n\n'
+
+
+def parse_last_event_id(header):
+    """The broker event id from a Last-Event-ID header, None if absent or from another broker epoch."""
+    epoch, _, number = (header or '').partition('-')
+    if epoch != broker.epoch or not number.isdigit():
+        return None
+    return int(number)
+
+
+async def event_stream(viewer, subscription, board_id, resync):
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if resync:
+            # events were missed while disconnected, the client should reload its data
+            yield 'event: resync\ndata: {}\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                event = None
+            if time.monotonic() - viewer.checked_at > ACCESS_RECHECK_SECONDS:
+                await sync_to_async(viewer.refresh)()
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield 'event: resync\ndata: {}\n\n'
+            if event is None:
+                yield ': keepalive\n\n'
+            elif (board_id is None or event.board_id == board_id) and viewer.can_see(event):
+                yield format_event(event)
+    finally:
+        subscription.close()
+
+
+@require_GET
+async def board_events(request):
+    raw_token = request.GET.get('token')
+    if raw_token:
+        try:
+            user = await sync_to_async(_user_from_token)(raw_token)
+        except (InvalidToken, AuthenticationFailed):
+            return JsonResponse({'detail': 'Given token not valid.'}, status=401)
+    else:
+        user = await request.auser()
+
+    viewer = await sync_to_async(Viewer)(user)
+    board_id = None
+    if request.GET.get('board'):
+        try:
+            board_id = int(request.GET['board'])
+        except ValueError:
+            return JsonResponse({'board': 'Expected a board id.'}, status=400)
+        if viewer.board_ids is not None and board_id not in viewer.board_ids:
+            return JsonResponse({'detail': 'Not found.'}, status=404)
+
+    last_event_header = request.headers.get('Last-Event-ID')
+    last_event_id = parse_last_event_id(last_event_header)
+    subscription, complete = broker.subscribe(last_event_id)
+    # a reconnecting client missed events the replay buffer cannot provide
+    resync = last_event_header is not None and (last_event_id is None or not complete)
+    response = StreamingHttpResponse(event_stream(viewer, subscription, board_id, resync),
+                                     content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # keep reverse proxies (nginx) from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
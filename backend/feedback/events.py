@@ -0,0 +1,120 @@
+"""
+Live board events, pushed to clients by the Server-Sent Events stream in event_views.py.
+
+Writes publish events once their transaction commits (signals.py, bulk.py, duplicates.py
+and the upvote action); every open stream holds a Subscription whose asyncio queue receives
+them on the stream's event loop. Access checks happen in the stream, per event.
+
+The broker is in-process: a server process only sees the writes it handled itself, so
+run the API and the stream in the same ASGI process, or put a shared broker (Redis
+pub/sub, PostgreSQL LISTEN/NOTIFY) behind the same publish()/subscribe() interface.
+"""
+import asyncio
+import threading
+import uuid
+from collections import deque, namedtuple
+
+from django.db import transaction
+
+# user_id set: only Admin/Moderator, the board creator and that user may see the event
+Event = namedtuple('Event', ['id', 'type', 'board_id', 'data', 'user_id'])
+
+FEEDBACK_CREATED = 'feedback.created'
+FEEDBACK_IMPORTED = 'feedback.imported'
+FEEDBACK_STATUS_CHANGED = 'feedback.status_changed'
+FEEDBACK_UPVOTES_CHANGED = 'feedback.upvotes_changed'
+FEEDBACK_MERGED = 'feedback.merged'
+COMMENT_CREATED = 'comment.created'
+MEMBERSHIP_REQUEST_CREATED = 'membership_request.created'
+MEMBERSHIP_REQUEST_UPDATED = 'membership_request.updated'
+
+SUBSCRIPTION_QUEUE_SIZE = 1000
+REPLAY_BUFFER_SIZE = 1000
+
+
+class Subscription:
+    def __init__(self, broker, loop, maxsize):
+        self.broker = broker
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        # set when events were dropped because the client could not keep up
+        self.overflowed = False
+
+    def deliver(self, event):
+        """Runs on the subscription's event loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    def __init__(self, queue_size=SUBSCRIPTION_QUEUE_SIZE, replay_size=REPLAY_BUFFER_SIZE):
+        self.queue_size = queue_size
+        # event ids restart with the process; the epoch tells a reconnecting client's
+        # Last-Event-ID from another process (or before a restart) apart
+        self.epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._last_id = 0
+        self._recent = deque(maxlen=replay_size)
+
+    def subscribe(self, last_event_id=None):
+        """
+        New subscription on the running event loop. With last_event_id (the SSE
+        Last-Event-ID header of a reconnecting client) the buffered newer events are
+        queued first; returns (subscription, complete) where complete is False if the
+        buffer no longer reaches back that far.
+        """
+        subscription = Subscription(self, asyncio.get_running_loop(), self.queue_size)
+        complete = True
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if last_event_id is not None:
+                oldest = self._recent[0].id if self._recent else self._last_id + 1
+                complete = oldest <= last_event_id + 1 and last_event_id <= self._last_id
+                for event in self._recent:
+                    if event.id > last_event_id:
+                        subscription.deliver(event)
+        return subscription, complete
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, type, board_id, data, user_id=None):
+        """Thread-safe; called from request threads as well as the event loop."""
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, type, board_id, data, user_id)
+            self._recent.append(event)
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # the loop is closed, the stream went away without unsubscribing
+                self.unsubscribe(subscription)
+        return event
+
+
+broker = EventBroker()
+
+
+def publish_on_commit(type, board_id, data, user_id=None):
+    transaction.on_commit(lambda: broker.publish(type, board_id, data, user_id=user_id))
+
+
+def feedback_payload(feedback):
+    return {
+        'id': feedback.pk,
+        'board': feedback.board_id,
+        'title': feedback.title,
+        'status': feedback.status,
+        'upvotes_count': feedback.upvotes_count,
+        'created_by': feedback.created_by_id,
+        'created_at': feedback.created_at.isoformat() if feedback.created_at else None,
+    }
@@ -0,0 +1,57 @@
+from rest_framework import filters as drf_filters
+from rest_framework.settings import api_settings
+
+from .pagination import KeysetPagination, decode_cursor_token
+from .search import search_feedback
+
+
+def search_terms(request):
+    return request.query_params.get(api_settings.SEARCH_PARAM, '').strip()
+
+
+def ranks_search(request, view):
+    """
+    Searching without an explicit ?ordering= on a view that ranks (rank_search, default True):
+    results come best match first.
+    """
+    return (getattr(view, 'rank_search', True) and bool(search_terms(request))
+            and not request.query_params.get(api_settings.ORDERING_PARAM, '').strip())
+
+
+def page_cursor(request):
+    """The keyset cursor of the request, None without one or when it is invalid (the paginator rejects it)."""
+    try:
+        return decode_cursor_token(request.query_params[KeysetPagination.cursor_query_param])
+    except (KeyError, ValueError):
+        return None
+
+
+class FullTextSearchFilter(drf_filters.SearchFilter):
+    """?search= backed by the full-text index (search.py) instead of icontains on every field."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = search_terms(request)
+        if not terms:
+            return queryset
+        if not ranks_search(request, view):
+            return search_feedback(queryset, terms, ranked=False)
+        return search_feedback(queryset, terms, cursor=page_cursor(request))
+
+
+class FeedbackOrderingFilter(drf_filters.OrderingFilter):
+    """Best matches first when searching and no explicit ?ordering= is given; ?ordering=-hot sorts by hot_score."""
+
+    aliases = {'hot': 'hot_score'}
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        fields = [
+            f"{'-' if field.startswith('-') else ''}{self.aliases.get(field.lstrip('-'), field.lstrip('-'))}"
+            for field in fields
+        ]
+        return super().remove_invalid_fields(queryset, fields, view, request)
+
+    def get_default_ordering(self, view):
+        request = getattr(view, 'request', None)
+        if request is not None and ranks_search(request, view):
+            return ('-search_rank', '-id')
+        return super().get_default_ordering(view)
@@ -0,0 +1,58 @@
+"""
+Invite redemption (InviteAcceptView).
+
+A shared invite link can be accepted by many users at the same time, so the checks and
+the use counter are one conditional UPDATE: it only matches an invite that is active,
+not expired and below max_uses, and increments `uses` in the same statement, so the
+database row lock (not a Python check) decides who gets the last use. The membership row
+is inserted in the same transaction; when the user already was a member the transaction
+is rolled back and no use is spent.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .access import invalidate_user_access
+from .models import Board, BoardInvite
+from .sqlite import write_transaction
+
+REDEEMED = 'redeemed'
+NOT_FOUND = 'not_found'
+INVALID = 'invalid'
+ALREADY_MEMBER = 'already_member'
+
+
+def redeemable(now):
+    """Q for invites that can still be used at `now` (BoardInvite.is_valid as a filter)."""
+    return (Q(is_active=True)
+            & (Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+            & (Q(max_uses__isnull=True) | Q(uses__lt=F('max_uses'))))
+
+
+def invite_query(token):
+    return BoardInvite.objects.filter(token=token)
+
+
+def redeem_invite(token, user):
+    """(result, board_id): one of REDEEMED, NOT_FOUND, INVALID, ALREADY_MEMBER."""
+    invite = invite_query(token).values_list('pk', 'board_id').first()
+    if invite is None:
+        return NOT_FOUND, None
+    invite_id, board_id = invite
+    return _redeem(invite_id, board_id, user), board_id
+
+
+@write_transaction
+def _redeem(invite_id, board_id, user):
+    if not BoardInvite.objects.filter(redeemable(timezone.now()), pk=invite_id).update(uses=F('uses') + 1):
+        return INVALID
+    try:
+        with transaction.atomic():
+            Board.members.through.objects.create(board_id=board_id, user_id=user.pk)
+    except IntegrityError:
+        # give the use back: roll the whole transaction back
+        transaction.set_rollback(True)
+        return ALREADY_MEMBER
+    # a direct insert into the through table sends no m2m_changed (signals.board_members_changed)
+    transaction.on_commit(lambda: invalidate_user_access(user.pk))
+    return REDEEMED
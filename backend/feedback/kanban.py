@@ -0,0 +1,71 @@
+"""
+Kanban snapshot of a board (BoardViewSet.kanban): feedback grouped by status.
+
+Each column is one keyset query over the (board, status, -created_at, -id) index that
+projects a slim card with `.values()`, so no serializer, user or group lookups are
+involved. Column totals come from a single aggregate over the board.
+"""
+from django.core.exceptions import ValidationError
+from django.db.models import Count, F, Q
+from django.db.models.functions import Substr
+
+from .models import Feedback
+from .pagination import (Cursor, decode_cursor_token, encode_cursor_token, get_position,
+                         keyset_filter, parse_position)
+
+KANBAN_ORDERING = ('-created_at', '-id')
+KANBAN_DEFAULT_LIMIT = 20
+KANBAN_MAX_LIMIT = 100
+EXCERPT_LENGTH = 140
+STATUSES = [status for status, _ in Feedback.STATUS_CHOICES]
+
+
+def parse_limit(raw):
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        return KANBAN_DEFAULT_LIMIT
+    return min(limit, KANBAN_MAX_LIMIT) if limit > 0 else KANBAN_DEFAULT_LIMIT
+
+
+def card_values(queryset):
+    return queryset.values(
+        'id', 'title', 'status', 'upvotes_count', 'comments_count', 'created_at',
+        excerpt=Substr('body', 1, EXCERPT_LENGTH), created_by_username=F('created_by__username'),
+    )
+
+
+def column_totals(board_id):
+    """{status: count} for every status, in one query."""
+    return Feedback.objects.filter(board_id=board_id).aggregate(
+        **{status: Count('id', filter=Q(status=status)) for status in STATUSES}
+    )
+
+
+def decode_column_cursor(encoded):
+    """Position after which the column continues, or raises ValueError."""
+    cursor = decode_cursor_token(encoded)
+    if cursor.reverse or len(cursor.position) != len(KANBAN_ORDERING):
+        raise ValueError('not a kanban cursor')
+    try:
+        return parse_position(Feedback, KANBAN_ORDERING, cursor.position)
+    except ValidationError as exc:
+        raise ValueError(str(exc))
+
+
+def column_query(board_id, status, limit, position=None):
+    """The cards of one column page plus one, to tell whether another page follows."""
+    queryset = Feedback.objects.filter(board_id=board_id, status=status).order_by(*KANBAN_ORDERING)
+    if position is not None:
+        queryset = queryset.filter(keyset_filter(KANBAN_ORDERING, position))
+    return card_values(queryset)[:limit + 1]
+
+
+def kanban_column(board_id, status, limit, position=None):
+    """(cards, next_token) for one column; next_token is None on the last page."""
+    cards = list(column_query(board_id, status, limit, position))
+    if len(cards) <= limit:
+        return cards, None
+    cards = cards[:limit]
+    token = encode_cursor_token(Cursor(reverse=False, position=get_position(cards[-1], KANBAN_ORDERING)))
+    return cards, token
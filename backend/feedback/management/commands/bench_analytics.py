@@ -0,0 +1,145 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from feedback import analytics_engine
+from feedback.analytics_engine import FeedbackColumns, PERCENTILES, TIME_TO_COMPLETE_BINS
+from feedback.benchmarking import scratch_data, seeded_rng, summarize, time_call
+from feedback.models import Board, Feedback
+
+
+def orm_time_to_complete(qs):
+    completed = qs.filter(status=Feedback.STATUS_COMPLETED).annotate(
+        duration=ExpressionWrapper(F('updated_at') - F('created_at'), output_field=DurationField()))
+    count = completed.count()
+    result = {'count': count, 'mean': completed.aggregate(mean=Avg('duration'))['mean'], 'percentiles': {}, 'histogram': []}
+    for pct in PERCENTILES:
+        # nearest rank, one ORDER BY ... OFFSET query per percentile
+        offset = max(0, round(pct / 100 * count) - 1)
+        result['percentiles'][pct] = completed.order_by('duration').values_list('duration', flat=True)[offset:offset + 1].first()
+    lower = 0
+    for upper in (*TIME_TO_COMPLETE_BINS, None):
+        in_bin = completed.filter(duration__gte=timedelta(hours=lower))
+        if upper is not None:
+            in_bin = in_bin.filter(duration__lt=timedelta(hours=upper))
+        result['histogram'].append(in_bin.count())
+        lower = upper
+    return result
+
+
+def orm_funnel(qs):
+    return list(qs.annotate(cohort=TruncWeek('created_at')).values('cohort').annotate(
+        created=Count('id'),
+        started=Count('id', filter=Q(status__in=analytics_engine.STARTED)),
+        completed=Count('id', filter=Q(status=Feedback.STATUS_COMPLETED)),
+    ).order_by('cohort'))
+
+
+def orm_upvote_velocity(qs):
+    now = timezone.now()
+    result = []
+    for board_id in qs.values_list('board_id', flat=True).distinct():
+        board_qs = qs.filter(board_id=board_id)
+        totals = board_qs.aggregate(feedback=Count('id'), upvotes=Sum('upvotes_count'))
+        velocities = sorted(
+            upvotes / max((now - created).total_seconds() / 86400, analytics_engine.MIN_AGE_DAYS)
+            for upvotes, created in board_qs.values_list('upvotes_count', 'created_at'))
+        result.append((board_id, totals, velocities[len(velocities) // 2], velocities[int(len(velocities) * 0.9)]))
+    return result
+
+
+def orm_rolling(qs, window):
+    created = dict(qs.annotate(day=TruncDate('created_at')).values('day').annotate(n=Count('id')).values_list('day', 'n'))
+    completed = dict(qs.filter(status=Feedback.STATUS_COMPLETED).annotate(day=TruncDate('updated_at'))
+                     .values('day').annotate(n=Count('id')).values_list('day', 'n'))
+    days = sorted(created)
+    return [(day, sum(created.get(day - timedelta(days=i), 0) for i in range(window)) / window,
+             sum(completed.get(day - timedelta(days=i), 0) for i in range(window)) / window) for day in days]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the column analytics (one values_list read, NumPy) with one ORM query per metric on a "
+        "synthetic dataset. Runs in a transaction that is rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--boards', type=int, default=20)
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help="Keep the generated rows.")
+
+    def handle(self, *args, **options):
+        rng = seeded_rng(options['seed'])
+        now = timezone.now()
+        statuses = [Feedback.STATUS_OPEN, Feedback.STATUS_IN_PROGRESS, Feedback.STATUS_COMPLETED]
+        with scratch_data(keep=options['keep']):
+            user = User.objects.create(username=f"bench-analytics-{int(time.time())}")
+            boards = Board.objects.bulk_create(
+                [Board(name=f"analytics benchmark {i}", created_by=user) for i in range(options['boards'])])
+
+            started = time.perf_counter()
+            remaining = options['rows']
+            while remaining > 0:
+                batch = Feedback.objects.bulk_create([
+                    Feedback(board=rng.choice(boards), created_by=user, title="bench", body="bench",
+                             status=rng.choices(statuses, weights=(5, 2, 3))[0], upvotes_count=int(rng.paretovariate(1.5)) - 1)
+                    for _ in range(min(options['batch_size'], remaining))
+                ])
+                # created_at/updated_at are auto fields, bulk_update writes the spread-out values
+                for feedback in batch:
+                    feedback.created_at = now - timedelta(seconds=rng.uniform(0, options['days'] * 86400))
+                    feedback.updated_at = min(now, feedback.created_at + timedelta(hours=rng.expovariate(1 / 72)))
+                Feedback.objects.bulk_update(batch, ['created_at', 'updated_at'])
+                remaining -= len(batch)
+            self.stdout.write(f"Generated {options['rows']} rows in {time.perf_counter() - started:.1f}s")
+
+            qs = Feedback.objects.filter(board__in=boards, created_at__gte=now - timedelta(days=options['days']))
+            start, end = (now - timedelta(days=options['days'])).date(), now.date()
+            window = analytics_engine.DEFAULT_WINDOW
+
+            def columns():
+                return FeedbackColumns.fetch(qs)
+
+            orm = {
+                'time_to_complete': lambda: orm_time_to_complete(qs),
+                'funnel': lambda: orm_funnel(qs),
+                'upvote_velocity': lambda: orm_upvote_velocity(qs),
+                'rolling': lambda: orm_rolling(qs, window),
+            }
+            columnar = {
+                'time_to_complete': lambda: analytics_engine.time_to_complete(columns()),
+                'funnel': lambda: analytics_engine.funnel(columns()),
+                'upvote_velocity': lambda: analytics_engine.upvote_velocity(columns(), now),
+                'rolling': lambda: analytics_engine.rolling(columns(), start, end, window),
+            }
+
+            def all_columnar():
+                data = columns()
+                analytics_engine.time_to_complete(data)
+                analytics_engine.funnel(data)
+                analytics_engine.upvote_velocity(data, now)
+                analytics_engine.rolling(data, start, end, window)
+
+            self.stdout.write(f"{'metric':<22}{'ORM p50/p95 ms':>22}{'NumPy p50/p95 ms':>22}")
+            for name in orm:
+                orm_stats = summarize(time_call(orm[name], options['repeat']))
+                numpy_stats = summarize(time_call(columnar[name], options['repeat']))
+                self.stdout.write(
+                    f"{name:<22}{orm_stats['p50_ms']:>12.2f}/{orm_stats['p95_ms']:<9.2f}"
+                    f"{numpy_stats['p50_ms']:>12.2f}/{numpy_stats['p95_ms']:<9.2f}"
+                )
+            orm_total = summarize(time_call(lambda: [fn() for fn in orm.values()], options['repeat']))
+            numpy_total = summarize(time_call(all_columnar, options['repeat']))
+            self.stdout.write(
+                f"{'all four (one read)':<22}{orm_total['p50_ms']:>12.2f}/{orm_total['p95_ms']:<9.2f}"
+                f"{numpy_total['p50_ms']:>12.2f}/{numpy_total['p95_ms']:<9.2f}"
+            )
@@ -0,0 +1,130 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+
+from feedback.benchmarking import random_sentence, seeded_rng, summarize
+from feedback.models import Board, Feedback
+
+API_BASE = '/feedback-api/v1'
+
+
+def wsgi_get(application, path, query):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+    }
+    status = []
+    body = b''.join(application(environ, lambda s, headers: status.append(s)))
+    return int(status[0].split()[0]), body
+
+
+async def asgi_get(application, path, query):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'localhost')], 'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    messages = []
+    requested = []
+
+    async def receive():
+        if requested:
+            # the client stays connected; Django cancels this wait once the response is sent
+            await asyncio.Future()
+        requested.append(True)
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]['status'], b''.join(m.get('body', b'') for m in messages[1:])
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the feedback list under the WSGI handler (thread pool) and the ASGI handler "
+        "(concurrent tasks), with the DRF view and its /async/ counterpart. Runs in process, so it "
+        "measures the handler and view stack rather than a network server; rows created with "
+        "--rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=64)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--query', default='page_size=25', help="Query string of the list request.")
+        parser.add_argument('--rows', type=int, default=5000,
+                            help="Public feedback rows to create for the run, 0 to use the existing data.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        board = self.create_rows(options['rows'], options['seed']) if options['rows'] else None
+        try:
+            self.run(options)
+        finally:
+            if board is not None:
+                user = board.created_by
+                board.delete()
+                user.delete()
+
+    def create_rows(self, rows, seed):
+        rng = seeded_rng(seed)
+        user = User.objects.create(username=f"bench-async-{int(time.time())}")
+        board = Board.objects.create(name="async benchmark", is_public=True, created_by=user)
+        Feedback.objects.bulk_create(
+            [Feedback(board=board, created_by=user, title=random_sentence(rng, 3, 8), body=random_sentence(rng, 20, 60))
+             for _ in range(rows)],
+            batch_size=1000,
+        )
+        return board
+
+    def run(self, options):
+        concurrency, total, query = options['concurrency'], options['requests'], options['query']
+        sync_path, async_path = f'{API_BASE}/feedback/', f'{API_BASE}/async/feedback/'
+        wsgi, asgi = get_wsgi_application(), get_asgi_application()
+
+        self.stdout.write(f"{total} requests, concurrency {concurrency}, ?{query}")
+        self.stdout.write(f"{'setup':<22}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        self.report('WSGI, sync view', *self.run_wsgi(wsgi, sync_path, query, concurrency, total))
+        self.report('ASGI, sync view', *asyncio.run(self.run_asgi(asgi, sync_path, query, concurrency, total)))
+        self.report('ASGI, async view', *asyncio.run(self.run_asgi(asgi, async_path, query, concurrency, total)))
+
+    def report(self, label, elapsed, samples):
+        stats = summarize(samples)
+        self.stdout.write(f"{label:<22}{len(samples) / elapsed:>10.1f}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+    def run_wsgi(self, application, path, query, concurrency, total):
+        def one(_):
+            start = time.perf_counter()
+            status, _body = wsgi_get(application, path, query)
+            if status != 200:
+                raise CommandError(f"GET {path}?{query} returned {status}")
+            return (time.perf_counter() - start) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = list(pool.map(one, range(total)))
+        return time.perf_counter() - started, samples
+
+    async def run_asgi(self, application, path, query, concurrency, total):
+        samples = []
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                status, _body = await asgi_get(application, path, query)
+                if status != 200:
+                    raise CommandError(f"GET {path}?{query} returned {status}")
+                samples.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started, samples
@@ -0,0 +1,313 @@
+import json
+import subprocess
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from feedback import urls as feedback_urls
+from feedback.benchmarking import execute_on_commit, scratch_data, summarize
+from feedback.metrics import QueryRecorder
+from feedback.models import Board, BoardInvite, BoardMembershipRequest, Comment, Feedback
+
+# routes that cannot be timed as a single request
+SKIPPED = {
+    'board-events': "server-sent event stream, the response never completes",
+}
+
+
+class Route:
+    """
+    One benchmarked request. `kwargs` maps URL kwargs to fixture names; `query` (a string)
+    and `data` may be callables of the fixtures; `prepare` runs inside the rolled back
+    transaction before the timed request and returns extra URL kwargs.
+    """
+
+    def __init__(self, name, method='get', role='member', kwargs=None, query='', data=None,
+                 content_type=None, prepare=None, label=None):
+        self.name, self.method, self.role = name, method, role
+        self.kwargs, self.query, self.data = kwargs or {}, query, data
+        self.content_type, self.prepare = content_type, prepare
+        self.label = label or f"{method.upper()} {name}"
+
+    def request(self, client, fixtures):
+        kwargs = {key: fixtures[value].pk for key, value in self.kwargs.items()}
+        if self.prepare:
+            kwargs.update(self.prepare(fixtures))
+        query = self.query(fixtures) if callable(self.query) else self.query
+        data = self.data(fixtures) if callable(self.data) else self.data
+        path = reverse(self.name, kwargs=kwargs) + (f'?{query}' if query else '')
+        if self.content_type:
+            return path, getattr(client, self.method)(path, data, content_type=self.content_type)
+        return path, getattr(client, self.method)(path, data, format='json')
+
+
+def create_invite(fixtures):
+    invite = BoardInvite.objects.create(board=fixtures['private'], created_by=fixtures['admin'])
+    return {'token': invite.token}
+
+
+def create_board(fixtures):
+    return {'pk': Board.objects.create(name="bench board", created_by=fixtures['admin']).pk}
+
+
+def import_body(fixtures):
+    board = fixtures['board'].pk
+    return ''.join(json.dumps({'board': board, 'title': f"imported {i}", 'body': "imported feedback"}) + '\n'
+                   for i in range(100))
+
+
+ROUTES = [
+    Route('api-root', role='anonymous'),
+    Route('register', 'post', role='anonymous', data={'username': 'bench-register', 'password': 'bench-password'}),
+    Route('accept-invite', 'post', role='outsider', prepare=create_invite),
+    Route('revoke-invite', 'post', role='admin', prepare=create_invite),
+    Route('metrics', role='anonymous'),
+
+    Route('board-list'),
+    Route('board-list', 'post', role='admin', data={'name': "bench board", 'description': "bench", 'is_public': True}),
+    Route('board-detail', kwargs={'pk': 'board'}),
+    Route('board-detail', 'patch', role='admin', kwargs={'pk': 'board'}, data={'description': "bench"}),
+    Route('board-detail', 'delete', role='admin', prepare=create_board),
+    Route('board-invites', role='admin', kwargs={'pk': 'private'}),
+    Route('board-invites', 'post', role='admin', kwargs={'pk': 'private'}, data={'note': "bench"}),
+    Route('board-kanban', kwargs={'pk': 'board'}),
+    Route('board-members', kwargs={'pk': 'board'}),
+    Route('board-request-membership', 'post', role='outsider', kwargs={'pk': 'requested'}),
+
+    Route('feedback-list', query=lambda f: f"board={f['board'].pk}"),
+    Route('feedback-list', query=lambda f: f"board={f['board'].pk}&ordering=-hot", label="GET feedback-list ?ordering=-hot"),
+    Route('feedback-list', query=lambda f: f"board={f['board'].pk}&search=export", label="GET feedback-list ?search="),
+    Route('feedback-list', label="GET feedback-list (all boards)"),
+    Route('feedback-list', 'post', data=lambda f: {'board': f['board'].pk, 'title': "bench", 'body': "bench feedback"}),
+    Route('feedback-bulk-import', 'post', role='admin', data=import_body, content_type='application/x-ndjson'),
+    Route('feedback-bulk-set-status', 'post', role='admin',
+          data=lambda f: {'ids': f['page_ids'], 'status': Feedback.STATUS_IN_PROGRESS}),
+    Route('feedback-export', role='admin', query=lambda f: f"board={f['private'].pk}"),
+    Route('feedback-detail', kwargs={'pk': 'feedback'}),
+    Route('feedback-detail', 'patch', role='admin', kwargs={'pk': 'feedback'}, data={'title': "bench"}),
+    Route('feedback-detail', 'delete', role='admin', kwargs={'pk': 'feedback'}),
+    Route('feedback-merge', 'post', role='admin', kwargs={'pk': 'duplicate'}, data=lambda f: {'into': f['feedback'].pk}),
+    Route('feedback-set-status', 'post', role='admin', kwargs={'pk': 'feedback'}, data={'status': Feedback.STATUS_COMPLETED}),
+    Route('feedback-similar', kwargs={'pk': 'feedback'}),
+    Route('feedback-upvote-feedback', 'post', kwargs={'pk': 'feedback'}),
+
+    Route('comment-list', query=lambda f: f"feedback={f['feedback'].pk}"),
+    Route('comment-list', query=lambda f: 'feedback__in=' + ','.join(map(str, f['page_ids'][:25])),
+          label="GET comment-list ?feedback__in="),
+    Route('comment-list', 'post', data=lambda f: {'feedback': f['feedback'].pk, 'body': "bench comment"}),
+    Route('comment-thread', query=lambda f: f"feedback={f['feedback'].pk}"),
+    Route('comment-detail', kwargs={'pk': 'comment'}),
+    Route('comment-detail', 'patch', role='admin', kwargs={'pk': 'comment'}, data={'body': "bench"}),
+    Route('comment-detail', 'delete', role='admin', kwargs={'pk': 'comment'}),
+    Route('comment-subtree', kwargs={'pk': 'comment'}),
+
+    Route('board-membership-requests-list', role='admin', query='status=pending'),
+    Route('board-membership-requests-list', 'post', role='outsider', data=lambda f: {'board': f['requested'].pk}),
+    Route('board-membership-requests-bulk-approve', 'post', role='admin', data=lambda f: {'board': f['requested'].pk}),
+    Route('board-membership-requests-bulk-reject', 'post', role='admin', data=lambda f: {'board': f['requested'].pk}),
+    Route('board-membership-requests-detail', role='admin', kwargs={'pk': 'membership_request'}),
+    Route('board-membership-requests-detail', 'patch', role='admin', kwargs={'pk': 'membership_request'},
+          data={'message': "bench"}),
+    Route('board-membership-requests-detail', 'delete', role='admin', kwargs={'pk': 'membership_request'}),
+    Route('board-membership-requests-approve', 'post', role='admin', kwargs={'pk': 'membership_request'}),
+    Route('board-membership-requests-reject', 'post', role='admin', kwargs={'pk': 'membership_request'}),
+
+    *[Route(name, role='admin') for name in (
+        'analytics-summary', 'analytics-top', 'analytics-trends', 'analytics-distribution',
+        'analytics-time-to-complete', 'analytics-funnel', 'analytics-upvote-velocity', 'analytics-rolling',
+        'analytics-cycle-time', 'analytics-throughput',
+    )],
+
+    Route('async-feedback-list', query=lambda f: f"board={f['board'].pk}"),
+    Route('async-feedback-detail', kwargs={'pk': 'feedback'}),
+    Route('async-comment-list', query=lambda f: f"feedback={f['feedback'].pk}"),
+    Route('async-comment-list', query=lambda f: 'feedback__in=' + ','.join(map(str, f['page_ids'][:25])),
+          label="GET async-comment-list ?feedback__in="),
+    Route('async-comment-thread', query=lambda f: f"feedback={f['feedback'].pk}"),
+    Route('async-comment-subtree', kwargs={'pk': 'comment'}),
+    Route('async-auth-me'),
+    *[Route(name, role='admin') for name in (
+        'async-analytics-summary', 'async-analytics-top', 'async-analytics-trends', 'async-analytics-distribution',
+    )],
+]
+
+
+def route_names(patterns=feedback_urls.urlpatterns):
+    """Every URL name in feedback/urls.py (router routes included)."""
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def load_fixtures():
+    """The objects the routes act on: the busiest public board, its most voted feedback, a private board..."""
+    admin = User.objects.filter(groups__name='Admin').order_by('id').first()
+    if admin is None:
+        raise CommandError("No user in the Admin group; run seed_bench first.")
+    busiest = (Feedback.objects.filter(board__is_public=True).order_by().values('board_id')
+               .annotate(n=Count('id')).order_by('-n').first())
+    private = Board.objects.filter(is_public=False).order_by('id').first()
+    pending = BoardMembershipRequest.objects.filter(status=BoardMembershipRequest.STATUS_PENDING)
+    requested = (Board.objects.filter(is_public=True, membership_requests__in=pending)
+                 .annotate(pending=Count('membership_requests')).order_by('-pending', 'id').first())
+    if busiest is None or private is None or requested is None:
+        raise CommandError("Expected a public board with feedback, one with pending membership requests and a "
+                           "private board; run seed_bench first.")
+    board = Board.objects.get(pk=busiest['board_id'])
+    staff = User.objects.filter(groups__name__in=('Admin', 'Moderator'))
+    member = board.members.exclude(pk__in=staff).order_by('id').first() or board.created_by
+    outsider = (User.objects.exclude(pk__in=staff).exclude(boards__in=(private, requested))
+                .exclude(pk__in=(private.created_by_id, requested.created_by_id))
+                .exclude(board_membership_requests__board=requested).order_by('id').first())
+    top = list(Feedback.objects.filter(board=board).order_by('-upvotes_count', '-id')[:100])
+    comment = (Comment.objects.filter(feedback__in=top, parent=None).order_by('-feedback__upvotes_count', 'path').first()
+               or Comment.objects.filter(feedback__board=board).order_by('id').first())
+    fixtures = {
+        'admin': admin, 'member': member, 'outsider': outsider, 'board': board, 'private': private, 'requested': requested,
+        'feedback': top[0], 'duplicate': top[1] if len(top) > 1 else None, 'comment': comment,
+        'membership_request': pending.filter(board=requested).order_by('requested_at', 'id').first(),
+        'page_ids': [feedback.pk for feedback in top],
+    }
+    missing = [name for name, value in fixtures.items() if value is None]
+    if missing:
+        raise CommandError(f"No {', '.join(missing)} in the database; run seed_bench first.")
+    return fixtures
+
+
+def dataset_sizes():
+    return {
+        'users': User.objects.count(),
+        'boards': Board.objects.count(),
+        'feedback': Feedback.objects.count(),
+        'upvotes': Feedback.upvotes.through.objects.count(),
+        'comments': Comment.objects.count(),
+        'membership_requests': BoardMembershipRequest.objects.count(),
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_route(route, client, fixtures, repeat, warmup, cold):
+    """
+    Timings of `repeat` requests after `warmup` ones, each in a transaction that is rolled back.
+    The on_commit() callbacks of a request run before the rollback and count towards it.
+    """
+    samples, queries, sql_ms = [], [], []
+    for i in range(warmup + repeat):
+        with scratch_data():
+            if cold:
+                for cache in caches.all():
+                    cache.clear()
+            recorder = QueryRecorder()
+            start = time.perf_counter()
+            with connection.execute_wrapper(recorder), execute_on_commit():
+                path, response = route.request(client, fixtures)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+            queries.append(recorder.queries)
+            sql_ms.append(recorder.seconds * 1000)
+    return {
+        'label': route.label, 'name': route.name, 'method': route.method.upper(), 'role': route.role,
+        'path': path, 'status': response.status_code, **summarize(samples),
+        'queries': max(queries), 'queries_min': min(queries), 'sql_p50_ms': summarize(sql_ms)['p50_ms'],
+    }
+
+
+def compare_reports(old, new, threshold):
+    """(label, old route, new route, regressed) for the routes in both reports."""
+    previous = {route['label']: route for route in old['routes']}
+    rows = []
+    for route in new['routes']:
+        before = previous.get(route['label'])
+        if before is None:
+            continue
+        regressed = (route['queries'] > before['queries']
+                     or route['p50_ms'] > before['p50_ms'] * threshold)
+        rows.append((route['label'], before, route, regressed))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every route of feedback/urls.py in process against the current database (see seed_bench) and write "
+        "latency percentiles and query counts to a JSON report. Every request runs in a transaction that is rolled "
+        "back once its on_commit callbacks ran, so writes are measured with their deferred work, can be repeated and "
+        "leave the data unchanged. --compare prints the change against an earlier report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--cold', action='store_true', help="Clear the caches before every request.")
+        parser.add_argument('--routes', nargs='+', help="Only these URL names.")
+        parser.add_argument('--output', default='bench-routes.json')
+        parser.add_argument('--compare', help="An earlier report to compare with.")
+        parser.add_argument('--threshold', type=float, default=1.2,
+                            help="p50 ratio above which --compare reports a regression.")
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        fixtures = load_fixtures()
+        routes = [route for route in ROUTES if not options['routes'] or route.name in options['routes']]
+        uncovered = route_names() - {route.name for route in ROUTES} - SKIPPED.keys()
+        if uncovered:
+            self.stderr.write(f"Not benchmarked: {', '.join(sorted(uncovered))}")
+
+        # bearer tokens rather than force_authenticate, so the authentication cost is measured and
+        # the async views (which authenticate on their own) see the user
+        clients = {'anonymous': APIClient()}
+        for role in ('admin', 'member', 'outsider'):
+            clients[role] = APIClient()
+            clients[role].credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(fixtures[role])}')
+
+        report = {
+            'commit': git_commit(), 'created_at': timezone.now().isoformat(), 'database': connection.vendor,
+            'cache': 'cold' if options['cold'] else 'warm', 'repeat': options['repeat'],
+            'sizes': dataset_sizes(), 'routes': [], 'skipped': SKIPPED,
+        }
+        self.stdout.write(f"{'route':<52}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+        # the test client's host name
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for route in routes:
+                result = run_route(route, clients[route.role], fixtures, options['repeat'], options['warmup'], options['cold'])
+                report['routes'].append(result)
+                self.stdout.write(f"{route.label:<52}{result['status']:>7}{result['p50_ms']:>10.2f}"
+                                  f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['queries']:>9}")
+
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare']) as previous:
+                rows = compare_reports(json.load(previous), report, options['threshold'])
+            self.stdout.write(f"{'route':<52}{'p50 ms':>18}{'queries':>12}")
+            for label, before, after, regressed in rows:
+                self.stdout.write(f"{label:<52}{before['p50_ms']:>8.2f} -> {after['p50_ms']:<8.2f}"
+                                  f"{before['queries']:>4} -> {after['queries']:<4}{'  REGRESSION' if regressed else ''}")
+            regressions = [label for label, *_, regressed in rows if regressed]
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} routes regressed: {', '.join(regressions)}")
@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from feedback.benchmarking import random_sentence, scratch_data, seeded_rng, summarize, time_call
+from feedback.models import Board, Feedback
+from feedback.search import index_feedback, search_feedback
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ?search= latency of the old icontains scan with the full-text index on a synthetic corpus. "
+        "Runs in a transaction that is rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=25)
+        parser.add_argument('--terms', nargs='+', default=['export', 'dark mode', 'onboarding tutorial', 'zzzmissing'])
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help="Keep the generated rows.")
+
+    def handle(self, *args, **options):
+        rng = seeded_rng(options['seed'])
+        page = options['page_size']
+        with scratch_data(keep=options['keep']):
+            user = User.objects.create(username=f"bench-search-{int(time.time())}")
+            board = Board.objects.create(name="search benchmark", created_by=user)
+
+            started = time.perf_counter()
+            remaining = options['rows']
+            while remaining > 0:
+                batch = [
+                    Feedback(board=board, created_by=user, title=random_sentence(rng, 3, 8), body=random_sentence(rng, 20, 60))
+                    for _ in range(min(options['batch_size'], remaining))
+                ]
+                index_feedback(Feedback.objects.bulk_create(batch))
+                remaining -= len(batch)
+            self.stdout.write(f"Generated and indexed {options['rows']} rows in {time.perf_counter() - started:.1f}s")
+
+            base = Feedback.objects.filter(board=board)
+            self.stdout.write(f"{'term':<22}{'icontains p50/p95 ms':>24}{'ranked p50/p95 ms':>24}{'newest p50/p95 ms':>24}")
+            for term in options['terms']:
+                def like():
+                    return list(base.filter(Q(title__icontains=term) | Q(body__icontains=term))
+                                .order_by('-created_at', '-id')[:page])
+
+                def ranked():
+                    return list(search_feedback(base, term).order_by('-search_rank', '-id')[:page])
+
+                # ?search=...&ordering=-created_at
+                def newest():
+                    return list(search_feedback(base, term, ranked=False).order_by('-created_at', '-id')[:page])
+
+                columns = [summarize(time_call(query, options['repeat'])) for query in (like, ranked, newest)]
+                self.stdout.write(f"{term:<22}" + ''.join(
+                    f"{stats['p50_ms']:>12.2f}/{stats['p95_ms']:<11.2f}" for stats in columns))
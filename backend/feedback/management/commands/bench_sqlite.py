@@ -0,0 +1,206 @@
+import logging
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from feedback.benchmarking import random_sentence, seeded_rng, summarize
+from feedback.models import Board, Feedback
+from feedback.sqlite import is_locked_error
+
+# what the sqlite3 driver does without the profile: rollback journal, synchronous=FULL,
+# deferred transactions, its own 5 s busy timeout and no retries
+STOCK = {'pragmas': {'journal_mode': 'DELETE', 'synchronous': 'FULL'}, 'transaction_mode': None, 'attempts': 1}
+STATUSES = [Feedback.STATUS_OPEN, Feedback.STATUS_IN_PROGRESS, Feedback.STATUS_COMPLETED]
+
+
+def configured_profile():
+    return {
+        'pragmas': settings.SQLITE_PRAGMAS,
+        'transaction_mode': connections.settings[DEFAULT_DB_ALIAS]['OPTIONS'].get('transaction_mode'),
+        'attempts': settings.SQLITE_WRITE_ATTEMPTS,
+    }
+
+
+@contextmanager
+def sqlite_profile(profile):
+    """Apply a profile to the connections opened inside the block (one per worker thread)."""
+    options = connections.settings[DEFAULT_DB_ALIAS]['OPTIONS']
+    saved = dict(options)
+    options.pop('transaction_mode', None)
+    if profile['transaction_mode']:
+        options['transaction_mode'] = profile['transaction_mode']
+    connections.close_all()
+    try:
+        with override_settings(SQLITE_PRAGMAS=profile['pragmas'], SQLITE_WRITE_ATTEMPTS=profile['attempts']):
+            # switch the journal mode once, before the workers connect; no connection may be
+            # open when they are forked
+            connection.ensure_connection()
+            connection.close()
+            yield
+    finally:
+        connections.close_all()
+        options.clear()
+        options.update(saved)
+
+
+class Workload:
+    """
+    Mixed API traffic on one board: feedback list reads, upvote toggles, comments and status
+    changes, from several forked processes (like server workers) of a few threads each.
+    """
+
+    def __init__(self, users, board, feedback_ids, write_ratio, seed):
+        self.users, self.board, self.feedback_ids = users, board, feedback_ids
+        self.write_ratio, self.seed = write_ratio, seed
+
+    def run(self, processes, threads, seconds):
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        deadline = time.monotonic() + seconds
+        started = time.monotonic()
+        workers = [context.Process(target=self.process, args=(p, threads, deadline, results)) for p in range(processes)]
+        for worker in workers:
+            worker.start()
+        samples, locked = {'read': [], 'write': []}, 0
+        for _ in workers:
+            process_samples, process_locked = results.get()
+            samples['read'] += process_samples['read']
+            samples['write'] += process_samples['write']
+            locked += process_locked
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - started
+        return {
+            'ops_per_s': round((len(samples['read']) + len(samples['write'])) / elapsed, 1),
+            'reads_per_s': round(len(samples['read']) / elapsed, 1),
+            'writes_per_s': round(len(samples['write']) / elapsed, 1),
+            'locked_errors': locked,
+            'read': summarize(samples['read']),
+            'write': summarize(samples['write']),
+        }
+
+    def process(self, index, threads, deadline, results):
+        self.lock = threading.Lock()
+        self.samples, self.locked = {'read': [], 'write': []}, 0
+        workers = [threading.Thread(target=self.worker, args=(index * threads + i, deadline)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        results.put((self.samples, self.locked))
+
+    def worker(self, index, deadline):
+        rng = seeded_rng(self.seed + index)
+        user = self.users[index % len(self.users)]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        samples, locked = {'read': [], 'write': []}, 0
+        try:
+            while time.monotonic() < deadline:
+                kind = 'write' if rng.random() < self.write_ratio else 'read'
+                start = time.perf_counter()
+                try:
+                    self.request(client, rng, kind)
+                except OperationalError as exc:
+                    if not is_locked_error(exc):
+                        raise
+                    locked += 1
+                    continue
+                samples[kind].append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.close()
+            with self.lock:
+                self.samples['read'] += samples['read']
+                self.samples['write'] += samples['write']
+                self.locked += locked
+
+    def request(self, client, rng, kind):
+        if kind == 'read':
+            response = client.get(reverse('feedback-list'), {'board': self.board.pk, 'ordering': '-hot'})
+        else:
+            pk = rng.choice(self.feedback_ids)
+            operation = rng.choice(('upvote', 'comment', 'status'))
+            if operation == 'upvote':
+                response = client.post(reverse('feedback-upvote-feedback', kwargs={'pk': pk}))
+            elif operation == 'comment':
+                response = client.post(reverse('comment-list'), {'feedback': pk, 'body': random_sentence(rng, 5, 20)},
+                                       format='json')
+            else:
+                response = client.post(reverse('feedback-set-status', kwargs={'pk': pk}),
+                                       {'status': rng.choice(STATUSES)}, format='json')
+        if response.status_code >= 400:
+            raise CommandError(f"{response.status_code} from {response.request['PATH_INFO']}: {response.content[:200]!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent read/write throughput of the API (feedback list reads, upvotes, comments, status changes) "
+        "with the stock sqlite3 settings and with the configured SQLite profile (settings.SQLITE_PRAGMAS, "
+        "transaction_mode, write retries). Drives the views through the test client from forked processes of a few "
+        "threads each, on the configured database file; the rows it creates are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--threads', type=int, default=4, help="Threads per process.")
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--write-ratio', type=float, default=0.3)
+        parser.add_argument('--rows', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("bench_sqlite compares SQLite settings; the default database is not SQLite.")
+        if not settings.SQLITE_PRAGMAS:
+            self.stderr.write("SQLITE_PRAGMAS is empty (SQLITE_PROFILE=stock?): both runs use the stock settings.")
+
+        rng = seeded_rng(options['seed'])
+        suffix = int(time.time())
+        moderators = Group.objects.get_or_create(name='Moderator')[0]
+        users = User.objects.bulk_create(
+            [User(username=f"bench-sqlite-{suffix}-{i}") for i in range(options['processes'] * options['threads'])])
+        moderators.user_set.add(*users)
+        board = Board.objects.create(name="sqlite benchmark", created_by=users[0])
+        feedbacks = Feedback.objects.bulk_create([
+            Feedback(board=board, created_by=rng.choice(users), title=random_sentence(rng, 3, 8),
+                     body=random_sentence(rng, 10, 30))
+            for _ in range(options['rows'])
+        ])
+        workload = Workload(users, board, [feedback.pk for feedback in feedbacks], options['write_ratio'], options['seed'])
+
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        # the workers count "database is locked" failures themselves
+        request_logger.setLevel(logging.CRITICAL)
+        results = {}
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                for name, profile in (('stock', STOCK), ('profile', configured_profile())):
+                    with sqlite_profile(profile):
+                        results[name] = workload.run(options['processes'], options['threads'], options['seconds'])
+        finally:
+            request_logger.setLevel(level)
+            board.delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+        self.stdout.write(f"{options['processes']} processes x {options['threads']} threads, "
+                          f"{options['write_ratio']:.0%} writes, {options['seconds']}s each")
+        self.stdout.write(f"{'settings':<10}{'ops/s':>9}{'reads/s':>9}{'writes/s':>10}{'locked':>8}"
+                          f"{'read p50/p99 ms':>20}{'write p50/p99 ms':>20}")
+        for name, result in results.items():
+            read, write = result['read'], result['write']
+            self.stdout.write(
+                f"{name:<10}{result['ops_per_s']:>9.1f}{result['reads_per_s']:>9.1f}{result['writes_per_s']:>10.1f}"
+                f"{result['locked_errors']:>8}{read['p50_ms']:>11.1f}/{read['p99_ms']:<8.1f}"
+                f"{write['p50_ms']:>11.1f}/{write['p99_ms']:<8.1f}"
+            )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback.query_plans import check_query_plans
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the main query of each API endpoint and fail if any of them does a full table or index scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan, not only failing ones.")
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, plan, scans in check_query_plans():
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: full scan of {', '.join(scans)}"))
+            else:
+                self.stdout.write(f"{name}: ok")
+            if scans or options['verbose_plans']:
+                self.stdout.write(f"    {plan}".replace('\n', '\n    '))
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint queries do a full table or index scan.")
+        self.stdout.write(self.style.SUCCESS("No full table scans."))
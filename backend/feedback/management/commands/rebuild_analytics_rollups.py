@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from feedback.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the FeedbackDailyStat rollup table read by the analytics endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = rebuild_daily_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily rollup rows."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from feedback.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Repopulate the full-text search index for feedback (SQLite FTS5 table)."
+
+    def handle(self, *args, **options):
+        rows = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {rows} feedback rows."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from feedback.duplicates import rebuild_similarity_index
+
+
+class Command(BaseCommand):
+    help = "Recompute the MinHash signatures and LSH buckets used to find duplicate feedback."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        rows = rebuild_similarity_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {rows} feedback rows."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from feedback.ranking import refresh_hot_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Feedback.hot_score (?ordering=-hot) for every feedback from its upvote and comment counts. "
+        "Needed after changing the weights in ranking.py or after writes that bypassed the ORM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = refresh_hot_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Updated {changed} hot scores."))
@@ -0,0 +1,225 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from feedback.benchmarking import cumulative_zipf, preset_timestamps, random_sentence, seeded_rng
+from feedback.duplicates import index_similarity
+from feedback.models import (Board, BoardMembershipRequest, Comment, Feedback, FeedbackStatusChange,
+                             path_segment)
+from feedback.ranking import hot_score
+from feedback.rollups import rebuild_daily_stats
+from feedback.search import index_feedback
+
+# popularity of a feedback item is Pareto distributed: most items get a vote or two, a few get
+# hundreds. The same draw drives upvotes and comments, popular items are discussed more too
+POPULARITY_ALPHA = 1.5
+STATUS_WEIGHTS = {Feedback.STATUS_OPEN: 5, Feedback.STATUS_IN_PROGRESS: 2, Feedback.STATUS_COMPLETED: 3}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with a synthetic dataset for the route benchmarks (bench_routes): users, public and "
+        "private boards with members, feedback, upvotes, comment threads, status history and pending membership "
+        "requests, all inserted with bulk_create. Board sizes, user activity and item popularity are skewed like "
+        "real traffic. The rows are committed; use a separate database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2_000)
+        parser.add_argument('--boards', type=int, default=50)
+        parser.add_argument('--private-ratio', type=float, default=0.3)
+        parser.add_argument('--members', type=int, default=50, help="Mean members per board.")
+        parser.add_argument('--feedback', type=int, default=100_000)
+        parser.add_argument('--upvotes', type=float, default=5, help="Mean upvotes per feedback item.")
+        parser.add_argument('--comments', type=float, default=2, help="Mean comments per feedback item.")
+        parser.add_argument('--reply-ratio', type=float, default=0.3, help="Share of comments that reply to another one.")
+        parser.add_argument('--requests', type=int, default=500, help="Pending membership requests on public boards.")
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--skew', type=float, default=1.1, help="Zipf exponent of board sizes and user activity.")
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--no-similarity', action='store_true', help="Skip the duplicate detection index (slowest part).")
+        parser.add_argument('--prefix', default='seed', help="Prefix of the generated user names and board names.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.rng = seeded_rng(options['seed'])
+        self.now = timezone.now()
+        if options['users'] < 1 or options['boards'] < 1:
+            raise CommandError("--users and --boards must be at least 1.")
+        if User.objects.filter(username__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(f"Users named {options['prefix']}-* already exist; pass another --prefix or use a fresh database.")
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            self.create_users()
+            self.create_boards()
+            self.create_requests()
+        self.stdout.write(f"Created {len(self.users)} users and {len(self.boards)} boards")
+
+        with preset_timestamps(Feedback._meta.get_field('created_at'), Feedback._meta.get_field('updated_at'),
+                               Comment._meta.get_field('created_at')):
+            self.create_feedback()
+        self.stdout.write(f"Created {self.totals['feedback']} feedback, {self.totals['upvotes']} upvotes and "
+                          f"{self.totals['comments']} comments")
+
+        rows = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded in {time.perf_counter() - started:.1f}s ({rows} rollup rows). "
+            f"Admin: {self.admin.username}, moderator: {self.moderator.username}"))
+
+    def create_users(self):
+        prefix = self.options['prefix']
+        users = [User(username=f"{prefix}-user-{i}") for i in range(self.options['users'])]
+        self.admin = User(username=f"{prefix}-admin", is_staff=True)
+        self.moderator = User(username=f"{prefix}-moderator")
+        for user in (self.admin, self.moderator, *users):
+            user.set_unusable_password()
+        User.objects.bulk_create([self.admin, self.moderator, *users], batch_size=self.options['batch_size'])
+        # shuffled, so the most active users are not the oldest ones
+        self.users = [user.pk for user in users]
+        self.rng.shuffle(self.users)
+        self.user_weights = cumulative_zipf(len(self.users), self.options['skew'])
+        Group.objects.get_or_create(name='Admin')[0].user_set.add(self.admin)
+        Group.objects.get_or_create(name='Moderator')[0].user_set.add(self.moderator)
+
+    def active_user(self):
+        return self.rng.choices(self.users, cum_weights=self.user_weights)[0]
+
+    def create_boards(self):
+        rng, options = self.rng, self.options
+        oldest = self.now - timedelta(days=options['days'] + 30)
+        boards = Board.objects.bulk_create([
+            Board(name=f"{options['prefix']} board {i}", description=random_sentence(rng, 5, 15),
+                  is_public=rng.random() >= options['private_ratio'], created_by_id=self.active_user())
+            for i in range(options['boards'])
+        ])
+        Board.objects.filter(pk__in=[board.pk for board in boards]).update(created_at=oldest)
+        self.boards = boards
+        self.board_weights = cumulative_zipf(len(boards), options['skew'])
+        rng.shuffle(self.boards)
+
+        through = Board.members.through
+        self.members = {}
+        rows = []
+        for board in boards:
+            count = min(len(self.users), rng.randint(0, 2 * options['members']))
+            self.members[board.pk] = rng.sample(self.users, count)
+            rows += [through(board_id=board.pk, user_id=user_id) for user_id in self.members[board.pk]]
+        through.objects.bulk_create(rows, batch_size=options['batch_size'])
+
+    def create_requests(self):
+        rng = self.rng
+        # like BoardViewSet.request_membership, requests are for public boards (private ones use invites)
+        public = [board for board in self.boards if board.is_public]
+        requests, seen = [], set()
+        for _ in range(self.options['requests'] if public else 0):
+            board = rng.choice(public)
+            user_id = rng.choice(self.users)
+            if (board.pk, user_id) in seen or user_id in self.members[board.pk] or user_id == board.created_by_id:
+                continue
+            seen.add((board.pk, user_id))
+            requests.append(BoardMembershipRequest(board_id=board.pk, user_id=user_id, message=random_sentence(rng, 3, 10)))
+        BoardMembershipRequest.objects.bulk_create(requests, batch_size=self.options['batch_size'])
+
+    def create_feedback(self):
+        """Batches of feedback with their upvotes, comments and status history, one transaction per batch."""
+        self.totals = {'feedback': 0, 'upvotes': 0, 'comments': 0}
+        # explicit ids, so comment paths and last_comment are known before the insert
+        self.next_feedback_id = (Feedback.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+        self.next_comment_id = (Comment.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+        remaining = self.options['feedback']
+        while remaining > 0:
+            size = min(self.options['batch_size'], remaining)
+            with transaction.atomic():
+                self.create_feedback_batch(size)
+            remaining -= size
+
+    def popularity(self):
+        """Pareto draw with mean 1."""
+        return (self.rng.paretovariate(POPULARITY_ALPHA) - 1) * (POPULARITY_ALPHA - 1)
+
+    def rounded(self, value):
+        """Stochastic rounding, keeps the mean of fractional counts."""
+        return int(value + self.rng.random())
+
+    def create_feedback_batch(self, size):
+        rng, options = self.rng, self.options
+        span = options['days'] * 86400
+        statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        feedbacks, upvotes, comments, history = [], [], [], []
+        upvote_through = Feedback.upvotes.through
+
+        for board in rng.choices(self.boards, cum_weights=self.board_weights, k=size):
+            created_at = self.now - timedelta(seconds=rng.uniform(0, span))
+            status = rng.choices(statuses, weights)[0]
+            popularity = self.popularity()
+            upvote_count = min(len(self.users), self.rounded(popularity * options['upvotes']))
+            comment_count = self.rounded(popularity * options['comments'])
+            feedback = Feedback(
+                id=self.next_feedback_id, board_id=board.pk, created_by_id=self.active_user(),
+                title=random_sentence(rng, 3, 8), body=random_sentence(rng, 10, 40), status=status,
+                created_at=created_at, updated_at=created_at,
+                upvotes_count=upvote_count, comments_count=comment_count,
+                hot_score=hot_score(upvote_count, comment_count, created_at),
+            )
+            self.next_feedback_id += 1
+            feedbacks.append(feedback)
+
+            # a run of consecutive (shuffled) users: distinct voters without sampling
+            start = rng.randrange(len(self.users))
+            upvotes += [upvote_through(feedback_id=feedback.pk, user_id=self.users[(start + i) % len(self.users)])
+                        for i in range(upvote_count)]
+
+            thread = []
+            for at in sorted(created_at + timedelta(hours=rng.expovariate(1 / 48)) for _ in range(comment_count)):
+                parent = rng.choice(thread) if thread and rng.random() < options['reply_ratio'] else None
+                if parent is not None and parent.depth >= Comment.MAX_DEPTH - 1:
+                    parent = None
+                comment = Comment(id=self.next_comment_id, feedback_id=feedback.pk, parent=parent,
+                                  body=random_sentence(rng, 5, 30), created_by_id=self.active_user(),
+                                  created_at=min(at, self.now))
+                comment.path = (parent.path if parent else '') + path_segment(comment.pk)
+                self.next_comment_id += 1
+                thread.append(comment)
+            if thread:
+                feedback.last_comment_id = max(thread, key=lambda c: (c.created_at, c.pk)).pk
+            comments += thread
+            history += self.status_history(feedback)
+
+        batch_size = options['batch_size']
+        Feedback.objects.bulk_create(feedbacks, batch_size=batch_size)
+        Comment.objects.bulk_create(comments, batch_size=batch_size)
+        upvote_through.objects.bulk_create(upvotes, batch_size=batch_size)
+        FeedbackStatusChange.objects.bulk_create(history, batch_size=batch_size)
+        index_feedback(feedbacks)
+        if not options['no_similarity']:
+            index_similarity(feedbacks)
+        self.totals['feedback'] += len(feedbacks)
+        self.totals['upvotes'] += len(upvotes)
+        self.totals['comments'] += len(comments)
+
+    def status_history(self, feedback):
+        """Creation as open, then the moves that led to the current status; sets updated_at to the last one."""
+        rng = self.rng
+        row = dict(feedback_id=feedback.pk, board_id=feedback.board_id, changed_by_id=self.moderator.pk)
+        changes = [FeedbackStatusChange(feedback_id=feedback.pk, board_id=feedback.board_id, to_status=Feedback.STATUS_OPEN,
+                                        changed_at=feedback.created_at, changed_by_id=feedback.created_by_id)]
+        at, previous = feedback.created_at, Feedback.STATUS_OPEN
+        moves = {
+            Feedback.STATUS_OPEN: [],
+            Feedback.STATUS_IN_PROGRESS: [Feedback.STATUS_IN_PROGRESS],
+            # some items are completed straight from open
+            Feedback.STATUS_COMPLETED: ([Feedback.STATUS_IN_PROGRESS] if rng.random() < 0.8 else []) + [Feedback.STATUS_COMPLETED],
+        }[feedback.status]
+        for status in moves:
+            at = min(self.now, at + timedelta(hours=rng.expovariate(1 / 72)))
+            changes.append(FeedbackStatusChange(from_status=previous, to_status=status, changed_at=at, **row))
+            previous = status
+        feedback.updated_at = at
+        return changes
@@ -0,0 +1,195 @@
+"""
+Per-endpoint request metrics (RequestMetricsMiddleware) in Prometheus text format
+(metrics_views.metrics, /feedback-api/v1/metrics/).
+
+For every request the middleware records, under the resolved URL name and the method:
+the request count, a latency histogram, a histogram of the number of SQL queries and the
+total SQL time. Queries are counted by a connection.execute_wrapper installed on every
+database connection for the duration of the request; for async views it is installed
+from the request's sync_to_async thread, where their ORM calls run.
+Streaming responses (events, export) are measured until the response starts.
+
+Requests over METRICS_QUERY_BUDGET queries or METRICS_TIME_BUDGET_MS milliseconds (both
+optional settings) are logged as warnings on the "feedback.metrics" logger.
+
+The registry lives in process memory: each worker process exposes its own numbers, so
+scrape every worker (or sum them) when running several.
+"""
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('feedback.metrics')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+UNRESOLVED = '<unresolved>'
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        """[(le, count)] with the +Inf bucket, as Prometheus expects."""
+        total, rows = 0, []
+        for upper, count in zip(self.buckets, self.counts):
+            total += count
+            rows.append((upper, total))
+        rows.append(('+Inf', self.count))
+        return rows
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.query_seconds = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, view, method, seconds, queries, query_seconds):
+        with self._lock:
+            metrics = self._endpoints.get((view, method))
+            if metrics is None:
+                metrics = self._endpoints[(view, method)] = EndpointMetrics()
+            metrics.requests += 1
+            metrics.latency.observe(seconds)
+            metrics.queries.observe(queries)
+            metrics.query_seconds += query_seconds
+
+    def get(self, view, method):
+        return self._endpoints.get((view, method))
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = [
+                '# HELP http_requests_total Requests by URL name and method.',
+                '# TYPE http_requests_total counter',
+            ]
+            lines += [f'http_requests_total{{{_labels(key)}}} {m.requests}' for key, m in endpoints]
+            lines += _histogram_lines('http_request_duration_seconds', 'Request latency in seconds.',
+                                      [(key, m.latency) for key, m in endpoints])
+            lines += _histogram_lines('db_queries_per_request', 'SQL queries run by one request.',
+                                      [(key, m.queries) for key, m in endpoints])
+            lines += [
+                '# HELP db_query_duration_seconds_total Time spent in SQL queries.',
+                '# TYPE db_query_duration_seconds_total counter',
+            ]
+            lines += [f'db_query_duration_seconds_total{{{_labels(key)}}} {m.query_seconds:.6f}' for key, m in endpoints]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key, **extra):
+    view, method = key
+    pairs = [('view', view), ('method', method), *extra.items()]
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def _histogram_lines(name, help_text, histograms):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for key, histogram in histograms:
+        for upper, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{_labels(key, le=upper)}}} {count}')
+        lines.append(f'{name}_sum{{{_labels(key)}}} {histogram.sum:.6f}')
+        lines.append(f'{name}_count{{{_labels(key)}}} {histogram.count}')
+    return lines
+
+
+registry = MetricsRegistry()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper that counts queries and their time."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start, recorder = time.perf_counter(), QueryRecorder()
+        with self._recording(recorder):
+            response = self.get_response(request)
+        self._finish(request, response, time.perf_counter() - start, recorder)
+        return response
+
+    async def __acall__(self, request):
+        start, recorder = time.perf_counter(), QueryRecorder()
+        # the ORM calls of an async view run in the request's sync_to_async thread, install
+        # the wrapper on that thread's connections
+        recording = await sync_to_async(self._recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.close)()
+        self._finish(request, response, time.perf_counter() - start, recorder)
+        return response
+
+    def _recording(self, recorder):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        return stack
+
+    def _finish(self, request, response, seconds, recorder):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else UNRESOLVED
+        registry.record(view, request.method, seconds, recorder.queries, recorder.seconds)
+
+        query_budget = getattr(settings, 'METRICS_QUERY_BUDGET', None)
+        time_budget = getattr(settings, 'METRICS_TIME_BUDGET_MS', None)
+        if ((query_budget is not None and recorder.queries > query_budget)
+                or (time_budget is not None and seconds * 1000 > time_budget)):
+            logger.warning('%s %s (%s) %s: %d queries, %.1f ms SQL, %.1f ms total', request.method, request.path,
+                           view, response.status_code, recorder.queries, recorder.seconds * 1000, seconds * 1000)
@@ -0,0 +1,31 @@
+"""
+GET /feedback-api/v1/metrics/: the request metrics (metrics.py) in Prometheus text format.
+
+Internal: only answered for addresses in INTERNAL_IPS, or with "Authorization: Bearer
+<METRICS_TOKEN>" when that setting is configured (e.g. for a scraper behind a proxy).
+"""
+import secrets
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from .metrics import registry
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _allowed(request):
+    if request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token:
+        return False
+    return secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+
+
+@require_GET
+def metrics(request):
+    if not _allowed(request):
+        return HttpResponseForbidden('Forbidden', content_type='text/plain')
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
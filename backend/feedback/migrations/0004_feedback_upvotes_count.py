@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:37
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_upvotes_count(apps, schema_editor):
+    Feedback = apps.get_model('feedback', 'Feedback')
+    through = Feedback.upvotes.through
+    counts = (through.objects.filter(feedback_id=OuterRef('pk')).order_by()
+              .values('feedback_id').annotate(c=Count('user_id')).values('c'))
+    Feedback.objects.update(upvotes_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0003_boardinvite'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='upvotes_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_upvotes_count, migrations.RunPython.noop),
+    ]
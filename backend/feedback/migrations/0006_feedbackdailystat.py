@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def build_daily_stats(apps, schema_editor):
+    Feedback = apps.get_model('feedback', 'Feedback')
+    Comment = apps.get_model('feedback', 'Comment')
+    FeedbackDailyStat = apps.get_model('feedback', 'FeedbackDailyStat')
+    comments = {
+        (row['feedback__board_id'], row['day'], row['feedback__status']): row['comments']
+        for row in Comment.objects.order_by().annotate(day=TruncDate('feedback__created_at'))
+        .values('feedback__board_id', 'day', 'feedback__status').annotate(comments=Count('id'))
+    }
+    rows = (Feedback.objects.order_by().annotate(day=TruncDate('created_at'))
+            .values('board_id', 'day', 'status').annotate(created=Count('id'), upvotes=Sum('upvotes_count')))
+    FeedbackDailyStat.objects.bulk_create([
+        FeedbackDailyStat(
+            board_id=row['board_id'], day=row['day'], status=row['status'],
+            created_count=row['created'], upvote_count=row['upvotes'] or 0,
+            comment_count=comments.get((row['board_id'], row['day'], row['status']), 0),
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('completed', 'Completed')], max_length=30)),
+                ('created_count', models.IntegerField(default=0)),
+                ('upvote_count', models.IntegerField(default=0)),
+                ('comment_count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='feedback.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'status'], name='daily_stat_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('board', 'day', 'status'), name='feedback_daily_stat_unique')],
+            },
+        ),
+        migrations.RunPython(build_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SEARCH_TABLE = 'feedback_search'
+POSTGRES_INDEX = 'feedback_search_idx'
+
+
+def postgres_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+    # same expression as search.feedback_search_vector()
+    return GinIndex(SearchVector('title', 'body', config='english'), name=POSTGRES_INDEX)
+
+
+def create_search_index(apps, schema_editor):
+    Feedback = apps.get_model('feedback', 'Feedback')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(title, body, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) SELECT id, title, body FROM {Feedback._meta.db_table}'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.add_index(Feedback, postgres_index())
+
+
+def drop_search_index(apps, schema_editor):
+    Feedback = apps.get_model('feedback', 'Feedback')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.remove_index(Feedback, postgres_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0006_feedbackdailystat'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.CreateModel(
+            name='FeedbackSearchEntry',
+            fields=[
+                ('feedback', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='feedback.feedback')),
+                ('title', models.TextField()),
+                ('body', models.TextField()),
+                ('match', models.TextField(db_column='feedback_search')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'feedback_search',
+                'managed': False,
+            },
+        ),
+    ]
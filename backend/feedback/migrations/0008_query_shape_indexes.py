@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0007_feedback_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='boardmembershiprequest',
+            index=models.Index(fields=['board', 'status', 'handled_at'], name='membership_board_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boardmembershiprequest',
+            index=models.Index(fields=['status', 'handled_at'], name='membership_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['board', 'status', '-created_at', '-id'], name='feedback_board_status_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:12
+
+import math
+from datetime import datetime, timedelta, timezone
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_hot_score(apps, schema_editor):
+    # the formula of ranking.hot_score as of this migration
+    epoch, half_life = datetime(2025, 1, 1, tzinfo=timezone.utc), timedelta(days=2)
+    Feedback = apps.get_model('feedback', 'Feedback')
+    Comment = apps.get_model('feedback', 'Comment')
+    counts = (Comment.objects.filter(feedback_id=OuterRef('pk')).order_by()
+              .values('feedback_id').annotate(c=Count('id')).values('c'))
+    feedbacks = Feedback.objects.annotate(comment_total=Coalesce(Subquery(counts), 0)).only('created_at', 'upvotes_count')
+    batch = []
+    for feedback in feedbacks.iterator(chunk_size=1000):
+        activity = 1 + feedback.upvotes_count + 2 * feedback.comment_total
+        feedback.hot_score = round(math.log2(activity) + (feedback.created_at - epoch) / half_life, 6)
+        batch.append(feedback)
+        if len(batch) == 1000:
+            Feedback.objects.bulk_update(batch, ['hot_score'])
+            batch = []
+    Feedback.objects.bulk_update(batch, ['hot_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0008_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='hot_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_hot_score, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['board', '-hot_score', '-id'], name='feedback_board_hot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-hot_score', '-id'], name='feedback_hot_idx'),
+        ),
+    ]
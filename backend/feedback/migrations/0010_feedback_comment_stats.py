@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_stats(apps, schema_editor):
+    Feedback = apps.get_model('feedback', 'Feedback')
+    Comment = apps.get_model('feedback', 'Comment')
+    comments = Comment.objects.filter(feedback_id=OuterRef('pk')).order_by()
+    Feedback.objects.update(
+        comments_count=Coalesce(Subquery(comments.values('feedback_id').annotate(c=Count('id')).values('c')), 0),
+        last_comment=Subquery(comments.order_by('-created_at', '-id').values('id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0009_feedback_hot_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='last_comment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='feedback.comment'),
+        ),
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
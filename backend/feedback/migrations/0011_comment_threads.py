@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_paths(apps, schema_editor):
+    # existing comments are all top level: the path is the comment's own segment (models.path_segment)
+    Comment = apps.get_model('feedback', 'Comment')
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    batch = []
+    for comment in Comment.objects.only('id').iterator(chunk_size=1000):
+        number, path = comment.id, ''
+        while number:
+            number, digit = divmod(number, 36)
+            path = digits[digit] + path
+        comment.path = path.rjust(8, '0')
+        batch.append(comment)
+        if len(batch) == 1000:
+            Comment.objects.bulk_update(batch, ['path'])
+            batch = []
+    Comment.objects.bulk_update(batch, ['path'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0010_feedback_comment_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='feedback.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=160),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['feedback', 'path'], name='comment_feedback_path_idx'),
+        ),
+    ]
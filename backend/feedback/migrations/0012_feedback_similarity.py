@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0011_comment_threads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackSignature',
+            fields=[
+                ('feedback', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='feedback.feedback')),
+                ('minhash', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FeedbackSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='feedback.board')),
+                ('feedback', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_buckets', to='feedback.feedback')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'band', 'bucket'], name='similarity_bucket_idx')],
+            },
+        ),
+    ]
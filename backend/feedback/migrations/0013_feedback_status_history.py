@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_history(apps, schema_editor):
+    # only the current status is known: log the creation, and for items that moved on, the
+    # move to their current status at their last update
+    Feedback = apps.get_model('feedback', 'Feedback')
+    FeedbackStatusChange = apps.get_model('feedback', 'FeedbackStatusChange')
+    batch = []
+    rows = Feedback.objects.values_list('id', 'board_id', 'status', 'created_at', 'updated_at', 'created_by_id')
+    for feedback_id, board_id, status, created_at, updated_at, created_by_id in rows.iterator(chunk_size=1000):
+        batch.append(FeedbackStatusChange(feedback_id=feedback_id, board_id=board_id, to_status='open',
+                                          changed_at=created_at, changed_by_id=created_by_id))
+        if status != 'open':
+            batch.append(FeedbackStatusChange(feedback_id=feedback_id, board_id=board_id, from_status='open',
+                                              to_status=status, changed_at=max(created_at, updated_at)))
+        if len(batch) >= 1000:
+            FeedbackStatusChange.objects.bulk_create(batch)
+            batch = []
+    FeedbackStatusChange.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0012_feedback_similarity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('completed', 'Completed')], max_length=30)),
+                ('to_status', models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('completed', 'Completed')], max_length=30)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='feedback.board')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('feedback', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='feedback.feedback')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['feedback', 'changed_at'], name='status_change_feedback_idx'), models.Index(fields=['board', 'to_status', 'changed_at'], name='status_change_board_idx'), models.Index(fields=['to_status', 'changed_at'], name='status_change_status_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_history, migrations.RunPython.noop),
+    ]
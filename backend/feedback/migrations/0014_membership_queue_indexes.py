@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0013_feedback_status_history'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='boardmembershiprequest',
+            name='membership_board_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='boardmembershiprequest',
+            name='membership_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='boardmembershiprequest',
+            index=models.Index(fields=['board', 'status', 'requested_at', 'id'], name='membership_board_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boardmembershiprequest',
+            index=models.Index(fields=['status', 'requested_at', 'id'], name='membership_queue_idx'),
+        ),
+    ]
@@ -1,10 +1,21 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 import secrets
 import uuid
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models import F
+from .sqlite import write_transaction
+
+class BoardQuerySet(models.QuerySet):
+    def with_member_count(self):
+        # correlated subquery: only evaluated for the rows actually returned (one page)
+        through = Board.members.through
+        counts = (through.objects.filter(board_id=models.OuterRef('pk')).order_by()
+                  .values('board_id').annotate(c=models.Count('user_id')).values('c'))
+        return self.annotate(member_count=Coalesce(models.Subquery(counts), 0))
+
 
 class Board(models.Model):
     """"" Container. Can be public  or private. Users can be members of multiple boards. """""
@@ -19,6 +30,14 @@ class Board(models.Model):
 
     members = models.ManyToManyField(User, related_name='boards', blank=True)
 
+    objects = BoardQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination order
+            models.Index(fields=['-created_at', '-id'], name='board_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -39,23 +58,203 @@ class Feedback(models.Model):
 
     status = models.CharField(max_length=30,choices=STATUS_CHOICES, default=STATUS_OPEN)
     upvotes = models.ManyToManyField(User, related_name='upvoted_feedbacks', blank=True)
+    # denormalized len(upvotes), kept in sync by toggle_upvote() and the m2m_changed handler in signals.py
+    upvotes_count = models.PositiveIntegerField(default=0)
+    # denormalized comment count and newest comment, kept in sync by the Comment handlers in signals.py
+    comments_count = models.PositiveIntegerField(default=0)
+    last_comment = models.ForeignKey('Comment', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    # ?ordering=-hot: activity with time decay, maintained by ranking.py
+    hot_score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            # keyset pagination orders (see pagination.KeysetPagination), with and without ?board=
+            models.Index(fields=['board', '-created_at', '-id'], name='feedback_board_created_idx'),
+            models.Index(fields=['board', '-upvotes_count', '-id'], name='feedback_board_upvotes_idx'),
+            models.Index(fields=['board', '-hot_score', '-id'], name='feedback_board_hot_idx'),
+            # ?board=&status= (and the kanban columns)
+            models.Index(fields=['board', 'status', '-created_at', '-id'], name='feedback_board_status_idx'),
+            # ?status= across boards
+            models.Index(fields=['status', '-created_at', '-id'], name='feedback_status_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='feedback_created_idx'),
+            models.Index(fields=['-upvotes_count', '-id'], name='feedback_upvotes_idx'),
+            models.Index(fields=['-hot_score', '-id'], name='feedback_hot_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.board.name})"
+
+    def toggle_upvote(self, user):
+        """Add or remove the user's upvote and adjust the stored counter in one transaction.
+        Returns (upvoted, upvotes_count)."""
+        delta, self.upvotes_count = self._toggle_upvote_row(user)
+        return delta >= 0, self.upvotes_count
+
+    @write_transaction
+    def _toggle_upvote_row(self, user):
+        through = Feedback.upvotes.through
+        removed, _ = through.objects.filter(feedback_id=self.pk, user_id=user.pk).delete()
+        if removed:
+            delta = -1
+        else:
+            try:
+                with transaction.atomic():
+                    through.objects.create(feedback_id=self.pk, user_id=user.pk)
+                delta = 1
+            except IntegrityError:
+                # a concurrent request already inserted this upvote
+                delta = 0
+        if delta:
+            Feedback.objects.filter(pk=self.pk).update(upvotes_count=F('upvotes_count') + delta)
+        # the counter as this transaction left it, concurrent toggles included (self's may be stale)
+        return delta, Feedback.objects.filter(pk=self.pk).values_list('upvotes_count', flat=True).get()
     
 
+class FeedbackSearchEntry(models.Model):
+    """"" Read-only mapping of the SQLite FTS5 table created in migration 0007 (see search.py)."""""
+    feedback = models.OneToOneField(Feedback, primary_key=True, db_column='rowid', db_constraint=False,
+                                    on_delete=models.DO_NOTHING, related_name='search_entry')
+    title = models.TextField()
+    body = models.TextField()
+    # hidden FTS5 columns: `feedback_search = 'query'` is a MATCH, `rank` is the bm25() of the match
+    match = models.TextField(db_column='feedback_search')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'feedback_search'
+
+
+class FeedbackSignature(models.Model):
+    """"" MinHash signature of a feedback's title and body (duplicates.py)."""""
+    feedback = models.OneToOneField(Feedback, primary_key=True, on_delete=models.CASCADE, related_name='signature')
+    # duplicates.NUM_PERMUTATIONS unsigned 32-bit minimums, little endian
+    minhash = models.BinaryField()
+
+
+class FeedbackSimilarityBucket(models.Model):
+    """"" LSH bucket of one band of a feedback's signature; feedbacks sharing a bucket are duplicate candidates."""""
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='+')
+    feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='similarity_buckets')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            # candidate lookup: (board, band, bucket) = any of the item's bands
+            models.Index(fields=['board', 'band', 'bucket'], name='similarity_bucket_idx'),
+        ]
+
+
+PATH_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def path_segment(comment_id):
+    """Fixed width base-36 id, so segments sort like the ids they encode."""
+    digits = ''
+    while comment_id:
+        comment_id, digit = divmod(comment_id, len(PATH_DIGITS))
+        digits = PATH_DIGITS[digit] + digits
+    return digits.rjust(Comment.PATH_SEGMENT_LENGTH, '0')
+
+
 class Comment(models.Model):
-    """"" Comment on a feedback item. Users can comment on feedbacks."""""
+    """"" Comment on a feedback item. Users can comment on feedbacks, and reply to comments."""""
+    # materialized path: the path_segment of every ancestor, then of the comment itself, so
+    # ORDER BY path is thread order (oldest root first, replies under their parent) and a
+    # subtree is the paths starting with path (see subtree_range)
+    PATH_SEGMENT_LENGTH = 8
+    MAX_DEPTH = 20
+
     feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='comments')
+    parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
+    path = models.CharField(max_length=PATH_SEGMENT_LENGTH * MAX_DEPTH, editable=False, default='')
     body = models.TextField()
 
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments_created')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['feedback', '-created_at', '-id'], name='comment_feedback_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='comment_created_idx'),
+            # thread order and subtree ranges (CommentViewSet.thread)
+            models.Index(fields=['feedback', 'path'], name='comment_feedback_path_idx'),
+        ]
+
     def __str__(self):
         return f'Comment by {self.created_by.username} on feedback{self.feedback.title}'
+
+    @property
+    def depth(self):
+        """0 for a top-level comment."""
+        return max(len(self.path) // self.PATH_SEGMENT_LENGTH - 1, 0)
+
+    def subtree_range(self):
+        """
+        (low, high) with low <= path < high for the comment and all its replies, in bytewise
+        order (SQLite BINARY, PostgreSQL "C") only: linguistic collations may sort '~' before
+        the digits. path >= low holds under any collation.
+        """
+        return self.path, self.path + '~'
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding or self.path:
+            return super().save(*args, **kwargs)
+        # the path ends with the comment's own id, which is only known after the insert
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.path = (self.parent.path if self.parent_id else '') + path_segment(self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
     
 
+class FeedbackDailyStat(models.Model):
+    """"" Analytics rollup: feedback created on `day` on a board that currently has `status`,
+    with the upvotes and comments those feedbacks have. Maintained by rollups.py."""""
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    status = models.CharField(max_length=30, choices=Feedback.STATUS_CHOICES)
+
+    created_count = models.IntegerField(default=0)
+    upvote_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'day', 'status'], name='feedback_daily_stat_unique'),
+        ]
+        indexes = [
+            # dashboard ranges across all boards
+            models.Index(fields=['day', 'status'], name='daily_stat_day_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.board_id} {self.day} {self.status}: {self.created_count}'
+
+
+class FeedbackStatusChange(models.Model):
+    """"" Append-only status log: one row when a feedback is created (from_status empty) and one
+    per status change, written in the same transaction (status_history.py). """""
+    feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='status_changes')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='+')
+    from_status = models.CharField(max_length=30, choices=Feedback.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=30, choices=Feedback.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    class Meta:
+        indexes = [
+            # a feedback's history, oldest first (cycle time lookups)
+            models.Index(fields=['feedback', 'changed_at'], name='status_change_feedback_idx'),
+            # throughput / completions per board and across boards in a date range
+            models.Index(fields=['board', 'to_status', 'changed_at'], name='status_change_board_idx'),
+            models.Index(fields=['to_status', 'changed_at'], name='status_change_status_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.feedback_id}: {self.from_status or "-"} -> {self.to_status} at {self.changed_at}'
+
+
 class BoardMembershipRequest(models.Model):
     STATUS_PENDING = "pending"
     STATUS_APPROVED = "approved"
@@ -77,6 +276,11 @@ class BoardMembershipRequest(models.Model):
 
     class Meta:
         unique_together = ('board','user','status')  #one request per user per board
+        indexes = [
+            # moderation queues: ?board=&status= and ?status=, both oldest first
+            models.Index(fields=['board', 'status', 'requested_at', 'id'], name='membership_board_queue_idx'),
+            models.Index(fields=['status', 'requested_at', 'id'], name='membership_queue_idx'),
+        ]
 
     def __str__(self):
         return f'Membership request by {self.user.username} for board {self.board.name} - {self.status}'
@@ -0,0 +1,74 @@
+"""
+Bulk approve/reject of board membership requests
+(BoardMembershipRequestViewSet.bulk_approve / bulk_reject).
+
+The requests are read once (locked), checked in Python, then handled with one UPDATE of
+their status and, when approving, one bulk insert into the board members through table
+(ignore_conflicts, so users that already are members are fine). Neither sends signals,
+so the access cache invalidation and the membership events are done here.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import events
+from .access import invalidate_user_access
+from .models import Board, BoardMembershipRequest
+from .permissions import is_admin_or_moderator
+
+MAX_BULK_REQUESTS = 500
+
+RESULT_FORBIDDEN = 'forbidden'
+RESULT_NOT_FOUND = 'not_found'
+RESULT_NOT_PENDING = 'not_pending'
+# the user already has a request with the target status on that board (unique_together)
+RESULT_CONFLICT = 'conflict'
+
+
+def moderate_requests(user, new_status, ids=None, board_id=None):
+    """
+    Approve or reject the pending requests `ids`, or every pending request of `board_id`.
+    Returns [{'id', 'result'}] in input (or queue) order, result being new_status for the
+    handled ones.
+    """
+    Request = BoardMembershipRequest
+    requests = Request.objects.select_for_update(of=('self',)).order_by('requested_at', 'id')
+    if ids is not None:
+        ids = list(dict.fromkeys(ids))
+        requests = requests.filter(pk__in=ids)
+    else:
+        requests = requests.filter(board_id=board_id, status=Request.STATUS_PENDING)[:MAX_BULK_REQUESTS]
+    taken = Request.objects.filter(board_id=OuterRef('board_id'), user_id=OuterRef('user_id'), status=new_status)
+    moderator = is_admin_or_moderator(user)
+
+    with transaction.atomic():
+        rows = {
+            pk: row for pk, *row in requests.annotate(conflict=Exists(taken))
+            .values_list('pk', 'board_id', 'board__created_by_id', 'user_id', 'status', 'conflict')
+        }
+        outcomes = {}
+        for pk, (board, board_owner, requester, current, conflict) in rows.items():
+            if not (moderator or board_owner == user.pk):
+                outcomes[pk] = RESULT_FORBIDDEN
+            elif current != Request.STATUS_PENDING:
+                outcomes[pk] = RESULT_NOT_PENDING
+            elif conflict:
+                outcomes[pk] = RESULT_CONFLICT
+            else:
+                outcomes[pk] = new_status
+        handled = [pk for pk, outcome in outcomes.items() if outcome == new_status]
+
+        if handled:
+            Request.objects.filter(pk__in=handled).update(status=new_status, handled_by=user, handled_at=timezone.now())
+            if new_status == Request.STATUS_APPROVED:
+                through = Board.members.through
+                through.objects.bulk_create([through(board_id=rows[pk][0], user_id=rows[pk][2]) for pk in handled],
+                                            ignore_conflicts=True)
+                member_ids = [rows[pk][2] for pk in handled]
+                transaction.on_commit(lambda: invalidate_user_access(*member_ids))
+            for pk in handled:
+                events.publish_on_commit(events.MEMBERSHIP_REQUEST_UPDATED, rows[pk][0],
+                                         {'id': pk, 'user': rows[pk][2], 'status': new_status}, user_id=rows[pk][2])
+
+    order = ids if ids is not None else list(rows)
+    return [{'id': pk, 'result': outcomes.get(pk, RESULT_NOT_FOUND)} for pk in order]
@@ -0,0 +1,185 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple('Cursor', ['reverse', 'position'])
+
+
+def invert_ordering(ordering):
+    return tuple(term[1:] if term.startswith('-') else f'-{term}' for term in ordering)
+
+
+def with_tie_breaker(ordering):
+    """Append the primary key in the direction of the leading term so the ordering is total."""
+    ordering = tuple('id' if t == 'pk' else '-id' if t == '-pk' else t for t in ordering)
+    if any(term.lstrip('-') == 'id' for term in ordering):
+        return ordering
+    return ordering + ('-id' if ordering[0].startswith('-') else 'id',)
+
+
+def keyset_filter(ordering, position):
+    """
+    Rows strictly after `position` in `ordering`:
+      a <= x AND (a < x OR (a = x AND b < y) OR ...)   (for descending terms)
+    The redundant leading range keeps the query an index range scan.
+    """
+    first = ordering[0].lstrip('-')
+    first_lookup = 'lte' if ordering[0].startswith('-') else 'gte'
+    after = Q()
+    for i, term in enumerate(ordering):
+        name = term.lstrip('-')
+        lookup = 'lt' if term.startswith('-') else 'gt'
+        clause = Q(**{f'{name}__{lookup}': position[i]})
+        for prev_term, prev_value in zip(ordering[:i], position[:i]):
+            clause &= Q(**{prev_term.lstrip('-'): prev_value})
+        after |= clause
+    return Q(**{f'{first}__{first_lookup}': position[0]}) & after
+
+
+def get_position(item, ordering):
+    position = []
+    for term in ordering:
+        name = term.lstrip('-')
+        value = item[name] if isinstance(item, dict) else getattr(item, name)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        position.append(value)
+    return position
+
+
+def parse_position(model, ordering, position):
+    """Turn the JSON values of a cursor back into python values for the ordering fields."""
+    values = []
+    for term, raw in zip(ordering, position):
+        try:
+            values.append(model._meta.get_field(term.lstrip('-')).to_python(raw))
+        except FieldDoesNotExist:
+            # annotations (e.g. search rank) are plain numbers
+            values.append(raw)
+    return values
+
+
+def encode_cursor_token(cursor):
+    payload = {'p': cursor.position}
+    if cursor.reverse:
+        payload['r'] = 1
+    return urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode('ascii')
+
+
+def decode_cursor_token(encoded):
+    """Returns a Cursor or raises ValueError."""
+    try:
+        payload = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+        position = payload['p']
+    except (TypeError, KeyError, UnicodeError, json.JSONDecodeError) as exc:
+        raise ValueError(str(exc))
+    if not isinstance(position, list):
+        raise ValueError('position must be a list')
+    return Cursor(reverse=bool(payload.get('r')), position=position)
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on every ordering term plus an id tie-breaker,
+    e.g. WHERE (upvotes_count, id) < (x, y) ORDER BY -upvotes_count, -id LIMIT n+1.
+    Unlike DRF's CursorPagination it never falls back to OFFSET on duplicate values
+    and never runs COUNT(*), so any page costs the same as the first one.
+    """
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        return with_tie_breaker(super().get_ordering(request, queryset, view))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views."""
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([item async for item in queryset.aiterator(chunk_size=self.page_size + 1)])
+
+    def page_queryset(self, queryset, request, view=None):
+        """The ordered, filtered and sliced queryset for the requested page (not evaluated)."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor.reverse)
+        ordering = invert_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            try:
+                position = parse_position(queryset.model, ordering, self.cursor.position)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(keyset_filter(ordering, position))
+
+        # one extra row tells us whether there is another page
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = decode_cursor_token(encoded)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        # a cursor from another ordering cannot be applied to this one
+        if len(cursor.position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, cursor):
+        return replace_query_param(self.base_url, self.cursor_query_param, encode_cursor_token(cursor))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(reverse=False, position=get_position(self.page[-1], self.ordering)))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(reverse=True, position=get_position(self.page[0], self.ordering)))
+
+
+class MemberPagination(KeysetPagination):
+    """Board members by username; paginate without passing the view so the board ordering is not used."""
+    ordering = ('username',)
+
+
+class ThreadPagination(KeysetPagination):
+    """Comments in thread order (Comment.path); paginate without passing the view so its ordering is not used."""
+    ordering = ('path',)
@@ -1,8 +1,36 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
-from django.contrib.auth.models import Group
+
+ROLE_CACHE_ATTR = '_role_names'
+
+def get_role_names(user):
+    """Group names of the user, loaded with one query and memoized on the user instance.
+    request.user lives for a single request, so every role check after the first one is free."""
+    if not user or not user.is_authenticated:
+        return frozenset()
+    names = getattr(user, ROLE_CACHE_ATTR, None)
+    if names is None:
+        names = frozenset(user.groups.values_list('name', flat=True))
+        setattr(user, ROLE_CACHE_ATTR, names)
+    return names
+
+async def aget_role_names(user):
+    """get_role_names for async views; fills the same memo, so the sync checks after it are free."""
+    if not user or not user.is_authenticated:
+        return frozenset()
+    names = getattr(user, ROLE_CACHE_ATTR, None)
+    if names is None:
+        names = frozenset([name async for name in user.groups.values_list('name', flat=True)])
+        setattr(user, ROLE_CACHE_ATTR, names)
+    return names
+
+def clear_role_cache(user):
+    try:
+        delattr(user, ROLE_CACHE_ATTR)
+    except AttributeError:
+        pass
 
 def user_in_group(user,group_name):
-    return user.is_authenticated and user.groups.filter(name=group_name).exists()
+    return group_name in get_role_names(user)
 
 def is_admin(user):
     return user_in_group(user,'Admin')
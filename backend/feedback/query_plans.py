@@ -0,0 +1,175 @@
+"""
+EXPLAIN the main query of each endpoint and report full table and index scans.
+
+The queries are built by the code the views run: the viewsets' get_queryset(), filter
+backends and pagination on a request from APIRequestFactory, the query helpers of their
+actions, and the *_query functions of the analytics views. They run on a few fixture rows
+in a transaction that is rolled back, against the configured database; the
+`check_query_plans` command reports them.
+
+A SQLite plan line "SCAN t" reads every row of t, "SCAN t USING [COVERING] INDEX i" every
+entry of i: both are reported unless the endpoint is listed in ALLOWED_SCANS. Only
+"SEARCH" lines (a constrained index lookup or range) and FTS5 MATCH lookups pass.
+"""
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from . import analytics_views, duplicates, invites, kanban
+from .benchmarking import scratch_data
+from .models import Board, BoardMembershipRequest, Comment, Feedback
+from .pagination import MemberPagination, ThreadPagination
+from .status_history import completions_query, throughput_query
+from .views import BoardMembershipRequestViewSet, BoardViewSet, CommentViewSet, FeedbackViewSet
+
+# SQLite: "SCAN feedback_feedback", with or without "USING [COVERING] INDEX ..."
+SQLITE_SCAN = re.compile(r'\bSCAN (?!CONSTANT ROW)(?!\(subquery)(\S+)(.*)$')
+# SQLite: "SCAN feedback_search VIRTUAL TABLE INDEX 0:M2", an FTS5 MATCH
+SQLITE_MATCH = re.compile(r'VIRTUAL TABLE INDEX \d+:\S*M')
+# SQLite: "CO-ROUTINE qualify", a derived table that a later "SCAN qualify" reads
+SQLITE_DERIVED = re.compile(r'\b(?:CO-ROUTINE|MATERIALIZE) (\S+)')
+# PostgreSQL: "Seq Scan on feedback_feedback"
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\S+)')
+
+# scans that are the intended plan: {endpoint name: {table: why}}
+ALLOWED_SCANS = {
+    'feedback list (admin)': {
+        'feedback_feedback': "every board, newest first: walks feedback_created_idx and stops at the page size",
+    },
+    'feedback list (admin) ?ordering=-hot': {
+        'feedback_feedback': "every board, hottest first: walks feedback_hot_idx and stops at the page size",
+    },
+}
+
+
+def view_for(viewset, user, action='list', params=None, **kwargs):
+    """A viewset instance set up as for GET ?params by user, without dispatching it."""
+    view = viewset(action_map={'get': action}, format_kwarg=None, args=(), kwargs=kwargs)
+    view.request = view.initialize_request(APIRequestFactory().get('/', params or {}))
+    view.request.user = user
+    return view
+
+
+def list_query(viewset, user, params=None):
+    """The page query of the list endpoint: get_queryset(), the filter backends and the pagination."""
+    view = view_for(viewset, user, params=params)
+    queryset = view.filter_queryset(view.get_queryset())
+    if view.paginator is None:
+        return queryset
+    return view.paginator.page_queryset(queryset, view.request, view)
+
+
+def create_fixtures():
+    """A member of a private board, an admin and a comment thread, the ids the queries filter on."""
+    admin = User.objects.create(username='query-plans-admin')
+    admin.groups.add(Group.objects.get_or_create(name='Admin')[0])
+    member = User.objects.create(username='query-plans-member')
+    boards = [Board.objects.create(name=f"query plans {i}", is_public=i > 0, created_by=admin) for i in range(3)]
+    boards[0].members.add(member)
+    feedback = Feedback.objects.create(board=boards[0], title="Dark mode", body="Please add dark mode", created_by=member)
+    comment = Comment.objects.create(feedback=feedback, body="Agreed", created_by=member)
+    Comment.objects.create(feedback=feedback, parent=comment, body="Same here", created_by=admin)
+    return {'admin': admin, 'member': member, 'board': boards[0], 'feedback': feedback, 'comment': comment}
+
+
+def endpoint_queries(fixtures):
+    """(name, queryset) for the query each endpoint spends its time in."""
+    admin, member = fixtures['admin'], fixtures['member']
+    board, feedback, comment = fixtures['board'], fixtures['feedback'], fixtures['comment']
+    board_id, feedback_id = board.pk, feedback.pk
+    pending = BoardMembershipRequest.STATUS_PENDING
+    now = timezone.now()
+    month_ago = now - timedelta(days=30)
+    dashboard = QueryDict('')
+    board_dashboard = QueryDict(f'board={board_id}')
+
+    board_view = view_for(BoardViewSet, member, 'members', pk=board_id)
+    thread_view = view_for(CommentViewSet, member, 'thread', {'feedback': feedback_id})
+    signature = duplicates.minhash(feedback.title, feedback.body)
+
+    return [
+        ('board list', list_query(BoardViewSet, member)),
+        ('board members', MemberPagination().page_queryset(board_view.members_query(board), board_view.request)),
+        ('board kanban column', kanban.column_query(board_id, Feedback.STATUS_OPEN, kanban.KANBAN_DEFAULT_LIMIT)),
+        ('feedback list', list_query(FeedbackViewSet, member)),
+        ('feedback list (admin)', list_query(FeedbackViewSet, admin)),
+        ('feedback list (admin) ?ordering=-hot', list_query(FeedbackViewSet, admin, {'ordering': '-hot'})),
+        ('feedback list ?board=', list_query(FeedbackViewSet, member, {'board': board_id})),
+        ('feedback list ?board=&status=', list_query(FeedbackViewSet, member, {'board': board_id, 'status': Feedback.STATUS_OPEN})),
+        ('feedback list ?status=', list_query(FeedbackViewSet, admin, {'status': Feedback.STATUS_OPEN})),
+        ('feedback list ?board=&ordering=-upvotes_count', list_query(FeedbackViewSet, member,
+                                                                     {'board': board_id, 'ordering': '-upvotes_count'})),
+        ('feedback list ?board=&ordering=-hot', list_query(FeedbackViewSet, member, {'board': board_id, 'ordering': '-hot'})),
+        ('feedback list ?search=', list_query(FeedbackViewSet, member, {'search': 'dark mode'})),
+        ('feedback list ?board=&search=&ordering=', list_query(FeedbackViewSet, member,
+                                                               {'board': board_id, 'search': 'dark mode', 'ordering': '-created_at'})),
+        ('feedback similar candidates', duplicates.candidates_query(board_id, signature, exclude_id=feedback_id)),
+        ('comment list ?feedback=', list_query(CommentViewSet, member, {'feedback': feedback_id})),
+        ('comment list ?feedback__in=', view_for(CommentViewSet, member).grouped_query([feedback_id, feedback_id + 1], 3)),
+        ('comment thread ?feedback=', ThreadPagination().page_queryset(thread_view.get_queryset(), thread_view.request)),
+        ('comment subtree', ThreadPagination().page_queryset(thread_view.subtree_query(comment), thread_view.request)),
+        ('membership requests ?board=&status=', list_query(BoardMembershipRequestViewSet, admin,
+                                                           {'board': board_id, 'status': pending})),
+        ('membership requests ?status=', list_query(BoardMembershipRequestViewSet, admin, {'status': pending})),
+        ('membership requests (own)', list_query(BoardMembershipRequestViewSet, member)),
+        ('invite by token', invites.invite_query('token')),
+        ('analytics summary', analytics_views.summary_query(dashboard)),
+        ('analytics summary ?board=', analytics_views.summary_query(board_dashboard)),
+        ('analytics trends ?board=', analytics_views.trends_query(board_dashboard)),
+        ('analytics distribution', analytics_views.distribution_query(dashboard)),
+        ('analytics top voted', analytics_views.top_voted_query(dashboard)),
+        ('analytics top voted ?board=', analytics_views.top_voted_query(board_dashboard)),
+        ('analytics columns', analytics_views.columns_query(dashboard)),
+        ('analytics columns ?board=', analytics_views.columns_query(board_dashboard)),
+        ('analytics cycle time', completions_query(month_ago, now)),
+        ('analytics cycle time ?board=', completions_query(month_ago, now, board_id=board_id)),
+        ('analytics throughput', throughput_query(month_ago, now)),
+        ('analytics throughput ?board=', throughput_query(month_ago, now, board_id=board_id)),
+    ]
+
+
+def full_scans(plan):
+    """Tables read by a full table or index scan in an EXPLAIN output."""
+    if connection.vendor == 'postgresql':
+        return POSTGRES_SCAN.findall(plan)
+    # scans of derived tables (subqueries, window filters) read rows another step produced
+    derived = set(SQLITE_DERIVED.findall(plan))
+    scans = []
+    for line in plan.splitlines():
+        match = SQLITE_SCAN.search(line)
+        if match and not SQLITE_MATCH.search(match.group(2)) and match.group(1) not in derived:
+            scans.append(match.group(1))
+    return scans
+
+
+def explain(queryset):
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # small tables are cheaper to seq scan; ask whether an index *could* be used
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        # QuerySet.explain() puts the prefix inside the wrapping SELECT of window filters
+        # (QUALIFY emulation), so run it on the compiled SQL
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+def check_query_plans():
+    """[(name, plan, scanned_tables)] for every endpoint query, allowed scans left out."""
+    results = []
+    # the paginators build their links from the request host
+    with scratch_data(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for name, queryset in endpoint_queries(create_fixtures()):
+            plan = explain(queryset)
+            allowed = ALLOWED_SCANS.get(name, {})
+            results.append((name, plan, [table for table in full_scans(plan) if table not in allowed]))
+    return results
@@ -0,0 +1,63 @@
+"""
+Hot ranking of feedback (?ordering=-hot), stored in Feedback.hot_score.
+
+The score is activity with exponential time decay, kept in log space:
+
+    hot_score = log2(1 + upvotes + COMMENT_WEIGHT * comments) + (created_at - HOT_EPOCH) / HOT_HALF_LIFE
+
+Every half-life of age costs an item one point, the same as halving its activity, so
+an item needs twice the votes of one created a half-life later to rank next to it.
+Because the decay term only depends on created_at, the relative order of stored scores
+never goes stale with time: a score only changes when its upvotes or comments do, and
+those writes update it (signals.py, the upvote action, bulk import). The index on
+(board, -hot_score, -id) then serves ?ordering=-hot as a range scan.
+
+refresh_hot_scores recomputes every row, e.g. after changing the weights below or
+after writes that bypassed the ORM.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+from .models import Feedback
+
+COMMENT_WEIGHT = 2
+HOT_HALF_LIFE = timedelta(days=2)
+HOT_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+REFRESH_BATCH_SIZE = 1000
+SCORE_FIELDS = ('created_at', 'upvotes_count', 'comments_count', 'hot_score')
+
+
+def hot_score(upvotes, comments, created_at):
+    activity = 1 + upvotes + COMMENT_WEIGHT * comments
+    age = (created_at or timezone.now()) - HOT_EPOCH
+    return round(math.log2(activity) + age / HOT_HALF_LIFE, 6)
+
+
+def _rescore(feedbacks):
+    changed = []
+    for feedback in feedbacks:
+        score = hot_score(feedback.upvotes_count, feedback.comments_count, feedback.created_at)
+        if score != feedback.hot_score:
+            feedback.hot_score = score
+            changed.append(feedback)
+    Feedback.objects.bulk_update(changed, ['hot_score'])
+    return len(changed)
+
+
+def update_hot_scores(feedback_ids):
+    """Recompute the stored score of the given feedbacks from their current counts."""
+    return _rescore(Feedback.objects.filter(pk__in=list(feedback_ids)).only(*SCORE_FIELDS))
+
+
+def refresh_hot_scores(batch_size=REFRESH_BATCH_SIZE):
+    """Recompute every stored score, batch_size rows per query. Returns the number of rows changed."""
+    changed, last_id = 0, 0
+    base = Feedback.objects.only(*SCORE_FIELDS).order_by('id')
+    while True:
+        batch = list(base.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return changed
+        changed += _rescore(batch)
+        last_id = batch[-1].id
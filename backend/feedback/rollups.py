@@ -0,0 +1,110 @@
+"""
+Maintenance of the FeedbackDailyStat analytics rollup.
+
+A rollup row is keyed by (board_id, day, status) where day is the local creation date
+of the feedback and status its current status. Writes schedule a refresh of the keys
+they touch; each refresh recomputes just those groups from the source tables after the
+transaction commits, so cascades and rollbacks can never leave drifted counters.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .analytics_cache import analytics_cache, invalidate_boards
+from .models import Comment, Feedback, FeedbackDailyStat
+
+REFRESH_CHUNK_SIZE = 100
+
+
+def rollup_key(feedback, status=None):
+    return (feedback.board_id, timezone.localdate(feedback.created_at), status or feedback.status)
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _refresh_chunk(keys):
+    feedback_match, comment_match = Q(), Q()
+    for board_id, day, status in keys:
+        start, end = _day_bounds(day)
+        feedback_match |= Q(board_id=board_id, status=status, created_at__gte=start, created_at__lt=end)
+        comment_match |= Q(feedback__board_id=board_id, feedback__status=status,
+                           feedback__created_at__gte=start, feedback__created_at__lt=end)
+
+    stats = {}
+    feedback_rows = (Feedback.objects.filter(feedback_match).order_by()
+                     .annotate(day=TruncDate('created_at')).values('board_id', 'day', 'status')
+                     .annotate(created=Count('id'), upvotes=Sum('upvotes_count')))
+    for row in feedback_rows:
+        stats[(row['board_id'], row['day'], row['status'])] = FeedbackDailyStat(
+            board_id=row['board_id'], day=row['day'], status=row['status'],
+            created_count=row['created'], upvote_count=row['upvotes'] or 0,
+        )
+    comment_rows = (Comment.objects.filter(comment_match).order_by()
+                    .annotate(day=TruncDate('feedback__created_at'))
+                    .values('feedback__board_id', 'day', 'feedback__status').annotate(comments=Count('id')))
+    for row in comment_rows:
+        stat = stats.get((row['feedback__board_id'], row['day'], row['feedback__status']))
+        if stat is not None:
+            stat.comment_count = row['comments']
+
+    if stats:
+        FeedbackDailyStat.objects.bulk_create(
+            stats.values(), update_conflicts=True, unique_fields=['board', 'day', 'status'],
+            update_fields=['created_count', 'upvote_count', 'comment_count'],
+        )
+    empty = Q()
+    for key in keys:
+        if key not in stats:
+            empty |= Q(board_id=key[0], day=key[1], status=key[2])
+    if empty:
+        FeedbackDailyStat.objects.filter(empty).delete()
+
+
+def refresh_daily_stats(keys):
+    """Recompute the rollup rows for the given (board_id, day, status) keys."""
+    keys = list(set(keys))
+    for i in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        _refresh_chunk(keys[i:i + REFRESH_CHUNK_SIZE])
+    invalidate_boards(*{board_id for board_id, _, _ in keys})
+
+
+def schedule_refresh(keys):
+    """Refresh the given keys once the current transaction commits."""
+    keys = set(keys)
+    if keys:
+        transaction.on_commit(lambda: refresh_daily_stats(keys))
+
+
+def schedule_feedback_refresh(feedbacks):
+    schedule_refresh(rollup_key(feedback) for feedback in feedbacks)
+
+
+def rebuild_daily_stats(batch_size=1000):
+    """Recompute the whole rollup table from Feedback and Comment. Returns the number of rows."""
+    with transaction.atomic():
+        FeedbackDailyStat.objects.all().delete()
+        comments = {
+            (row['feedback__board_id'], row['day'], row['feedback__status']): row['comments']
+            for row in Comment.objects.order_by().annotate(day=TruncDate('feedback__created_at'))
+            .values('feedback__board_id', 'day', 'feedback__status').annotate(comments=Count('id'))
+        }
+        rows = (Feedback.objects.order_by().annotate(day=TruncDate('created_at'))
+                .values('board_id', 'day', 'status').annotate(created=Count('id'), upvotes=Sum('upvotes_count')))
+        stats = [
+            FeedbackDailyStat(
+                board_id=row['board_id'], day=row['day'], status=row['status'],
+                created_count=row['created'], upvote_count=row['upvotes'] or 0,
+                comment_count=comments.get((row['board_id'], row['day'], row['status']), 0),
+            )
+            for row in rows
+        ]
+        FeedbackDailyStat.objects.bulk_create(stats, batch_size=batch_size)
+    # the analytics cache alias is dedicated, dropping it invalidates every board
+    transaction.on_commit(lambda: analytics_cache().clear())
+    return len(stats)
@@ -0,0 +1,148 @@
+"""
+Full-text search over Feedback.title/body.
+
+SQLite: an FTS5 table `feedback_search` (rowid = feedback id, mapped read-only by
+FeedbackSearchEntry) kept in sync from signals.py and index_feedback() for bulk
+writes, ranked with bm25().
+PostgreSQL: a GIN expression index on the tsvector (migration 0007), ranked with ts_rank.
+Either way the result is a Feedback queryset, so the board/status filters, visibility
+rules and pagination still apply.
+
+Ranking has to score every match before the best page is known, which for a common term
+is most of the table. Ranked searches therefore score only the RANK_CANDIDATES newest
+matches the queryset keeps (annotated as `search_rank`, higher is better); the older
+matches follow them with search_rank UNRANKED, newest first, so paging still reaches every
+match. A search with an explicit ?ordering= is not ranked at all.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from .models import Feedback, FeedbackSearchEntry
+from .pagination import KeysetPagination
+
+SEARCH_TABLE = 'feedback_search'
+SEARCH_CONFIG = 'english'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+# matches scored for a ranked search, the newest first
+RANK_CANDIDATES = 200
+# search_rank of the matches after the candidates, below every bm25/ts_rank score
+UNRANKED = -1.0
+# older matches a ranked page can reach past the candidates: the largest page and one more
+LOOKAHEAD = KeysetPagination.max_page_size + 1
+
+
+def feedback_search_vector():
+    # must stay identical to the indexed expression in migration 0007
+    return SearchVector('title', 'body', config=SEARCH_CONFIG)
+
+
+def fts5_query(terms):
+    """Quote every word so user input can never be parsed as FTS5 syntax; words are ANDed."""
+    return ' '.join(f'"{token}"' for token in _TOKEN_RE.findall(terms))
+
+
+def nth_newest(newest, n):
+    """Id of the n-th of the newest-first match ids, 0 when there are fewer."""
+    return Coalesce(Subquery(newest[n - 1:n]), 0)
+
+
+def in_unranked_matches(cursor):
+    """Whether a ranked search's keyset cursor points at one of the matches after the candidates."""
+    return (cursor is not None and len(cursor.position) == 2 and cursor.position[0] == UNRANKED
+            and isinstance(cursor.position[1], int))
+
+
+def ranked_window(newest, cursor):
+    """
+    (lowest id, oldest candidate id) of the matches a ranked page can reach: the candidates
+    and LOOKAHEAD older matches, or, when paging back from the older matches, every match
+    above the cursor. A page never scores more than the candidates nor sorts much more.
+    """
+    lowest = (Value(cursor.position[1]) if in_unranked_matches(cursor)
+              else nth_newest(newest, RANK_CANDIDATES + LOOKAHEAD))
+    return lowest, nth_newest(newest, RANK_CANDIDATES)
+
+
+def candidate_rank(oldest_candidate, score):
+    """search_rank: score for the matches from oldest_candidate on, UNRANKED for the older ones."""
+    return Case(When(pk__gte=oldest_candidate, then=score), default=Value(UNRANKED), output_field=FloatField())
+
+
+def search_feedback(queryset, terms, ranked=True, cursor=None):
+    """
+    Feedback of queryset matching terms, annotated with search_rank when ranked. cursor is
+    the keyset Cursor (pagination.py) of the requested page of a ranked search, ordered by
+    (-search_rank, -id), and decides which matches the page can reach.
+    """
+    if ranked and in_unranked_matches(cursor) and not cursor.reverse:
+        # a page after the candidates: the older matches newest first, as an unranked search
+        return search_feedback(queryset, terms, ranked=False).annotate(
+            search_rank=Value(UNRANKED, output_field=FloatField()))
+
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+        matches = queryset.annotate(search_document=feedback_search_vector()).filter(search_document=query)
+        if not ranked:
+            return matches
+        lowest, oldest_candidate = ranked_window(matches.order_by('-pk').values('pk'), cursor)
+        return (matches.filter(pk__gte=lowest)
+                .annotate(search_rank=candidate_rank(oldest_candidate, SearchRank(feedback_search_vector(), query))))
+
+    match = fts5_query(terms)
+    if not match:
+        if not ranked:
+            return queryset.none()
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+    if not ranked:
+        # the matching ids come from one pass over the index; joining on MATCH instead would
+        # re-run the query for every row the ordering index walks past
+        return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [match]))
+    # FTS5 walks the matches newest first and stops at the n-th one the queryset keeps
+    newest = (FeedbackSearchEntry.objects.filter(match=match)
+              .filter(Exists(queryset.filter(pk=OuterRef('pk'))))
+              .order_by('-pk').values('pk'))
+    lowest, oldest_candidate = ranked_window(newest, cursor)
+    # joins feedback_search on rowid with the range pushed into FTS5, which drives the join and
+    # gathers the statistics bm25 (`rank`, lower is better) needs once; a row's rank is only
+    # computed when read, i.e. for the candidates
+    return (queryset.filter(search_entry__match=match, search_entry__pk__gte=lowest)
+            .annotate(search_rank=candidate_rank(oldest_candidate, F('search_entry__rank') * -1)))
+
+
+def uses_search_table():
+    return connection.vendor == 'sqlite'
+
+
+def index_feedback(feedbacks):
+    """(Re)index feedback rows in the SQLite search table. No-op on PostgreSQL."""
+    if not uses_search_table():
+        return
+    rows = [(f.pk, f.title, f.body) for f in feedbacks]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', rows)
+
+
+def unindex_feedback(feedback_ids):
+    if not uses_search_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [(pk,) for pk in feedback_ids])
+
+
+def rebuild_search_index():
+    """Repopulate the SQLite search table from feedback_feedback. Returns the number of rows."""
+    if not uses_search_table():
+        return Feedback.objects.count()
+    table = connection.ops.quote_name(Feedback._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) SELECT id, title, body FROM {table}')
+        return cursor.rowcount
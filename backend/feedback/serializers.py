@@ -15,6 +15,22 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'groups', 'is_staff', 'is_superuser']
         read_only_fields = ['id', 'username', 'email', 'groups', 'is_staff', 'is_superuser']
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+        read_only_fields = ['id', 'username']
+
+class BoardListSerializer(serializers.ModelSerializer):
+    """Compact board for list pages: members are only counted, see /board/{id}/members/."""
+    created_by = UserSummarySerializer(read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Board
+        fields = ['id','name','description','is_public','created_by','created_at','member_count']
+        read_only_fields = fields
+
 class BoardSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True) 
     members= UserSerializer(many=True, read_only=True)
@@ -24,18 +40,35 @@ class BoardSerializer(serializers.ModelSerializer):
         fields = ['id','name','description','is_public','created_by','created_at', 'members']
         read_only_fields = ['id','created_by','created_at', 'members']
     
+class CommentPreviewSerializer(serializers.ModelSerializer):
+    """Newest comment shown on a feedback card, body cut to PREVIEW_LENGTH characters."""
+    PREVIEW_LENGTH = 140
+
+    created_by = UserSummarySerializer(read_only=True)
+    body = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = ['id','body','created_by','created_at']
+        read_only_fields = fields
+
+    def get_body(self, obj):
+        return obj.body[:self.PREVIEW_LENGTH]
+
 class FeedbackSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
-    upvotes_count = serializers.SerializerMethodField(read_only=True)
+    upvotes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    last_comment = CommentPreviewSerializer(read_only=True)
     status = serializers.CharField(read_only=True)
 
     class Meta:
         model = Feedback
-        fields = ['id','board','title','body','created_by','created_at','updated_at','status','upvotes_count']
-        read_only_fields = ['id','created_by','created_at','updated_at','upvotes_count','status']
-    def get_upvotes_count(self, obj):
-        return obj.upvotes.count()
-    
+        fields = ['id','board','title','body','created_by','created_at','updated_at','status','upvotes_count',
+                  'comments_count','last_comment']
+        read_only_fields = ['id','created_by','created_at','updated_at','upvotes_count','status',
+                            'comments_count','last_comment']
+
     def update(self, instance, validated_data):
         # Prevent status from being updated via this serializer
         validated_data.pop('status', None)
@@ -44,13 +77,43 @@ class FeedbackSerializer(serializers.ModelSerializer):
 class FeedbackStatusSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=Feedback.STATUS_CHOICES)
 
+class FeedbackBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500)
+    status = serializers.ChoiceField(choices=Feedback.STATUS_CHOICES)
+
+class FeedbackMergeSerializer(serializers.Serializer):
+    into = serializers.IntegerField(min_value=1)
+
+class FeedbackImportSerializer(serializers.Serializer):
+    """One row of a bulk import (see bulk.py); board access is checked per board, not per row."""
+    board = serializers.IntegerField(min_value=1)
+    title = serializers.CharField(max_length=255)
+    body = serializers.CharField()
+    status = serializers.ChoiceField(choices=Feedback.STATUS_CHOICES, required=False)
+
 class CommentSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
+    depth = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Comment
-        fields = ['id','feedback','body','created_by','created_at']
-        read_only_fields = ['id','created_by','created_at']
+        fields = ['id','feedback','parent','depth','body','created_by','created_at']
+        read_only_fields = ['id','depth','created_by','created_at']
+
+    def validate(self, attrs):
+        parent = attrs.get('parent')
+        if self.instance is not None:
+            # the path of a comment and its replies is fixed once created
+            if 'parent' in attrs and parent != self.instance.parent:
+                raise serializers.ValidationError({'parent': 'A reply cannot be moved.'})
+            if 'feedback' in attrs and attrs['feedback'] != self.instance.feedback:
+                raise serializers.ValidationError({'feedback': 'A comment cannot be moved.'})
+        elif parent is not None:
+            if parent.feedback_id != attrs['feedback'].id:
+                raise serializers.ValidationError({'parent': 'The parent comment belongs to another feedback.'})
+            if parent.depth + 1 >= Comment.MAX_DEPTH:
+                raise serializers.ValidationError({'parent': 'This thread is too deep to reply to.'})
+        return attrs
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True,min_length=8)
@@ -78,6 +141,16 @@ class BoardMembershipRequestSerializer(serializers.ModelSerializer):
         fields = ['id','board','user','status','message','requested_at','handled_at','handled_by']
         read_only_fields = ['id','user','status','requested_at','handled_at','handled_by']
     
+class MembershipRequestBulkSerializer(serializers.Serializer):
+    """Either the request ids, or a board to handle all of its pending requests (see moderation.py)."""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500, required=False)
+    board = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('board' in attrs):
+            raise serializers.ValidationError("Provide either ids or board.")
+        return attrs
+
 class BoardInviteSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.all())
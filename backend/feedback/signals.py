@@ -0,0 +1,151 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .access import invalidate_public_access, invalidate_user_access
+from .analytics_cache import invalidate_boards
+from . import events
+from .counters import sync_comment_stats, sync_upvotes_count
+from .duplicates import index_similarity
+from .models import Board, BoardMembershipRequest, Comment, Feedback
+from .permissions import clear_role_cache
+from .ranking import hot_score
+from .rollups import rollup_key, schedule_refresh
+from .search import index_feedback, unindex_feedback
+from .status_history import record_changes, record_created
+
+
+#upvotes changed through the ORM (admin, shell, user.upvoted_feedbacks...) instead of Feedback.toggle_upvote
+@receiver(m2m_changed, sender=Feedback.upvotes.through)
+def upvotes_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # pk_set is not provided on clear, remember which feedbacks the user had upvoted
+        instance._cleared_upvote_ids = list(instance.upvoted_feedbacks.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_upvotes_count([instance.pk])
+    elif action == 'post_clear':
+        sync_upvotes_count(getattr(instance, '_cleared_upvote_ids', []))
+    elif pk_set:
+        sync_upvotes_count(pk_set)
+
+
+#role names are memoized on the user instance (permissions.get_role_names)
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        clear_role_cache(instance)
+
+
+#board visibility cache (access.accessible_board_ids)
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def board_changed(sender, instance, **kwargs):
+    invalidate_public_access()
+    invalidate_boards(instance.pk)
+
+
+#membership changes: board.members.add(...) from approvals and invites, or user.boards...
+@receiver(m2m_changed, sender=Board.members.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse and action == 'pre_clear':
+        instance._cleared_member_ids = list(instance.members.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        invalidate_user_access(instance.pk)
+    elif action == 'post_clear':
+        invalidate_user_access(*getattr(instance, '_cleared_member_ids', []))
+    elif pk_set:
+        invalidate_user_access(*pk_set)
+
+
+#analytics rollups (rollups.py): remember the loaded status so a status change refreshes both groups
+@receiver(post_init, sender=Feedback)
+def remember_feedback_status(sender, instance, **kwargs):
+    instance._rollup_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Feedback)
+def feedback_saved(sender, instance, created, **kwargs):
+    previous_status, instance._rollup_status = instance._rollup_status, instance.status
+    if created:
+        record_created([instance])
+        schedule_refresh([rollup_key(instance)])
+        events.publish_on_commit(events.FEEDBACK_CREATED, instance.board_id, events.feedback_payload(instance))
+    elif previous_status and previous_status != instance.status:
+        record_changes([instance], {instance.pk: previous_status}, instance.status, timezone.now(),
+                       getattr(instance, '_status_changed_by', None))
+        schedule_refresh([rollup_key(instance), rollup_key(instance, status=previous_status)])
+        events.publish_on_commit(events.FEEDBACK_STATUS_CHANGED, instance.board_id,
+                                 {'id': instance.pk, 'status': instance.status, 'previous_status': previous_status})
+    else:
+        # title edits still change the top voted list
+        transaction.on_commit(lambda: invalidate_boards(instance.board_id))
+
+
+@receiver(post_delete, sender=Feedback)
+def feedback_deleted(sender, instance, **kwargs):
+    schedule_refresh([rollup_key(instance)])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, created=True, **kwargs):
+    if not created:
+        return
+    feedback = Feedback.objects.filter(pk=instance.feedback_id).only('board_id', 'created_at', 'status').first()
+    if feedback is not None:
+        schedule_refresh([rollup_key(feedback)])
+
+
+#hot ranking (ranking.py): new feedback starts with its decay term
+@receiver(pre_save, sender=Feedback)
+def score_new_feedback(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance.hot_score = hot_score(instance.upvotes_count, 0, instance.created_at)
+
+
+#comment counter and latest comment on Feedback (recomputed, so concurrent writes cannot drift them)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_stats_changed(sender, instance, created=True, **kwargs):
+    if created:
+        sync_comment_stats([instance.feedback_id])
+
+
+#live events (events.py); feedback events are published above with the rollup refreshes
+@receiver(post_save, sender=Comment)
+def publish_comment_created(sender, instance, created, **kwargs):
+    if created:
+        events.publish_on_commit(events.COMMENT_CREATED, instance.feedback.board_id, {
+            'id': instance.pk, 'feedback': instance.feedback_id, 'created_by': instance.created_by_id,
+            'created_at': instance.created_at.isoformat(),
+        })
+
+
+#membership requests are only shown to moderators, the board creator and the requesting user
+@receiver(post_save, sender=BoardMembershipRequest)
+def publish_membership_request(sender, instance, created, **kwargs):
+    event_type = events.MEMBERSHIP_REQUEST_CREATED if created else events.MEMBERSHIP_REQUEST_UPDATED
+    events.publish_on_commit(event_type, instance.board_id,
+                             {'id': instance.pk, 'user': instance.user_id, 'status': instance.status},
+                             user_id=instance.user_id)
+
+
+#full-text search table (search.py) and duplicate index (duplicates.py), only title/body (and board) matter
+@receiver(post_save, sender=Feedback)
+def index_saved_feedback(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or {'title', 'body'} & set(update_fields):
+        index_feedback([instance])
+        index_similarity([instance])
+
+
+@receiver(post_delete, sender=Feedback)
+def unindex_deleted_feedback(sender, instance, **kwargs):
+    unindex_feedback([instance.pk])
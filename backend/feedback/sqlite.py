@@ -0,0 +1,66 @@
+"""
+SQLite production profile (settings.SQLITE_PRAGMAS, DATABASES OPTIONS transaction_mode).
+
+configure_connection runs the pragmas on every new connection (connection_created, see
+apps.py): WAL journaling, so readers and the single writer no longer block each other,
+synchronous=NORMAL (durable at checkpoints, safe with WAL), a busy timeout, memory mapped
+reads and a larger page cache.
+
+With transaction_mode IMMEDIATE every atomic() block starts with BEGIN IMMEDIATE and takes
+the write lock up front, waiting up to busy_timeout for it. A deferred transaction that
+reads first and writes later can instead fail at once with "database is locked" when two
+of them try to upgrade at the same time, since waiting would deadlock.
+
+write_transaction is the last line of defence for the hot write paths (upvotes, comments,
+status changes, invites): when the lock is still not available after busy_timeout, the
+whole transaction is run again after a short random backoff. With BEGIN IMMEDIATE that
+error comes from the BEGIN itself, before any statement of the transaction ran, so the
+in-memory state of the caller (e.g. the instance being saved) is still as it was.
+"""
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+WRITE_BACKOFF_SECONDS = 0.05
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    # on the driver connection: these are part of connecting, not queries of the request
+    for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def is_locked_error(exc):
+    return isinstance(exc, OperationalError) and 'locked' in str(exc)
+
+
+def write_transaction(func=None, *, using=None):
+    """
+    Run func in transaction.atomic(), again (up to settings.SQLITE_WRITE_ATTEMPTS times in
+    all) when it fails because the database is locked. Inside an outer transaction there
+    is nothing to retry from, func then simply runs in a savepoint.
+    """
+    if func is None:
+        return functools.partial(write_transaction, using=using)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        alias = using or DEFAULT_DB_ALIAS
+        if connections[alias].in_atomic_block:
+            with transaction.atomic(using=alias):
+                return func(*args, **kwargs)
+        attempts = max(1, getattr(settings, 'SQLITE_WRITE_ATTEMPTS', 1))
+        for attempt in range(attempts):
+            try:
+                with transaction.atomic(using=alias):
+                    return func(*args, **kwargs)
+            except OperationalError as exc:
+                if attempt == attempts - 1 or not is_locked_error(exc):
+                    raise
+                time.sleep(random.uniform(0, WRITE_BACKOFF_SECONDS * 2 ** attempt))
+    return wrapper
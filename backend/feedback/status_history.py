@@ -0,0 +1,114 @@
+"""
+Status history of feedback (FeedbackStatusChange) and the analytics that read it
+(the /analytics/cycle_time/ and /analytics/throughput/ endpoints).
+
+Feedback.status only holds the current status and updated_at moves on any edit, so the
+log is the source for when an item was created, started and completed. Rows are only
+ever inserted: by the feedback post_save signal for creates and single status changes
+(FeedbackViewSet.set_status saves inside a transaction, so both commit together), by
+bulk.set_status_bulk next to its UPDATE and by the bulk import.
+
+Lead time runs from creation to completion, cycle time from the latest move to
+in_progress before the completion (lead time when the item skipped in_progress). Both are
+measured for each completion inside the range, so a reopened and completed-again item
+counts once per completion.
+"""
+import numpy as np
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import TruncWeek
+
+from .analytics_engine import SECONDS_PER_HOUR, group_percentiles, percentile_summary
+from .models import Board, Feedback, FeedbackStatusChange
+
+
+def record_created(feedbacks):
+    """Log the initial status of new feedback rows (bulk_create friendly)."""
+    FeedbackStatusChange.objects.bulk_create([
+        FeedbackStatusChange(feedback_id=feedback.pk, board_id=feedback.board_id, to_status=feedback.status,
+                             changed_at=feedback.created_at, changed_by_id=feedback.created_by_id)
+        for feedback in feedbacks
+    ])
+
+
+def record_changes(feedbacks, previous_statuses, status, changed_at, changed_by=None):
+    """Log a move of `feedbacks` to `status`; previous_statuses is {feedback id: status}."""
+    FeedbackStatusChange.objects.bulk_create([
+        FeedbackStatusChange(feedback_id=feedback.pk, board_id=feedback.board_id, from_status=previous_statuses[feedback.pk],
+                             to_status=status, changed_at=changed_at, changed_by=changed_by)
+        for feedback in feedbacks
+    ])
+
+
+def changes_between(start, end, status, board_id=None):
+    """Moves to `status` with changed_at in [start, end)."""
+    qs = FeedbackStatusChange.objects.filter(to_status=status, changed_at__gte=start, changed_at__lt=end)
+    if board_id:
+        qs = qs.filter(board_id=board_id)
+    return qs
+
+
+def completions_query(start, end, board_id=None):
+    """
+    (board_id, completed_at, created_at, started_at) for every completion in the range; the
+    two earlier timestamps are correlated subqueries over the same feedback's history.
+    """
+    history = FeedbackStatusChange.objects.filter(feedback_id=OuterRef('feedback_id'), changed_at__lte=OuterRef('changed_at'))
+    created = history.filter(from_status='').order_by('changed_at').values('changed_at')[:1]
+    # a reopened item is timed from its last start, not from the one of its first cycle
+    started = (history.filter(to_status=Feedback.STATUS_IN_PROGRESS)
+               .order_by('-changed_at', '-id').values('changed_at')[:1])
+    return (changes_between(start, end, Feedback.STATUS_COMPLETED, board_id)
+            .annotate(created_at=Subquery(created), started_at=Subquery(started))
+            .values_list('board_id', 'changed_at', 'created_at', 'started_at'))
+
+
+def round_hours(value):
+    return round(float(value), 2)
+
+
+def cycle_time_data(rows):
+    """Lead and cycle time percentiles (hours), overall and per board."""
+    rows = [row for row in rows if row[2] is not None]
+    count = len(rows)
+    board_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+    completed = np.fromiter((row[1].timestamp() for row in rows), dtype=np.float64, count=count)
+    created = np.fromiter((row[2].timestamp() for row in rows), dtype=np.float64, count=count)
+    started = np.fromiter(((row[3] or row[2]).timestamp() for row in rows), dtype=np.float64, count=count)
+    lead = (completed - created) / SECONDS_PER_HOUR
+    cycle = (completed - started) / SECONDS_PER_HOUR
+
+    boards, board_of = np.unique(board_ids, return_inverse=True)
+    counts = np.bincount(board_of, minlength=len(boards))
+    per_board = {
+        name: group_percentiles(board_of, values, len(boards), pct)
+        for name, values, pct in (('lead_p50', lead, 50), ('lead_p90', lead, 90), ('cycle_p50', cycle, 50), ('cycle_p90', cycle, 90))
+    }
+    names = dict(Board.objects.filter(id__in=boards.tolist()).values_list('id', 'name'))
+    return {
+        'completed': count,
+        'lead_time_hours': percentile_summary(lead),
+        'cycle_time_hours': percentile_summary(cycle),
+        'boards': [
+            {'board_id': int(board_id), 'board_name': names.get(int(board_id)), 'completed': int(counts[i]),
+             'lead_time_p50_hours': round_hours(per_board['lead_p50'][i]), 'lead_time_p90_hours': round_hours(per_board['lead_p90'][i]),
+             'cycle_time_p50_hours': round_hours(per_board['cycle_p50'][i]), 'cycle_time_p90_hours': round_hours(per_board['cycle_p90'][i])}
+            for i, board_id in enumerate(boards)
+        ],
+    }
+
+
+def throughput_query(start, end, status=Feedback.STATUS_COMPLETED, board_id=None):
+    return (changes_between(start, end, status, board_id).annotate(week=TruncWeek('changed_at'))
+            .values('board_id', 'week').annotate(count=Count('id')).order_by('board_id', 'week'))
+
+
+def throughput_data(rows):
+    """[{board_id, board_name, weeks: [{week, count}]}] from (board, week) counts."""
+    boards = {}
+    for row in rows:
+        boards.setdefault(row['board_id'], []).append({'week': row['week'].date().isoformat(), 'count': row['count']})
+    names = dict(Board.objects.filter(id__in=list(boards)).values_list('id', 'name'))
+    return [
+        {'board_id': board_id, 'board_name': names.get(board_id), 'total': sum(week['count'] for week in weeks), 'weeks': weeks}
+        for board_id, weeks in boards.items()
+    ]
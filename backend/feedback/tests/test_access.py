@@ -0,0 +1,66 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from feedback.access import PUBLIC_GENERATION_KEY
+from feedback.models import Board, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class BoardAccessIndexTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.user = User.objects.create_user("user", password="pass")
+        self.private_board = Board.objects.create(name="Private", is_public=False, created_by=self.owner)
+        self.feedback = Feedback.objects.create(board=self.private_board, title="T", body="B", created_by=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def feedback_ids(self):
+        res = self.client.get(f"{API_BASE}/feedback/")
+        return [item["id"] for item in res.data["results"]]
+
+    def test_membership_changes_invalidate_cached_board_ids(self):
+        self.assertEqual(self.feedback_ids(), [])
+        self.private_board.members.add(self.user)
+        self.assertEqual(self.feedback_ids(), [self.feedback.id])
+        self.user.boards.remove(self.private_board)
+        self.assertEqual(self.feedback_ids(), [])
+
+    def test_visibility_change_invalidates_cached_board_ids(self):
+        self.assertEqual(self.feedback_ids(), [])
+        self.private_board.is_public = True
+        self.private_board.save()
+        self.assertEqual(self.feedback_ids(), [self.feedback.id])
+
+    def test_invalidation_reaches_other_processes_sharing_the_access_cache(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}
+        with override_settings(CACHES={**settings.CACHES, "access": shared}):
+            self.assertEqual(self.feedback_ids(), [])
+            # what another worker process sees: its own cache instance on the same location
+            other_worker = caches.create_connection("access")
+            public_generation = other_worker.get(PUBLIC_GENERATION_KEY)
+            self.assertIsNotNone(public_generation)
+            self.private_board.is_public = True
+            self.private_board.save()
+            self.assertNotEqual(other_worker.get(PUBLIC_GENERATION_KEY), public_generation)
+
+    def test_visibility_filter_has_no_join_or_distinct(self):
+        public_board = Board.objects.create(name="Public", is_public=True, created_by=self.owner)
+        Feedback.objects.create(board=public_board, title="P", body="B", created_by=self.owner)
+        self.feedback_ids()  # warm the cache
+        with CaptureQueriesContext(connection) as ctx:
+            self.feedback_ids()
+        feedback_sql = [q["sql"] for q in ctx.captured_queries if 'FROM "feedback_feedback"' in q["sql"]]
+        self.assertEqual(len(feedback_sql), 1)
+        self.assertNotIn("DISTINCT", feedback_sql[0])
+        self.assertNotIn("feedback_board_members", feedback_sql[0])
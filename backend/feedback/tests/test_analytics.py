@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.test import TestCase
+from django.contrib.auth.models import User, Group
+from rest_framework.test import APIClient
+from feedback.models import Board, Feedback, Comment, FeedbackDailyStat
+from feedback.analytics_engine import group_percentiles
+from feedback.rollups import rebuild_daily_stats
+
+API_BASE = "/feedback-api/v1"
+
+
+class AnalyticsRollupTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="pass")
+        self.admin.groups.add(Group.objects.get_or_create(name="Admin")[0])
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.admin)
+        self.board.members.add(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first = Feedback.objects.create(board=self.board, title="A", body="B", created_by=self.admin)
+            self.second = Feedback.objects.create(board=self.board, title="C", body="D", created_by=self.admin)
+            Comment.objects.create(feedback=self.first, body="c", created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def snapshot(self):
+        return sorted(FeedbackDailyStat.objects.values_list("board_id", "day", "status", "created_count", "upvote_count", "comment_count"))
+
+    def test_summary_reads_rollups(self):
+        res = self.client.get(f"{API_BASE}/analytics/summary/?board={self.board.id}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.data["total"], res.data["open"], res.data["comments"]), (2, 2, 1))
+
+    def test_writes_keep_rollups_in_sync(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"{API_BASE}/feedback/{self.first.id}/set_status/", {"status": "completed"}, format="json")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"{API_BASE}/feedback/{self.first.id}/upvote/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.delete()
+
+        res = self.client.get(f"{API_BASE}/analytics/distribution/?by=status")
+        self.assertEqual([(r["key"], r["count"]) for r in res.data], [("completed", 1)])
+        incremental = self.snapshot()
+        self.assertEqual(incremental[0][3:], (1, 1, 1))
+        rebuild_daily_stats()
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_trends_group_rollup_days(self):
+        res = self.client.get(f"{API_BASE}/analytics/trends/?granularity=monthly")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(sum(r["count"] for r in res.data), 2)
+
+    def test_top_voted_range_includes_end_day(self):
+        Feedback.objects.filter(pk=self.second.pk).update(upvotes_count=3)
+        today = self.second.created_at.date().isoformat()
+        res = self.client.get(f"{API_BASE}/analytics/top_voted/?from={today}&to={today}&limit=1")
+        self.assertEqual([(r["id"], r["upvotes"]) for r in res.data], [(self.second.id, 3)])
+
+
+class AnalyticsCacheTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="pass")
+        self.admin.groups.add(Group.objects.get_or_create(name="Admin")[0])
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = f"{API_BASE}/analytics/summary/?board={self.board.id}"
+
+    def test_etag_revalidation_and_write_invalidation(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("Last-Modified", first)
+        etag = first["ETag"]
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.create(board=self.board, title="A", body="B", created_by=self.admin)
+        fresh = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.data["total"], 1)
+        self.assertNotEqual(fresh["ETag"], etag)
+
+    def test_forbidden_responses_are_not_cached(self):
+        self.client.force_authenticate(User.objects.create_user("contributor", password="pass"))
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 403)
+        self.assertNotIn("ETag", res)
+
+
+class AnalyticsEngineTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="pass")
+        self.admin.groups.add(Group.objects.get_or_create(name="Admin")[0])
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.admin)
+        self.other_board = Board.objects.create(name="Other", is_public=True, created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.now = datetime.now(dt_timezone.utc)
+
+    def feedback(self, status, created_days_ago, hours_to_update=0, upvotes=0, board=None):
+        feedback = Feedback.objects.create(board=board or self.board, title="T", body="B", created_by=self.admin)
+        created = self.now - timedelta(days=created_days_ago)
+        Feedback.objects.filter(pk=feedback.pk).update(
+            status=status, created_at=created, updated_at=created + timedelta(hours=hours_to_update),
+            upvotes_count=upvotes)
+        return feedback
+
+    def test_time_to_complete_percentiles_and_histogram(self):
+        for hours in (2, 10, 30, 1000):
+            self.feedback("completed", 50, hours_to_update=hours)
+        self.feedback("open", 5, hours_to_update=3)
+
+        res = self.client.get(f"{API_BASE}/analytics/time_to_complete/?board={self.board.id}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["count"], 4)
+        self.assertEqual(res.data["percentiles_hours"]["p50"], 20.0)
+        histogram = {r["le_hours"]: r["count"] for r in res.data["histogram"]}
+        self.assertEqual((histogram[4], histogram[12], histogram[48], histogram[None]), (1, 1, 1, 1))
+        self.assertEqual(sum(histogram.values()), 4)
+
+    def test_funnel_groups_weekly_cohorts(self):
+        self.feedback("open", 1)
+        self.feedback("in_progress", 1)
+        self.feedback("completed", 1)
+        self.feedback("completed", 15)
+
+        res = self.client.get(f"{API_BASE}/analytics/funnel/")
+        self.assertEqual(res.data["total"], {"created": 4, "started": 3, "completed": 2,
+                                             "started_rate": 0.75, "completed_rate": 0.5})
+        cohorts = res.data["cohorts"]
+        self.assertEqual([(c["created"], c["started"], c["completed"]) for c in cohorts], [(1, 1, 1), (3, 2, 1)])
+        week_start = (self.now - timedelta(days=1)).date()
+        week_start -= timedelta(days=week_start.weekday())
+        self.assertEqual(cohorts[1]["cohort"], week_start.isoformat())
+
+    def test_upvote_velocity_per_board(self):
+        self.feedback("open", 10, upvotes=20)
+        self.feedback("open", 2, upvotes=2)
+        self.feedback("open", 0, upvotes=5, board=self.other_board)
+
+        res = self.client.get(f"{API_BASE}/analytics/upvote_velocity/")
+        self.assertEqual([(r["board_name"], r["feedback"], r["upvotes"]) for r in res.data],
+                         [("Other", 1, 5), ("Board", 2, 22)])
+        self.assertAlmostEqual(res.data[1]["mean_per_day"], 1.5, places=2)
+        self.assertAlmostEqual(res.data[1]["p90_per_day"], 1.9, places=2)
+
+    def test_rolling_window(self):
+        for days_ago in (0, 0, 1, 3):
+            self.feedback("open", days_ago)
+        today = self.now.date()
+        res = self.client.get(f"{API_BASE}/analytics/rolling/?window=2&from={today - timedelta(days=3)}&to={today}")
+        self.assertEqual([(r["created"], r["created_rolling"]) for r in res.data],
+                         [(1, 0.5), (0, 0.5), (1, 0.5), (2, 1.5)])
+
+    def test_group_percentiles_match_numpy(self):
+        rng = np.random.default_rng(1)
+        groups = rng.integers(0, 5, 200)
+        values = rng.random(200)
+        for pct in (0, 50, 90, 100):
+            expected = [np.percentile(values[groups == g], pct) for g in range(5)]
+            np.testing.assert_allclose(group_percentiles(groups, values, 5, pct), expected)
+
+    def test_requires_admin_or_moderator(self):
+        self.client.force_authenticate(User.objects.create_user("contributor", password="pass"))
+        for name in ("time_to_complete", "funnel", "upvote_velocity", "rolling"):
+            self.assertEqual(self.client.get(f"{API_BASE}/analytics/{name}/").status_code, 403)
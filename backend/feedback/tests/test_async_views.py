@@ -0,0 +1,92 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.contrib.auth.models import User, Group
+from rest_framework_simplejwt.tokens import AccessToken
+from feedback.models import Board, Comment, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="pass")
+        self.admin.groups.add(Group.objects.get_or_create(name="Admin")[0])
+        self.member = User.objects.create_user("member", password="pass")
+        self.public_board = Board.objects.create(name="Public", is_public=True, created_by=self.admin)
+        self.private_board = Board.objects.create(name="Private", is_public=False, created_by=self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.feedbacks = [
+                Feedback.objects.create(board=board, title=f"Dark mode {i}", body="b", created_by=self.admin)
+                for i in range(3) for board in (self.public_board, self.private_board)
+            ]
+            self.comment = Comment.objects.create(feedback=self.feedbacks[0], body="c", created_by=self.admin)
+
+    def auth(self, user):
+        # AsyncClient takes extra headers via headers=, not as HTTP_* keywords
+        return {"Authorization": f"Bearer {AccessToken.for_user(user)}"} if user else {}
+
+    async def assert_same(self, path, user=None):
+        """The async endpoint returns the same status and JSON as the DRF one."""
+        sync_response = await sync_to_async(self.client.get)(f"{API_BASE}/{path}", headers=self.auth(user))
+        async_response = await self.async_client.get(f"{API_BASE}/async/{path}", headers=self.auth(user))
+        self.assertEqual(async_response.status_code, sync_response.status_code, path)
+        sync_data, async_data = json.loads(sync_response.content), json.loads(async_response.content)
+        for data in (sync_data, async_data):
+            if isinstance(data, dict) and data.get("next"):
+                data["next"] = data["next"].replace("/async/", "/")
+        self.assertEqual(async_data, sync_data, path)
+        return async_response
+
+    async def test_feedback_and_comments_match_drf(self):
+        await self.assert_same("feedback/?page_size=2")
+        await self.assert_same("feedback/?page_size=2", user=self.admin)
+        await self.assert_same(f"feedback/?board={self.public_board.id}&status=open&search=dark")
+        await self.assert_same("feedback/?ordering=-upvotes_count&page_size=4", user=self.member)
+        await self.assert_same(f"feedback/{self.feedbacks[0].id}/")
+        await self.assert_same(f"feedback/{self.feedbacks[1].id}/")  # private board: 404
+        await self.assert_same(f"comment/?feedback={self.feedbacks[0].id}")
+
+    async def test_same_query_strings_give_the_same_payloads(self):
+        public, private = self.public_board.id, self.private_board.id
+        first, hidden = self.feedbacks[0].id, self.feedbacks[1].id
+        reply = await Comment.objects.acreate(feedback=self.feedbacks[0], parent=self.comment, body="r",
+                                              created_by=self.member)
+        paths = [
+            "feedback/", f"feedback/?board={public}", f"feedback/?board={private}", "feedback/?board=abc",
+            "feedback/?board=999999", "feedback/?status=open", "feedback/?status=bogus",
+            f"feedback/?board={public}&status=completed", "feedback/?search=dark&page_size=2",
+            "feedback/?search=dark&ordering=-created_at", "feedback/?ordering=-hot", "feedback/?ordering=title",
+            "feedback/?cursor=nonsense", f"feedback/{first}/?status=completed", "feedback/999999/",
+            "comment/", f"comment/?feedback={first}", f"comment/?feedback={hidden}", "comment/?feedback=abc",
+            "comment/?ordering=created_at", f"comment/?feedback__in={first},{hidden},999999",
+            f"comment/?feedback__in={first}&per_feedback=1", "comment/?feedback__in=x", "comment/?feedback__in=",
+            f"comment/?feedback__in={first}&per_feedback=0",
+            f"comment/thread/?feedback={first}", f"comment/thread/?feedback={first}&page_size=1", "comment/thread/",
+            f"comment/{self.comment.id}/thread/", f"comment/{reply.id}/thread/", "comment/999999/thread/",
+        ]
+        for user in (None, self.member, self.admin):
+            for path in paths:
+                await self.assert_same(path, user=user)
+
+    async def test_cursor_links_stay_on_async_paths(self):
+        res = await self.async_client.get(f"{API_BASE}/async/feedback/?page_size=2")
+        page = json.loads(res.content)
+        self.assertIn("/async/feedback/", page["next"])
+        second = json.loads((await self.async_client.get(page["next"])).content)
+        self.assertEqual(len(second["results"]), 1)
+
+    async def test_me_and_analytics_match_drf(self):
+        await self.assert_same("auth/me/", user=self.member)
+        await self.assert_same("auth/me/")
+        for path in ("analytics/summary/", "analytics/top_voted/?limit=2", "analytics/trends/?granularity=weekly",
+                     "analytics/distribution/?by=board"):
+            await self.assert_same(path, user=self.admin)
+        await self.assert_same("analytics/summary/", user=self.member)
+
+    async def test_analytics_etag_is_shared_with_drf(self):
+        res = await self.async_client.get(f"{API_BASE}/async/analytics/summary/", headers=self.auth(self.admin))
+        sync_res = await sync_to_async(self.client.get)(
+            f"{API_BASE}/analytics/summary/", headers={"If-None-Match": res["ETag"], **self.auth(self.admin)})
+        self.assertEqual(sync_res.status_code, 304)
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.test import TestCase
+from feedback.benchmarking import execute_on_commit, scratch_data
+from feedback.management.commands.bench_routes import SKIPPED, route_names
+from feedback.models import Board, BoardMembershipRequest, Comment, Feedback, FeedbackDailyStat, FeedbackStatusChange
+
+SEED = dict(users=40, boards=6, private_ratio=0.4, members=5, feedback=300, requests=30, batch_size=120, stdout=StringIO())
+
+
+class SeedBenchTests(TestCase):
+    def test_generated_rows_are_consistent(self):
+        call_command("seed_bench", **SEED)
+        self.assertEqual(Feedback.objects.count(), 300)
+        self.assertFalse(Feedback.objects.annotate(n=Count("upvotes")).exclude(upvotes_count=F("n")).exists())
+        self.assertFalse(Feedback.objects.annotate(n=Count("comments")).exclude(comments_count=F("n")).exists())
+        for feedback in Feedback.objects.exclude(last_comment=None)[:20]:
+            latest = feedback.comments.order_by("-created_at", "-id").first()
+            self.assertEqual(feedback.last_comment_id, latest.id)
+        for reply in Comment.objects.exclude(parent=None).select_related("parent")[:20]:
+            self.assertTrue(reply.path.startswith(reply.parent.path))
+            self.assertEqual(reply.depth, reply.parent.depth + 1)
+
+        # one creation row per item, completions match the current statuses
+        self.assertEqual(FeedbackStatusChange.objects.filter(from_status="").count(), 300)
+        self.assertEqual(FeedbackStatusChange.objects.filter(to_status="completed").count(),
+                         Feedback.objects.filter(status="completed").count())
+        self.assertEqual(FeedbackDailyStat.objects.aggregate(n=Sum("created_count"))["n"], 300)
+        self.assertFalse(BoardMembershipRequest.objects.filter(board__is_public=False).exists())
+
+        with self.assertRaises(CommandError):
+            call_command("seed_bench", **SEED)
+
+
+class BenchRoutesTests(TestCase):
+    def report_path(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_every_route_is_benchmarked_and_reported(self):
+        call_command("seed_bench", **SEED)
+        path, rerun = self.report_path(), self.report_path()
+        call_command("bench_routes", repeat=1, warmup=0, output=path, stdout=StringIO(), stderr=StringIO())
+        with open(path) as f:
+            report = json.load(f)
+
+        self.assertEqual({route["name"] for route in report["routes"]} | SKIPPED.keys(), route_names())
+        failed = [(route["label"], route["status"]) for route in report["routes"] if route["status"] >= 400]
+        self.assertEqual(failed, [])
+        self.assertEqual(report["sizes"]["feedback"], 300)
+        for route in report["routes"]:
+            self.assertGreaterEqual(route["p99_ms"], route["p50_ms"])
+
+        # the same routes after a change: nothing regresses with a generous threshold
+        out = StringIO()
+        call_command("bench_routes", repeat=1, warmup=0, output=rerun, compare=path, threshold=1000,
+                     routes=["feedback-list"], fail_on_regression=True, stdout=out, stderr=StringIO())
+        self.assertIn("GET feedback-list (all boards)", out.getvalue())
+        self.assertNotIn("REGRESSION", out.getvalue())
+
+
+class ExecuteOnCommitTests(TestCase):
+    def test_callbacks_run_before_the_scratch_transaction_is_rolled_back(self):
+        owner = User.objects.create_user("owner")
+        seen = []
+
+        def create_board():
+            Board.objects.create(name="from callback", created_by=owner)
+            transaction.on_commit(lambda: seen.append(Board.objects.filter(name="from callback").count()))
+
+        with self.assertLogs("feedback.benchmarking", "ERROR"), scratch_data(), execute_on_commit():
+            transaction.on_commit(create_board)
+            transaction.on_commit(lambda: 1 / 0, robust=True)
+        self.assertEqual(seen, [1])
+        self.assertFalse(Board.objects.exists())
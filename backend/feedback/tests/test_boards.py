@@ -0,0 +1,38 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from feedback.models import Board
+
+API_BASE = "/feedback-api/v1"
+
+
+class BoardListTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.users = User.objects.bulk_create([User(username=f"user{i:02d}") for i in range(30)])
+        self.boards = [Board.objects.create(name=f"B{i}", is_public=True, created_by=self.owner) for i in range(3)]
+        for board in self.boards:
+            board.members.add(*self.users)
+        self.client = APIClient()
+
+    def test_list_is_compact_and_query_count_independent_of_members(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(f"{API_BASE}/board/")
+        self.assertEqual(res.status_code, 200)
+        board = res.data["results"][0]
+        self.assertNotIn("members", board)
+        self.assertEqual(board["member_count"], 30)
+        self.assertEqual(board["created_by"], {"id": self.owner.id, "username": "owner"})
+        # board ids for the visibility filter + one page of boards
+        self.assertLessEqual(len(ctx.captured_queries), 2)
+
+    def test_members_endpoint_is_paginated(self):
+        url = f"{API_BASE}/board/{self.boards[0].id}/members/?page_size=20"
+        first = self.client.get(url).data
+        self.assertEqual(len(first["results"]), 20)
+        self.assertEqual(first["results"][0]["username"], "user00")
+        second = self.client.get(first["next"]).data
+        self.assertEqual([u["username"] for u in second["results"]], [f"user{i:02d}" for i in range(20, 30)])
+        self.assertIsNone(second["next"])
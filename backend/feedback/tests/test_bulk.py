@@ -0,0 +1,138 @@
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User, Group
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from feedback.models import Board, Feedback, FeedbackDailyStat
+from feedback.search import LOOKAHEAD, RANK_CANDIDATES, index_feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class BulkImportExportTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.member = User.objects.create_user("member", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        self.other_board = Board.objects.create(name="Other", is_public=True, created_by=self.owner)
+        self.board.members.add(self.member)
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def post_import(self, body, content_type="application/x-ndjson"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f"{API_BASE}/feedback/import/", data=body, content_type=content_type)
+
+    def test_ndjson_import_reports_bad_rows_and_checks_each_board_once(self):
+        lines = [json.dumps({"board": self.board.id, "title": f"T{i}", "body": "searchable"}) for i in range(50)]
+        lines += [
+            "not json",
+            json.dumps({"board": self.board.id, "title": "", "body": "b"}),
+            json.dumps({"board": self.other_board.id, "title": "T", "body": "b"}),
+            json.dumps({"board": self.board.id, "title": "T", "body": "b", "status": "completed"}),
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.post_import("\n".join(lines))
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual((res.data["created"], res.data["failed"]), (50, 4))
+        self.assertEqual([e["line"] for e in res.data["errors"]], [51, 52, 53, 54])
+        self.assertLess(len(ctx.captured_queries), 30)
+
+        self.assertEqual(Feedback.objects.filter(board=self.board, created_by=self.member).count(), 50)
+        self.assertEqual(FeedbackDailyStat.objects.get(board=self.board).created_count, 50)
+        found = self.client.get(f"{API_BASE}/feedback/", {"search": "searchable", "page_size": 100}).data["results"]
+        self.assertEqual(len(found), 50)
+
+    def test_csv_import(self):
+        body = f"board,title,body\n{self.board.id},From CSV,\"multi, part\"\n"
+        res = self.post_import(body, content_type="text/csv")
+        self.assertEqual(res.data["created"], 1)
+        self.assertEqual(Feedback.objects.get(title="From CSV").body, "multi, part")
+
+    def test_unsupported_content_type(self):
+        res = self.client.post(f"{API_BASE}/feedback/import/", {"board": self.board.id}, format="json")
+        self.assertEqual(res.status_code, 415)
+
+    def test_export_round_trips_through_import(self):
+        Feedback.objects.create(board=self.board, title="One", body="first", created_by=self.owner)
+        Feedback.objects.create(board=self.other_board, title="Two", body="second", created_by=self.owner)
+        res = self.client.get(f"{API_BASE}/feedback/export/", {"board": self.board.id})
+        self.assertEqual(res.status_code, 200)
+        body = b"".join(res.streaming_content).decode()
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([(r["title"], r["created_by"]) for r in rows], [("One", "owner")])
+
+        self.assertEqual(self.post_import(body).data["created"], 1)
+        self.assertEqual(Feedback.objects.filter(board=self.board, title="One").count(), 2)
+
+    def test_search_export_is_not_ranked(self):
+        # more matches than a ranked page ever reaches
+        matches = RANK_CANDIDATES + LOOKAHEAD + 50
+        index_feedback(Feedback.objects.bulk_create(
+            [Feedback(board=self.board, title="Dark", body="dark mode", created_by=self.owner) for _ in range(matches)]))
+        res = self.client.get(f"{API_BASE}/feedback/export/", {"search": "dark"})
+        ids = [json.loads(line)["id"] for line in b"".join(res.streaming_content).decode().splitlines()]
+        self.assertEqual(len(ids), matches)
+        self.assertEqual(ids, sorted(ids))
+
+    def test_csv_export(self):
+        Feedback.objects.create(board=self.board, title="One", body="a, b", created_by=self.owner)
+        res = self.client.get(f"{API_BASE}/feedback/export/", {"export_format": "csv"})
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,board_id,title,body,status,upvotes_count,created_at,created_by")
+        self.assertIn('"a, b"', lines[1])
+
+
+    async def test_asgi_export_streams_from_an_async_iterator(self):
+        await Feedback.objects.acreate(board=self.board, title="One", body="first", created_by=self.owner)
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.member)}"}
+        for export_format, first_line in (("ndjson", '{"id"'), ("csv", "id,board_id")):
+            res = await self.async_client.get(f"{API_BASE}/feedback/export/",
+                                              {"board": self.board.id, "export_format": export_format}, headers=headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertTrue(res.is_async)
+            lines = b"".join([chunk async for chunk in res.streaming_content]).decode().splitlines()
+            self.assertTrue(lines[0].startswith(first_line))
+            self.assertEqual(len(lines), 2 if export_format == "csv" else 1)
+
+
+class BulkSetStatusTests(TestCase):
+    def setUp(self):
+        self.moderator = User.objects.create_user("mod", password="pass")
+        self.moderator.groups.add(Group.objects.get_or_create(name="Moderator")[0])
+        self.member = User.objects.create_user("member", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=False, created_by=self.moderator)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.feedbacks = [Feedback.objects.create(board=self.board, title=f"F{i}", body="b", created_by=self.member)
+                              for i in range(20)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.moderator)
+        self.url = f"{API_BASE}/feedback/bulk_set_status/"
+
+    def test_single_update_with_per_id_results(self):
+        self.feedbacks[0].status = "completed"
+        self.feedbacks[0].save(update_fields=["status"])
+        ids = [f.id for f in self.feedbacks] + [999999]
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(self.url, {"ids": ids, "status": "completed"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        results = {r["id"]: r["result"] for r in res.data["results"]}
+        self.assertEqual(results[self.feedbacks[0].id], "unchanged")
+        self.assertEqual(results[self.feedbacks[1].id], "updated")
+        self.assertEqual(results[999999], "not_found")
+        self.assertEqual(len([q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]), 1)
+
+        self.assertEqual(Feedback.objects.filter(status="completed").count(), 20)
+        stats = dict(FeedbackDailyStat.objects.values_list("status", "created_count"))
+        self.assertEqual(stats, {"completed": 20})
+
+    def test_requires_moderation_role(self):
+        self.client.force_authenticate(self.member)
+        res = self.client.post(self.url, {"ids": [self.feedbacks[0].id], "status": "completed"}, format="json")
+        self.assertEqual(res.status_code, 403)
+        res = self.client.post(self.url, {"ids": [], "status": "completed"}, format="json")
+        self.assertEqual(res.status_code, 403)
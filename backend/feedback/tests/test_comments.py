@@ -0,0 +1,135 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from feedback.models import Board, Comment, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class CommentStatsTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        self.private_board = Board.objects.create(name="Private", is_public=False, created_by=self.owner)
+        self.feedback = Feedback.objects.create(board=self.board, title="T", body="B", created_by=self.owner)
+        self.client = APIClient()
+
+    def comment(self, feedback, body):
+        return Comment.objects.create(feedback=feedback, body=body, created_by=self.owner)
+
+    def test_counter_and_last_comment_follow_creates_and_deletes(self):
+        first = self.comment(self.feedback, "first")
+        second = self.comment(self.feedback, "second")
+        self.feedback.refresh_from_db()
+        self.assertEqual((self.feedback.comments_count, self.feedback.last_comment_id), (2, second.id))
+
+        second.delete()
+        self.feedback.refresh_from_db()
+        self.assertEqual((self.feedback.comments_count, self.feedback.last_comment_id), (1, first.id))
+
+        first.delete()
+        self.feedback.refresh_from_db()
+        self.assertEqual((self.feedback.comments_count, self.feedback.last_comment_id), (0, None))
+
+    def test_list_includes_preview_without_extra_queries(self):
+        self.comment(self.feedback, "x" * 500)
+        res = self.client.get(f"{API_BASE}/feedback/?board={self.board.id}")
+        item = res.data["results"][0]
+        self.assertEqual(item["comments_count"], 1)
+        self.assertEqual((len(item["last_comment"]["body"]), item["last_comment"]["created_by"]["username"]),
+                         (140, "owner"))
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(f"{API_BASE}/feedback/?board={self.board.id}")
+            return len(ctx)
+
+        before = count_queries()
+        for i in range(5):
+            self.comment(Feedback.objects.create(board=self.board, title=f"F{i}", body="B", created_by=self.owner), "c")
+        self.assertEqual(count_queries(), before)
+
+    def test_grouped_comments_for_many_feedbacks(self):
+        other = Feedback.objects.create(board=self.board, title="O", body="B", created_by=self.owner)
+        hidden = Feedback.objects.create(board=self.private_board, title="H", body="B", created_by=self.owner)
+        comments = [self.comment(self.feedback, f"c{i}") for i in range(4)]
+        self.comment(hidden, "secret")
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(f"{API_BASE}/comment/?feedback__in={self.feedback.id},{other.id},{hidden.id}&per_feedback=2")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len([q for q in ctx.captured_queries if "feedback_comment" in q["sql"]]), 1)
+        self.assertEqual([c["id"] for c in res.data[self.feedback.id]], [comments[3].id, comments[2].id])
+        self.assertEqual((res.data[other.id], res.data[hidden.id]), ([], []))
+
+    def test_grouped_comments_validate_ids(self):
+        for query in ("feedback__in=a,b", "feedback__in=", f"feedback__in={self.feedback.id}&per_feedback=0",
+                      "feedback__in=" + ",".join(str(i) for i in range(1, 102))):
+            self.assertEqual(self.client.get(f"{API_BASE}/comment/?{query}").status_code, 400, query)
+
+
+class CommentThreadTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        self.feedback = Feedback.objects.create(board=self.board, title="T", body="B", created_by=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def post(self, body, parent=None, feedback=None):
+        return self.client.post(f"{API_BASE}/comment/", {
+            "feedback": (feedback or self.feedback).id, "body": body, **({"parent": parent} if parent else {}),
+        })
+
+    def walk(self, url):
+        bodies = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            bodies.extend((c["body"], c["depth"]) for c in res.data["results"])
+            url = res.data["next"]
+        return bodies
+
+    def test_thread_is_paginated_in_display_order(self):
+        a = self.post("a").data["id"]
+        b = self.post("b").data["id"]
+        a1 = self.post("a1", parent=a).data["id"]
+        self.post("b1", parent=b)
+        self.post("a1x", parent=a1)
+        self.post("a2", parent=a)
+
+        expected = [("a", 0), ("a1", 1), ("a1x", 2), ("a2", 1), ("b", 0), ("b1", 1)]
+        self.assertEqual(self.walk(f"{API_BASE}/comment/thread/?feedback={self.feedback.id}&page_size=4"), expected)
+        self.assertEqual(self.walk(f"{API_BASE}/comment/{a}/thread/?page_size=2"), expected[:4])
+
+    def test_subtree_is_one_indexed_range_query(self):
+        root = self.post("root").data["id"]
+        self.post("reply", parent=root)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"{API_BASE}/comment/{root}/thread/")
+        thread_queries = [q["sql"] for q in ctx.captured_queries if '"path" >=' in q["sql"]]
+        self.assertEqual(len(thread_queries), 1)
+        # the range alone depends on the collation; LIKE 'path%' is what selects the subtree
+        self.assertIn("LIKE", thread_queries[0])
+        plan = connection.cursor().execute(f"EXPLAIN QUERY PLAN {thread_queries[0]}").fetchall()
+        self.assertIn("comment_feedback_path_idx", str(plan))
+
+    def test_replies_stay_on_their_feedback(self):
+        other = Feedback.objects.create(board=self.board, title="O", body="B", created_by=self.owner)
+        root = self.post("root").data["id"]
+        self.assertEqual(self.post("wrong", parent=root, feedback=other).status_code, 400)
+        reply = self.post("reply", parent=root).data["id"]
+        res = self.client.patch(f"{API_BASE}/comment/{reply}/", {"parent": None}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_deleting_a_comment_removes_its_replies(self):
+        root = self.post("root").data["id"]
+        self.post("reply", parent=self.post("child", parent=root).data["id"])
+        self.client.delete(f"{API_BASE}/comment/{root}/")
+        self.feedback.refresh_from_db()
+        self.assertEqual((Comment.objects.count(), self.feedback.comments_count), (0, 0))
+
+    def test_thread_requires_feedback(self):
+        self.assertEqual(self.client.get(f"{API_BASE}/comment/thread/").status_code, 400)
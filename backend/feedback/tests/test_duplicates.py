@@ -0,0 +1,74 @@
+from django.test import TestCase
+from django.contrib.auth.models import User, Group
+from rest_framework.test import APIClient
+from feedback.duplicates import minhash, similarity
+from feedback.models import Board, Comment, Feedback, FeedbackSimilarityBucket
+
+API_BASE = "/feedback-api/v1"
+
+EXPORT = "Export to CSV is broken: clicking the export button on the reports page downloads an empty file."
+
+
+class DuplicateDetectionTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.voter = User.objects.create_user("voter", password="pass")
+        self.moderator = User.objects.create_user("mod", password="pass")
+        self.moderator.groups.add(Group.objects.get_or_create(name="Moderator")[0])
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        self.other_board = Board.objects.create(name="Other", is_public=True, created_by=self.owner)
+        self.original = self.create("CSV export broken", EXPORT)
+        self.unrelated = self.create("Dark mode", "Please add a dark theme for the dashboard, it is too bright at night.")
+        self.client = APIClient()
+
+    def create(self, title, body, board=None):
+        return Feedback.objects.create(board=board or self.board, title=title, body=body, created_by=self.owner)
+
+    def test_signature_estimates_jaccard_similarity(self):
+        near = minhash("CSV export is broken", EXPORT.replace("empty", "blank"))
+        self.assertGreater(similarity(minhash("CSV export broken", EXPORT), near), 0.6)
+        self.assertLess(similarity(minhash("CSV export broken", EXPORT), minhash("Dark mode", "dark theme")), 0.2)
+        self.assertIsNone(minhash("", "   "))
+
+    def test_similar_endpoint_finds_near_duplicates_on_the_board(self):
+        near = self.create("CSV export is broken", EXPORT.replace("empty", "blank"))
+        self.create("CSV export broken", EXPORT, board=self.other_board)
+        res = self.client.get(f"{API_BASE}/feedback/{self.original.id}/similar/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([item["id"] for item in res.data], [near.id])
+        self.assertGreaterEqual(res.data[0]["similarity"], 0.5)
+
+    def test_create_reports_possible_duplicates(self):
+        self.client.force_authenticate(self.owner)
+        res = self.client.post(f"{API_BASE}/feedback/", {
+            "board": self.board.id, "title": "Export CSV broken", "body": EXPORT,
+        })
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual([item["id"] for item in res.data["possible_duplicates"]], [self.original.id])
+
+    def test_edits_reindex(self):
+        self.original.title, self.original.body = "Dark mode", "Please add a dark theme for the dashboard, it is too bright."
+        self.original.save()
+        res = self.client.get(f"{API_BASE}/feedback/{self.unrelated.id}/similar/")
+        self.assertEqual([item["id"] for item in res.data], [self.original.id])
+        self.assertEqual(FeedbackSimilarityBucket.objects.filter(feedback=self.original).count(), 16)
+
+    def test_merge_moves_upvotes_and_comments(self):
+        duplicate = self.create("CSV export is broken", EXPORT)
+        self.original.upvotes.add(self.voter)
+        duplicate.upvotes.add(self.voter, self.owner)
+        root = Comment.objects.create(feedback=duplicate, body="same here", created_by=self.voter)
+        Comment.objects.create(feedback=duplicate, parent=root, body="+1", created_by=self.owner)
+
+        url = f"{API_BASE}/feedback/{duplicate.id}/merge/"
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.post(url, {"into": self.original.id}).status_code, 403)
+
+        self.client.force_authenticate(self.moderator)
+        self.assertEqual(self.client.post(url, {"into": duplicate.id}).status_code, 400)
+        res = self.client.post(url, {"into": self.original.id})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.data["upvotes_count"], res.data["comments_count"]), (2, 2))
+        self.assertFalse(Feedback.objects.filter(pk=duplicate.id).exists())
+        thread = self.client.get(f"{API_BASE}/comment/thread/?feedback={self.original.id}").data["results"]
+        self.assertEqual([(c["body"], c["depth"]) for c in thread], [("same here", 0), ("+1", 1)])
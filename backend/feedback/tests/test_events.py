@@ -0,0 +1,127 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.contrib.auth.models import Group, User
+from rest_framework_simplejwt.tokens import AccessToken
+from feedback.events import EventBroker, broker
+from feedback.models import Board, BoardMembershipRequest, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+async def next_event(stream, timeout=2):
+    """(type, data) of the next event in an SSE stream, skipping comments and retry lines."""
+    while True:
+        chunk = await asyncio.wait_for(anext(stream), timeout)
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            return fields["event"], json.loads(fields["data"])
+
+
+class BoardEventStreamTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.member = User.objects.create_user("member", password="pass")
+        self.outsider = User.objects.create_user("outsider", password="pass")
+        self.public_board = Board.objects.create(name="Public", is_public=True, created_by=self.owner)
+        self.private_board = Board.objects.create(name="Private", is_public=False, created_by=self.owner)
+        self.private_board.members.add(self.member)
+
+    async def open_stream(self, user, **params):
+        if user is not None:
+            params["token"] = str(AccessToken.for_user(user))
+        response = await self.async_client.get(f"{API_BASE}/events/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return response.streaming_content
+
+    async def test_events_respect_board_privacy(self):
+        stream = await self.open_stream(self.outsider)
+        broker.publish("feedback.created", self.private_board.id, {"id": 1})
+        broker.publish("feedback.created", self.public_board.id, {"id": 2})
+        self.assertEqual(await next_event(stream), ("feedback.created", {"board": self.public_board.id, "id": 2}))
+        await stream.aclose()
+
+    async def test_writes_are_pushed_after_commit(self):
+        stream = await self.open_stream(self.member, board=self.private_board.id)
+
+        def create_feedback():
+            with self.captureOnCommitCallbacks(execute=True):
+                feedback = Feedback.objects.create(board=self.private_board, title="T", body="B", created_by=self.member)
+            with self.captureOnCommitCallbacks(execute=True):
+                feedback.status = "completed"
+                feedback.save(update_fields=["status"])
+            return feedback
+
+        feedback = await sync_to_async(create_feedback)()
+        event_type, data = await next_event(stream)
+        self.assertEqual((event_type, data["id"], data["status"]), ("feedback.created", feedback.id, "open"))
+        event_type, data = await next_event(stream)
+        self.assertEqual((event_type, data["status"], data["previous_status"]), ("feedback.status_changed", "completed", "open"))
+        await stream.aclose()
+
+    async def test_membership_requests_only_reach_the_requester_and_moderators(self):
+        outsider_stream = await self.open_stream(self.outsider)
+        owner_stream = await self.open_stream(self.owner)
+
+        def request_membership(user):
+            with self.captureOnCommitCallbacks(execute=True):
+                return BoardMembershipRequest.objects.create(board=self.public_board, user=user)
+
+        await sync_to_async(request_membership)(self.member)
+        mine = await sync_to_async(request_membership)(self.outsider)
+        self.assertEqual((await next_event(outsider_stream))[1]["id"], mine.id)
+        self.assertEqual((await next_event(owner_stream))[1]["user"], self.member.id)
+        await outsider_stream.aclose()
+        await owner_stream.aclose()
+
+    async def test_demoted_moderator_stops_receiving_moderation_events(self):
+        moderator = await User.objects.acreate(username="moderator")
+        await moderator.groups.aadd((await Group.objects.aget_or_create(name="Moderator"))[0])
+        stream = await self.open_stream(moderator)
+        broker.publish("membership_request.created", self.private_board.id, {"id": 1}, user_id=self.member.id)
+        self.assertEqual((await next_event(stream))[1]["id"], 1)
+
+        # the stream's user instance still has the Moderator role memoized
+        await (await User.objects.aget(pk=moderator.pk)).groups.aclear()
+        with mock.patch("feedback.event_views.ACCESS_RECHECK_SECONDS", 0):
+            broker.publish("membership_request.created", self.public_board.id, {"id": 2}, user_id=self.member.id)
+            broker.publish("feedback.created", self.private_board.id, {"id": 3})
+            broker.publish("feedback.created", self.public_board.id, {"id": 4})
+            self.assertEqual((await next_event(stream))[1]["id"], 4)
+        await stream.aclose()
+
+    async def test_private_board_and_bad_token_are_rejected(self):
+        response = await self.async_client.get(f"{API_BASE}/events/", {"board": self.private_board.id})
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(f"{API_BASE}/events/", {"token": "nope"})
+        self.assertEqual(response.status_code, 401)
+
+
+class EventBrokerTests(TestCase):
+    async def test_replay_after_reconnect(self):
+        local = EventBroker(replay_size=2)
+        first = local.publish("a", 1, {})
+        local.publish("b", 1, {})
+        subscription, complete = local.subscribe(last_event_id=first.id)
+        self.assertTrue(complete)
+        self.assertEqual((await subscription.queue.get()).type, "b")
+        subscription.close()
+
+        local.publish("c", 1, {})
+        local.publish("d", 1, {})  # "b" falls out of the buffer
+        _, complete = local.subscribe(last_event_id=first.id)
+        self.assertFalse(complete)
+
+    async def test_slow_subscriber_is_flagged_instead_of_blocking(self):
+        local = EventBroker(queue_size=1)
+        subscription, _ = local.subscribe()
+        local.publish("a", 1, {})
+        local.publish("b", 1, {})
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(subscription.queue.qsize(), 1)
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from feedback import invites
+from feedback.models import Board, BoardInvite
+
+API_BASE = "/feedback-api/v1"
+
+
+class InviteAcceptTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.user = User.objects.create_user("user", password="pass")
+        self.board = Board.objects.create(name="Private", is_public=False, created_by=self.owner)
+        self.invite = BoardInvite.objects.create(board=self.board, created_by=self.owner, max_uses=1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def accept(self, token=None):
+        return self.client.post(f"{API_BASE}/invites/{token or self.invite.token}/accept/")
+
+    def test_accept_joins_the_board_and_counts_one_use(self):
+        self.assertEqual(self.client.get(f"{API_BASE}/board/{self.board.id}/").status_code, 404)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.accept()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["board"]["id"], self.board.id)
+        self.invite.refresh_from_db()
+        self.assertEqual(self.invite.uses, 1)
+        # the board access cache was invalidated with the membership
+        self.assertEqual(self.client.get(f"{API_BASE}/board/{self.board.id}/").status_code, 200)
+
+    def test_members_do_not_spend_a_use(self):
+        self.invite.max_uses = 5
+        self.invite.save()
+        self.board.members.add(self.user)
+        res = self.accept()
+        self.assertEqual((res.status_code, res.data["detail"]), (400, "You are already a member of this board."))
+        self.invite.refresh_from_db()
+        self.assertEqual(self.invite.uses, 0)
+
+    def test_invalid_invites(self):
+        self.assertEqual(self.accept("missing").status_code, 404)
+        self.invite.uses = 1
+        self.invite.save()
+        self.assertEqual(self.accept().status_code, 400)
+
+        expired = BoardInvite.objects.create(board=self.board, expires_at=timezone.now() - timedelta(minutes=1))
+        revoked = BoardInvite.objects.create(board=self.board, is_active=False)
+        for invite in (expired, revoked):
+            self.assertEqual(self.accept(invite.token).status_code, 400)
+        self.assertFalse(self.board.members.filter(pk=self.user.pk).exists())
+
+
+class InviteConcurrencyTests(TransactionTestCase):
+    ACCEPTS = 2000
+    MAX_USES = 500
+    WORKERS = 32
+
+    def test_parallel_accepts_never_overshoot_max_uses(self):
+        owner = User.objects.create_user("owner", password="pass")
+        board = Board.objects.create(name="Viral", is_public=False, created_by=owner)
+        invite = BoardInvite.objects.create(board=board, created_by=owner, max_uses=self.MAX_USES)
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(self.ACCEPTS)])
+        # every user twice: the second accept of a user must not spend a use either
+        attempts = users + users[:self.ACCEPTS // 10]
+
+        def accept(user):
+            try:
+                return invites.redeem_invite(invite.token, user)[0]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            results = list(pool.map(accept, attempts))
+
+        invite.refresh_from_db()
+        self.assertEqual(results.count(invites.REDEEMED), self.MAX_USES)
+        self.assertEqual(invite.uses, self.MAX_USES)
+        self.assertEqual(board.members.count(), self.MAX_USES)
+        self.assertEqual(results.count(invites.INVALID) + results.count(invites.ALREADY_MEMBER),
+                         len(attempts) - self.MAX_USES)
@@ -0,0 +1,50 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from feedback.models import Board, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class KanbanTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        self.private_board = Board.objects.create(name="Private", is_public=False, created_by=self.owner)
+        statuses = ["open"] * 5 + ["in_progress"] * 2 + ["completed"]
+        self.feedbacks = [
+            Feedback.objects.create(board=self.board, title=f"F{i}", body="x" * 500, status=status, created_by=self.owner)
+            for i, status in enumerate(statuses)
+        ]
+        self.client = APIClient()
+        self.url = f"{API_BASE}/board/{self.board.id}/kanban/"
+
+    def test_columns_are_grouped_with_totals(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(res.status_code, 200)
+        columns = res.data["columns"]
+        self.assertEqual({k: c["total"] for k, c in columns.items()}, {"open": 5, "in_progress": 2, "completed": 1})
+        self.assertEqual([c["title"] for c in columns["open"]["results"]], ["F4", "F3"])
+        self.assertIsNone(columns["in_progress"]["next"])
+        card = columns["completed"]["results"][0]
+        self.assertEqual((card["created_by_username"], len(card["excerpt"])), ("owner", 140))
+        # board (+ visibility ids), totals, one query per column
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+
+    def test_column_cursor_walks_one_column(self):
+        next_url = self.client.get(self.url, {"limit": 2}).data["columns"]["open"]["next"]
+        titles = []
+        while next_url:
+            data = self.client.get(next_url).data
+            self.assertEqual(list(data["columns"]), ["open"])
+            titles += [c["title"] for c in data["columns"]["open"]["results"]]
+            next_url = data["columns"]["open"]["next"]
+        self.assertEqual(titles, ["F2", "F1", "F0"])
+
+    def test_invalid_params_and_private_boards(self):
+        self.assertEqual(self.client.get(self.url, {"status": "nope"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"status": "open", "cursor": "bad"}).status_code, 404)
+        self.assertEqual(self.client.get(f"{API_BASE}/board/{self.private_board.id}/kanban/").status_code, 404)
@@ -0,0 +1,61 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from feedback.metrics import registry
+from feedback.models import Board, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        Feedback.objects.create(board=self.board, title="T", body="B", created_by=self.owner)
+
+    def test_records_requests_latency_and_queries_per_url_name(self):
+        for _ in range(2):
+            self.client.get(f"{API_BASE}/feedback/?board={self.board.id}")
+        metrics = registry.get("feedback-list", "GET")
+        self.assertEqual((metrics.requests, metrics.latency.count, metrics.queries.count), (2, 2, 2))
+        self.assertGreater(metrics.queries.sum, 0)
+        self.assertGreater(metrics.query_seconds, 0)
+
+        self.client.get(f"{API_BASE}/no-such-endpoint/")
+        self.assertEqual(registry.get("<unresolved>", "GET").requests, 1)
+
+    async def test_async_views_count_their_queries(self):
+        await self.async_client.get(f"{API_BASE}/async/feedback/")
+        metrics = registry.get("async-feedback-list", "GET")
+        self.assertEqual(metrics.requests, 1)
+        self.assertGreater(metrics.queries.sum, 0)
+
+    def test_prometheus_endpoint(self):
+        self.client.get(f"{API_BASE}/board/")
+        res = self.client.get(f"{API_BASE}/metrics/")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        text = res.content.decode()
+        self.assertIn('http_requests_total{view="board-list",method="GET"} 1', text)
+        self.assertIn('http_request_duration_seconds_bucket{view="board-list",method="GET",le="+Inf"} 1', text)
+        self.assertIn('db_queries_per_request_count{view="board-list",method="GET"} 1', text)
+        self.assertIn('# TYPE db_query_duration_seconds_total counter', text)
+
+    def test_endpoint_is_internal(self):
+        self.assertEqual(self.client.get(f"{API_BASE}/metrics/", REMOTE_ADDR="10.1.2.3").status_code, 403)
+        with override_settings(METRICS_TOKEN="secret"):
+            # either an internal address or the token
+            self.assertEqual(self.client.get(f"{API_BASE}/metrics/").status_code, 200)
+            self.assertEqual(self.client.get(f"{API_BASE}/metrics/", REMOTE_ADDR="10.1.2.3").status_code, 403)
+            res = self.client.get(f"{API_BASE}/metrics/", REMOTE_ADDR="10.1.2.3", HTTP_AUTHORIZATION="Bearer wrong")
+            self.assertEqual(res.status_code, 403)
+            res = self.client.get(f"{API_BASE}/metrics/", REMOTE_ADDR="10.1.2.3", HTTP_AUTHORIZATION="Bearer secret")
+            self.assertEqual(res.status_code, 200)
+
+    def test_requests_over_budget_are_logged(self):
+        with override_settings(METRICS_QUERY_BUDGET=0), self.assertLogs("feedback.metrics", "WARNING") as logs:
+            self.client.get(f"{API_BASE}/feedback/")
+        self.assertIn("GET /feedback-api/v1/feedback/ (feedback-list) 200", logs.output[0])
+        with override_settings(METRICS_QUERY_BUDGET=1000, METRICS_TIME_BUDGET_MS=60_000), \
+                self.assertNoLogs("feedback.metrics", "WARNING"):
+            self.client.get(f"{API_BASE}/feedback/")
@@ -0,0 +1,85 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User, Group
+from rest_framework.test import APIClient
+from feedback.models import Board, BoardMembershipRequest
+
+API_BASE = "/feedback-api/v1"
+URL = f"{API_BASE}/board-membership-requests"
+
+
+class BulkModerationTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.moderator = User.objects.create_user("mod", password="pass")
+        self.moderator.groups.add(Group.objects.get_or_create(name="Moderator")[0])
+        self.board = Board.objects.create(name="Private", is_public=False, created_by=self.owner)
+        self.other_board = Board.objects.create(name="Other", is_public=False, created_by=self.moderator)
+        self.client = APIClient()
+        self.client.force_authenticate(self.moderator)
+
+    def request_membership(self, username, board=None):
+        user = User.objects.create_user(username, password="pass")
+        return BoardMembershipRequest.objects.create(board=board or self.board, user=user)
+
+    def results(self, res):
+        return [(r["id"], r["result"]) for r in res.data["results"]]
+
+    def test_bulk_approve_reports_per_id_outcomes(self):
+        first, second = self.request_membership("a"), self.request_membership("b")
+        handled = self.request_membership("c")
+        handled.status = BoardMembershipRequest.STATUS_REJECTED
+        handled.save()
+        self.board.members.add(second.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(f"{URL}/bulk_approve/", {"ids": [second.id, first.id, handled.id, 999]}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.results(res), [(second.id, "approved"), (first.id, "approved"),
+                                             (handled.id, "not_pending"), (999, "not_found")])
+        self.assertEqual(set(self.board.members.values_list("username", flat=True)), {"a", "b"})
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.handled_by), ("approved", self.moderator))
+
+    def test_all_pending_for_a_board_in_constant_queries(self):
+        def approve_all():
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(f"{URL}/bulk_approve/", {"board": self.board.id}, format="json")
+            self.assertEqual(res.status_code, 200)
+            return len(ctx), res
+
+        approve_all()  # warm the role cache
+        self.request_membership("a")
+        small, _ = approve_all()
+        for i in range(20):
+            self.request_membership(f"u{i}")
+        outside = self.request_membership("x", board=self.other_board)
+        large, res = approve_all()
+        self.assertEqual(large, small)
+        self.assertEqual(len(res.data["results"]), 20)
+        self.assertEqual(self.board.members.count(), 21)
+        outside.refresh_from_db()
+        self.assertEqual(outside.status, "pending")
+
+    def test_bulk_reject_and_permissions(self):
+        mine = self.request_membership("a")
+        other = self.request_membership("b", board=self.other_board)
+        self.client.force_authenticate(self.owner)
+        res = self.client.post(f"{URL}/bulk_reject/", {"ids": [mine.id, other.id]}, format="json")
+        self.assertEqual(self.results(res), [(mine.id, "rejected"), (other.id, "forbidden")])
+        self.assertFalse(self.board.members.exists())
+
+        # a user can only have one rejected request per board
+        again = BoardMembershipRequest.objects.create(board=self.board, user=mine.user)
+        res = self.client.post(f"{URL}/bulk_reject/", {"ids": [again.id]}, format="json")
+        self.assertEqual(self.results(res), [(again.id, "conflict")])
+
+    def test_requires_ids_or_board(self):
+        for body in ({}, {"ids": [1], "board": self.board.id}, {"ids": []}):
+            self.assertEqual(self.client.post(f"{URL}/bulk_approve/", body, format="json").status_code, 400, body)
+
+    def test_queue_is_oldest_first(self):
+        requests = [self.request_membership(name) for name in ("a", "b", "c")]
+        res = self.client.get(f"{URL}/?status=pending&board={self.board.id}")
+        self.assertEqual([r["id"] for r in res.data], [r.id for r in requests])
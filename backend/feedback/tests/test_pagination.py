@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from feedback.models import Board, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        Feedback.objects.bulk_create([
+            Feedback(board=self.board, title=f"F{i}", body="B", created_by=self.owner, upvotes_count=i % 3)
+            for i in range(12)
+        ])
+        self.client = APIClient()
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            ids.extend(item["id"] for item in res.data["results"])
+            url, pages = res.data["next"], pages + 1
+        return ids, pages
+
+    def test_pages_cover_every_row_once_with_ties(self):
+        ids, pages = self.walk(f"{API_BASE}/feedback/?board={self.board.id}&ordering=-upvotes_count&page_size=5")
+        expected = list(Feedback.objects.order_by("-upvotes_count", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_previous_link_returns_same_page(self):
+        first = self.client.get(f"{API_BASE}/feedback/?page_size=5").data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+        self.assertEqual([i["id"] for i in back["results"]], [i["id"] for i in first["results"]])
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"{API_BASE}/feedback/?page_size=5")
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries))
+
+    def test_invalid_cursor_is_404(self):
+        res = self.client.get(f"{API_BASE}/feedback/?cursor=not-a-cursor")
+        self.assertEqual(res.status_code, 404)
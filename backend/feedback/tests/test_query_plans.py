@@ -0,0 +1,27 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from feedback.query_plans import full_scans
+
+
+class QueryPlanTests(TestCase):
+    def test_endpoint_queries_use_indexes(self):
+        # raises CommandError on any full table scan
+        call_command("check_query_plans", stdout=StringIO())
+
+    def test_full_scan_detection(self):
+        plan = "\n".join([
+            "3 0 0 SCAN feedback_boardmembershiprequest",
+            "5 0 0 SCAN feedback_feedback USING INDEX feedback_created_idx",
+            "6 0 0 SEARCH feedback_feedback USING INDEX feedback_status_created_idx (status=?)",
+            "7 0 0 SCAN feedback_search VIRTUAL TABLE INDEX 0:M2",
+            "8 0 0 SCAN feedback_search VIRTUAL TABLE INDEX 0:",
+            "9 0 0 SEARCH auth_user USING INTEGER PRIMARY KEY (rowid=?)",
+            "11 0 0 CO-ROUTINE qualify",
+            "13 11 0 SEARCH feedback_comment USING INDEX comment_feedback_created_idx (feedback_id=?)",
+            "15 0 0 SCAN qualify",
+        ])
+        # a walk over a whole index is a full scan too, an FTS5 MATCH is not
+        self.assertEqual(full_scans(plan), ["feedback_boardmembershiprequest", "feedback_feedback", "feedback_search"])
@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+from feedback.models import Board, Comment, Feedback
+from feedback.ranking import HOT_HALF_LIFE, hot_score
+
+API_BASE = "/feedback-api/v1"
+
+
+class HotRankingTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.voter = User.objects.create_user("voter", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        self.board.members.add(self.voter)
+        self.client = APIClient()
+
+    def create(self, title, age=timedelta(0)):
+        feedback = Feedback.objects.create(board=self.board, title=title, body="B", created_by=self.owner)
+        if age:
+            Feedback.objects.filter(pk=feedback.pk).update(created_at=feedback.created_at - age)
+            call_command("refresh_hot_scores", stdout=StringIO())
+        return feedback
+
+    def hot_ids(self):
+        res = self.client.get(f"{API_BASE}/feedback/?board={self.board.id}&ordering=-hot")
+        self.assertEqual(res.status_code, 200)
+        return [item["id"] for item in res.data["results"]]
+
+    def test_score_decays_by_one_point_per_half_life(self):
+        now = timezone.now()
+        self.assertAlmostEqual(hot_score(1, 0, now) - hot_score(0, 0, now), 1)
+        self.assertAlmostEqual(hot_score(3, 0, now - HOT_HALF_LIFE), hot_score(1, 0, now))
+        self.assertAlmostEqual(hot_score(0, 1, now), hot_score(2, 0, now))
+
+    def test_upvotes_and_comments_update_the_stored_score(self):
+        feedback = self.create("F")
+        self.assertAlmostEqual(feedback.hot_score, hot_score(0, 0, feedback.created_at), places=3)
+
+        self.client.force_authenticate(self.voter)
+        self.client.post(f"{API_BASE}/feedback/{feedback.id}/upvote/")
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.hot_score, hot_score(1, 0, feedback.created_at))
+
+        comment = Comment.objects.create(feedback=feedback, body="c", created_by=self.voter)
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.hot_score, hot_score(1, 1, feedback.created_at))
+
+        comment.delete()
+        feedback.upvotes.clear()
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.hot_score, hot_score(0, 0, feedback.created_at))
+
+    def test_hot_ordering_weighs_activity_against_age(self):
+        old_popular = self.create("old popular", age=HOT_HALF_LIFE * 3)
+        old_popular.upvotes.add(self.owner, self.voter)  # 3x activity, 3 half-lives old: below new
+        new = self.create("new")
+        recent_discussed = self.create("recent discussed", age=HOT_HALF_LIFE / 2)
+        Comment.objects.create(feedback=recent_discussed, body="c", created_by=self.voter)
+        self.assertEqual(self.hot_ids(), [recent_discussed.id, new.id, old_popular.id])
+
+    def test_hot_ordering_pages_with_keyset_cursor(self):
+        feedbacks = [self.create(f"F{i}") for i in range(5)]
+        res = self.client.get(f"{API_BASE}/feedback/?ordering=-hot&page_size=2")
+        ids = [item["id"] for item in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            ids.extend(item["id"] for item in res.data["results"])
+        self.assertEqual(ids, [f.id for f in reversed(feedbacks)])
+
+    def test_refresh_command_repairs_scores(self):
+        feedback = self.create("F")
+        Feedback.objects.filter(pk=feedback.pk).update(upvotes_count=4, hot_score=0)
+        call_command("refresh_hot_scores", stdout=StringIO())
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.hot_score, hot_score(4, 0, feedback.created_at))
@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User, Group
+from rest_framework.test import APIClient
+from feedback.models import Board, Feedback, Comment
+from feedback.permissions import is_admin, is_moderator, is_admin_or_moderator
+
+API_BASE = "/feedback-api/v1"
+
+
+def role_queries(ctx):
+    # permissions.get_role_names selects only the group name
+    return [q for q in ctx.captured_queries if q["sql"].startswith('SELECT "auth_group"."name" AS "name" FROM')]
+
+
+class RoleCacheTests(TestCase):
+    def setUp(self):
+        self.mod_group, _ = Group.objects.get_or_create(name="Moderator")
+        self.moderator = User.objects.create_user("moderator", password="pass")
+        self.moderator.groups.add(self.mod_group)
+        self.member = User.objects.create_user("member", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.moderator)
+        self.board.members.add(self.member)
+        self.feedback = Feedback.objects.create(board=self.board, title="T", body="B", created_by=self.member)
+        self.comment = Comment.objects.create(feedback=self.feedback, body="C", created_by=self.member)
+        self.client = APIClient()
+
+    def request_role_queries(self, user, method, url, data=None):
+        # fresh instance per request, like the authentication backends hand out
+        self.client.force_authenticate(User.objects.get(pk=user.pk))
+        with CaptureQueriesContext(connection) as ctx:
+            res = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(res.status_code, 400, res.data)
+        return len(role_queries(ctx))
+
+    def test_role_lookups_are_memoized_per_user_instance(self):
+        user = User.objects.get(pk=self.moderator.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(is_admin_or_moderator(user))
+            self.assertTrue(is_moderator(user))
+            self.assertFalse(is_admin(user))
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_group_change_invalidates_memoized_roles(self):
+        self.assertFalse(is_moderator(self.member))
+        self.member.groups.add(self.mod_group)
+        self.assertTrue(is_moderator(self.member))
+        self.member.groups.remove(self.mod_group)
+        self.assertFalse(is_moderator(self.member))
+
+    def test_each_endpoint_makes_one_role_query(self):
+        fb, cm = self.feedback.id, self.comment.id
+        calls = [
+            (self.member, "get", f"{API_BASE}/board/", None),
+            (self.member, "get", f"{API_BASE}/feedback/?board={self.board.id}", None),
+            (self.member, "get", f"{API_BASE}/feedback/{fb}/", None),
+            (self.member, "post", f"{API_BASE}/feedback/", {"board": self.board.id, "title": "N", "body": "B"}),
+            (self.member, "patch", f"{API_BASE}/feedback/{fb}/", {"title": "Edited"}),
+            (self.member, "post", f"{API_BASE}/feedback/{fb}/upvote/", None),
+            (self.moderator, "post", f"{API_BASE}/feedback/{fb}/set_status/", {"status": "completed"}),
+            (self.member, "get", f"{API_BASE}/comment/?feedback={fb}", None),
+            (self.member, "post", f"{API_BASE}/comment/", {"feedback": fb, "body": "Hi"}),
+            (self.member, "patch", f"{API_BASE}/comment/{cm}/", {"body": "Edited"}),
+            (self.moderator, "get", f"{API_BASE}/board-membership-requests/", None),
+            (self.moderator, "get", f"{API_BASE}/analytics/summary/", None),
+        ]
+        for user, method, url, data in calls:
+            with self.subTest(method=method, url=url):
+                self.assertEqual(self.request_role_queries(user, method, url, data), 1)
+
+    def test_anonymous_requests_make_no_role_queries(self):
+        self.client.force_authenticate(None)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"{API_BASE}/feedback/")
+        self.assertEqual(role_queries(ctx), [])
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from feedback.models import Board, Feedback
+from feedback.search import RANK_CANDIDATES, index_feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.board = Board.objects.create(name="Public", is_public=True, created_by=self.owner)
+        self.private_board = Board.objects.create(name="Private", is_public=False, created_by=self.owner)
+        self.strong = Feedback.objects.create(board=self.board, title="Dark mode", body="Please add a dark mode, dark mode everywhere", created_by=self.owner)
+        self.weak = Feedback.objects.create(board=self.board, title="Settings page", body="Maybe a dark theme toggle in mode settings", created_by=self.owner)
+        Feedback.objects.create(board=self.board, title="Export", body="CSV export", created_by=self.owner)
+        Feedback.objects.create(board=self.private_board, title="Dark mode", body="private dark mode", created_by=self.owner)
+        self.client = APIClient()
+
+    def search(self, terms, **params):
+        res = self.client.get(f"{API_BASE}/feedback/", {"search": terms, **params})
+        self.assertEqual(res.status_code, 200)
+        return [item["id"] for item in res.data["results"]]
+
+    def walk(self, url, link="next"):
+        ids = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            page = [item["id"] for item in res.data["results"]]
+            ids = ids + page if link == "next" else page + ids
+            url = res.data[link]
+        return ids
+
+    def test_results_are_ranked_and_respect_visibility(self):
+        self.assertEqual(self.search("dark mode"), [self.strong.id, self.weak.id])
+
+    def test_search_combines_with_filters(self):
+        Feedback.objects.filter(pk=self.weak.pk).update(status="completed")
+        self.assertEqual(self.search("dark", status="completed"), [self.weak.id])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.strong.title = "Light theme"
+        self.strong.body = "Bright colours"
+        self.strong.save()
+        self.assertEqual(self.search("bright"), [self.strong.id])
+        self.strong.delete()
+        self.assertEqual(self.search("bright"), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('"dark" OR NEAR('), [])
+        self.assertEqual(self.search("***"), [])
+
+    def test_explicit_ordering_is_not_ranked(self):
+        self.assertEqual(self.search("dark", ordering="created_at"), [self.strong.id, self.weak.id])
+        self.assertEqual(self.search("dark", ordering="-created_at"), [self.weak.id, self.strong.id])
+
+    def test_ranking_scores_the_newest_matches_of_the_filtered_queryset(self):
+        newest = Feedback.objects.create(board=self.board, title="Dark", body="dark", created_by=self.owner)
+        other_board = Board.objects.create(name="Other", is_public=True, created_by=self.owner)
+        for _ in range(3):
+            Feedback.objects.create(board=other_board, title="Dark mode", body="dark mode", created_by=self.owner)
+        with mock.patch("feedback.search.RANK_CANDIDATES", 2):
+            # the newer matches on the other board do not take the candidate slots; the older
+            # match on the board comes after the ranked ones
+            self.assertEqual(self.search("dark", board=self.board.id), [newest.id, self.weak.id, self.strong.id])
+            self.assertEqual(len(self.search("dark", board=self.board.id, ordering="-created_at")), 3)
+
+    def test_matches_after_the_ranked_candidates_follow_newest_first(self):
+        older = [Feedback.objects.create(board=self.board, title="Dark", body="dark", created_by=self.owner)
+                 for _ in range(3)]
+        with mock.patch("feedback.search.RANK_CANDIDATES", 2):
+            ids = self.walk(f"{API_BASE}/feedback/?search=dark&page_size=2")
+            # and back from the last page, across the older matches into the ranked ones
+            url = f"{API_BASE}/feedback/?search=dark&page_size=2"
+            while url:
+                last = self.client.get(url)
+                url = last.data["next"]
+            back = self.walk(last.data["previous"], link="previous") + [item["id"] for item in last.data["results"]]
+            self.assertEqual(back, ids)
+        # the two newest ranked, then every older match once
+        self.assertEqual(sorted(ids[:2]), sorted([older[1].id, older[2].id]))
+        self.assertEqual(ids[2:], [older[0].id, self.weak.id, self.strong.id])
+
+    def test_every_match_is_reachable_past_the_ranked_candidates(self):
+        index_feedback(Feedback.objects.bulk_create(
+            [Feedback(board=self.board, title="Dark", body="dark", created_by=self.owner) for _ in range(RANK_CANDIDATES + 50)]))
+        ids = self.walk(f"{API_BASE}/feedback/?search=dark&page_size=100")
+        self.assertEqual(len(ids), RANK_CANDIDATES + 52)
+        self.assertEqual(len(set(ids)), len(ids))
@@ -0,0 +1,88 @@
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.contrib.auth.models import User
+from feedback.models import Board
+from feedback.sqlite import write_transaction
+
+
+class ProfileTests(TestCase):
+    def test_pragmas_and_transaction_mode_on_new_connections(self):
+        if not settings.SQLITE_PRAGMAS:
+            self.skipTest("SQLITE_PROFILE=stock")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+
+class WriteTransactionTests(TransactionTestCase):
+    def test_retries_locked_errors_only(self):
+        calls = []
+
+        @write_transaction
+        def flaky():
+            calls.append(connection.in_atomic_block)
+            if len(calls) < 3:
+                raise OperationalError("database is locked")
+            return "done"
+
+        self.assertEqual(flaky(), "done")
+        self.assertEqual(calls, [True, True, True])
+
+        @write_transaction
+        def broken():
+            calls.append(1)
+            raise OperationalError("no such table: x")
+
+        calls.clear()
+        with self.assertRaises(OperationalError):
+            broken()
+        self.assertEqual(len(calls), 1)
+
+        # inside an outer transaction there is nothing to retry from
+        calls.clear()
+        with self.assertRaises(OperationalError), transaction.atomic():
+            flaky()
+        self.assertEqual(len(calls), 1)
+
+    def test_waits_out_a_writer_that_holds_the_lock(self):
+        owner = User.objects.create_user("owner", password="pass")
+        locked = threading.Event()
+
+        def hold_write_lock():
+            try:
+                with transaction.atomic():
+                    Board.objects.create(name="held", created_by=owner)
+                    locked.set()
+                    time.sleep(0.3)
+            finally:
+                connection.close()
+
+        def create_board():
+            return Board.objects.create(name="mine", created_by=owner)
+
+        # a busy timeout far below the time the other writer keeps the lock
+        with override_settings(SQLITE_PRAGMAS={**settings.SQLITE_PRAGMAS, 'busy_timeout': 20}):
+            connection.close()
+            for attempts, expect_success in ((1, False), (10, True)):
+                locked.clear()
+                holder = threading.Thread(target=hold_write_lock)
+                holder.start()
+                locked.wait(5)
+                with override_settings(SQLITE_WRITE_ATTEMPTS=attempts), \
+                        mock.patch("feedback.sqlite.time.sleep", wraps=time.sleep) as sleep:
+                    if expect_success:
+                        self.assertEqual(write_transaction(create_board)().name, "mine")
+                        self.assertTrue(sleep.called)
+                    else:
+                        with self.assertRaisesMessage(OperationalError, "locked"):
+                            write_transaction(create_board)()
+                holder.join()
+        self.assertEqual(Board.objects.filter(name="held").count(), 2)
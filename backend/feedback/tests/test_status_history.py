@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth.models import User, Group
+from django.utils import timezone
+from rest_framework.test import APIClient
+from feedback.models import Board, Feedback, FeedbackStatusChange
+from feedback.status_history import completions_query, cycle_time_data
+
+API_BASE = "/feedback-api/v1"
+
+
+class StatusHistoryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="pass")
+        self.admin.groups.add(Group.objects.get_or_create(name="Admin")[0])
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.admin)
+        self.other_board = Board.objects.create(name="Other", is_public=True, created_by=self.admin)
+        self.feedback = Feedback.objects.create(board=self.board, title="T", body="B", created_by=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def history(self, feedback):
+        return list(feedback.status_changes.order_by("changed_at", "id").values_list("from_status", "to_status"))
+
+    def set_status(self, feedback, status):
+        return self.client.post(f"{API_BASE}/feedback/{feedback.id}/set_status/", {"status": status}, format="json")
+
+    def test_set_status_appends_to_the_log(self):
+        self.set_status(self.feedback, "in_progress")
+        self.set_status(self.feedback, "in_progress")
+        self.set_status(self.feedback, "completed")
+        self.assertEqual(self.history(self.feedback), [("", "open"), ("open", "in_progress"), ("in_progress", "completed")])
+        self.assertEqual(self.feedback.status_changes.last().changed_by, self.admin)
+
+    def test_title_edits_are_not_logged(self):
+        self.client.patch(f"{API_BASE}/feedback/{self.feedback.id}/", {"title": "New"}, format="json")
+        self.assertEqual(self.history(self.feedback), [("", "open")])
+
+    def test_bulk_status_change_logs_changed_rows_only(self):
+        done = Feedback.objects.create(board=self.board, title="D", body="B", created_by=self.admin)
+        self.set_status(done, "completed")
+        res = self.client.post(f"{API_BASE}/feedback/bulk_set_status/",
+                               {"ids": [self.feedback.id, done.id], "status": "completed"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.history(self.feedback), [("", "open"), ("open", "completed")])
+        self.assertEqual(self.history(done), [("", "open"), ("open", "completed")])
+
+    def test_cycle_time_reads_the_log(self):
+        now = timezone.now()
+        fast = Feedback.objects.create(board=self.other_board, title="F", body="B", created_by=self.admin)
+        log = FeedbackStatusChange.objects
+        log.filter(feedback=self.feedback).update(changed_at=now - timedelta(hours=30))
+        log.filter(feedback=fast).update(changed_at=now - timedelta(hours=5))
+        log.create(feedback=self.feedback, board=self.board, from_status="open", to_status="in_progress",
+                   changed_at=now - timedelta(hours=10))
+        log.create(feedback=self.feedback, board=self.board, from_status="in_progress", to_status="completed", changed_at=now)
+        log.create(feedback=fast, board=self.other_board, from_status="open", to_status="completed", changed_at=now)
+
+        res = self.client.get(f"{API_BASE}/analytics/cycle_time/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["completed"], 2)
+        boards = {b["board_name"]: b for b in res.data["boards"]}
+        self.assertAlmostEqual(boards["Board"]["lead_time_p50_hours"], 30, places=1)
+        self.assertAlmostEqual(boards["Board"]["cycle_time_p50_hours"], 10, places=1)
+        # never in progress: cycle time is the lead time
+        self.assertAlmostEqual(boards["Other"]["cycle_time_p50_hours"], 5, places=1)
+
+        res = self.client.get(f"{API_BASE}/analytics/cycle_time/?board={self.other_board.id}")
+        self.assertEqual([b["board_name"] for b in res.data["boards"]], ["Other"])
+
+    def test_reopened_item_is_timed_from_its_last_start(self):
+        now = timezone.now()
+        log = FeedbackStatusChange.objects
+        log.filter(feedback=self.feedback).update(changed_at=now - timedelta(hours=100))
+        for hours_ago, from_status, to_status in ((90, "open", "in_progress"), (80, "in_progress", "completed"),
+                                                  (20, "completed", "open"), (6, "open", "in_progress"),
+                                                  (0, "in_progress", "completed")):
+            log.create(feedback=self.feedback, board=self.board, from_status=from_status, to_status=to_status,
+                       changed_at=now - timedelta(hours=hours_ago))
+
+        rows = completions_query(now - timedelta(days=30), now + timedelta(hours=1)).order_by("changed_at")
+        # one completion per cycle: 10 hours for the first, 6 for the second
+        self.assertEqual([round((completed - started) / timedelta(hours=1)) for _, completed, _, started in rows], [10, 6])
+        self.assertAlmostEqual(cycle_time_data(rows)["cycle_time_hours"]["p50"], 8, places=1)
+
+    def test_weekly_throughput_per_board(self):
+        for _ in range(2):
+            self.set_status(Feedback.objects.create(board=self.board, title="T", body="B", created_by=self.admin), "completed")
+        self.set_status(self.feedback, "in_progress")
+
+        res = self.client.get(f"{API_BASE}/analytics/throughput/")
+        self.assertEqual([(b["board_name"], b["total"]) for b in res.data], [("Board", 2)])
+        week = res.data[0]["weeks"][0]["week"]
+        self.assertEqual(timezone.datetime.fromisoformat(week).weekday(), 0)
+
+        res = self.client.get(f"{API_BASE}/analytics/throughput/?status=in_progress")
+        self.assertEqual(res.data[0]["total"], 1)
+        self.assertEqual(self.client.get(f"{API_BASE}/analytics/throughput/?status=done").status_code, 400)
@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from feedback.models import Board, Feedback
+
+API_BASE = "/feedback-api/v1"
+
+
+class UpvoteCounterTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pass")
+        self.voter = User.objects.create_user("voter", password="pass")
+        self.board = Board.objects.create(name="Board", is_public=True, created_by=self.owner)
+        self.board.members.add(self.owner, self.voter)
+        self.feedback = Feedback.objects.create(board=self.board, title="T", body="B", created_by=self.owner)
+        self.client = APIClient()
+
+    def test_upvote_toggle_updates_stored_counter(self):
+        self.client.force_authenticate(self.voter)
+        url = f"{API_BASE}/feedback/{self.feedback.id}/upvote/"
+
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.data["upvoted"], res.data["upvotes_count"]), (True, 1))
+        self.feedback.refresh_from_db()
+        self.assertEqual(self.feedback.upvotes_count, 1)
+        self.assertTrue(self.feedback.upvotes.filter(id=self.voter.id).exists())
+
+        res = self.client.post(url)
+        self.assertEqual((res.data["upvoted"], res.data["upvotes_count"]), (False, 0))
+        self.feedback.refresh_from_db()
+        self.assertEqual(self.feedback.upvotes_count, 0)
+
+    def test_toggle_returns_the_stored_counter_not_the_loaded_one(self):
+        loaded = Feedback.objects.get(pk=self.feedback.pk)
+        # another request upvotes after this one loaded the feedback
+        Feedback.objects.get(pk=self.feedback.pk).toggle_upvote(self.owner)
+        self.assertEqual(loaded.toggle_upvote(self.voter), (True, 2))
+        self.assertEqual(loaded.upvotes_count, 2)
+
+    def test_m2m_changes_keep_counter_in_sync(self):
+        self.feedback.upvotes.add(self.owner, self.voter)
+        self.feedback.refresh_from_db()
+        self.assertEqual(self.feedback.upvotes_count, 2)
+
+        self.voter.upvoted_feedbacks.remove(self.feedback)
+        self.feedback.refresh_from_db()
+        self.assertEqual(self.feedback.upvotes_count, 1)
+
+        self.owner.upvoted_feedbacks.clear()
+        self.feedback.refresh_from_db()
+        self.assertEqual(self.feedback.upvotes_count, 0)
+
+    def test_list_orders_by_stored_counter(self):
+        popular = Feedback.objects.create(board=self.board, title="P", body="B", created_by=self.owner)
+        popular.upvotes.add(self.owner, self.voter)
+        res = self.client.get(f"{API_BASE}/feedback/?board={self.board.id}&ordering=-upvotes_count")
+        self.assertEqual(res.status_code, 200)
+        items = res.data.get("results", res.data) if isinstance(res.data, dict) else res.data
+        self.assertEqual(items[0]["id"], popular.id)
+        self.assertEqual(items[0]["upvotes_count"], 2)
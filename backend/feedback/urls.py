@@ -1,7 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import BoardViewSet, FeedbackViewSet, CommentViewSet, InviteAcceptView, InviteRevokeView,RegisterView,BoardMembershipRequestViewSet
-from .analytics_views import analytics_summary,analytics_top_voted,analytics_distribution,analytics_trends
+from .event_views import board_events
+from .metrics_views import metrics
+from . import async_views
+from .analytics_views import (analytics_summary,analytics_top_voted,analytics_distribution,analytics_trends,
+    analytics_time_to_complete,analytics_funnel,analytics_upvote_velocity,analytics_rolling,
+    analytics_cycle_time,analytics_throughput)
 
 router = DefaultRouter()
 router.register(r'board', BoardViewSet, basename='board')
@@ -14,8 +19,32 @@ urlpatterns = [
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('invites/<str:token>/accept/',InviteAcceptView.as_view(),name='accept-invite'),
     path('invites/<str:token>/revoke/',InviteRevokeView.as_view(),name='revoke-invite'),
+    path('events/', board_events, name='board-events'),
+    path('metrics/', metrics, name='metrics'),
     path('analytics/summary/', analytics_summary, name='analytics-summary'),
     path('analytics/top_voted/', analytics_top_voted, name='analytics-top'),
     path('analytics/trends/', analytics_trends, name='analytics-trends'),
     path('analytics/distribution/', analytics_distribution, name='analytics-distribution'),
-]
\ No newline at end of file
+    path('analytics/time_to_complete/', analytics_time_to_complete, name='analytics-time-to-complete'),
+    path('analytics/funnel/', analytics_funnel, name='analytics-funnel'),
+    path('analytics/upvote_velocity/', analytics_upvote_velocity, name='analytics-upvote-velocity'),
+    path('analytics/rolling/', analytics_rolling, name='analytics-rolling'),
+    path('analytics/cycle_time/', analytics_cycle_time, name='analytics-cycle-time'),
+    path('analytics/throughput/', analytics_throughput, name='analytics-throughput'),
+]
+
+#async read paths (async_views.py), same payloads as the DRF endpoints above
+async_urlpatterns = [
+    path('feedback/', async_views.feedback_list, name='async-feedback-list'),
+    path('feedback/<int:pk>/', async_views.feedback_detail, name='async-feedback-detail'),
+    path('comment/', async_views.comment_list, name='async-comment-list'),
+    path('comment/thread/', async_views.comment_thread, name='async-comment-thread'),
+    path('comment/<int:pk>/thread/', async_views.comment_subtree, name='async-comment-subtree'),
+    path('auth/me/', async_views.me_view, name='async-auth-me'),
+    path('analytics/summary/', async_views.analytics_summary, name='async-analytics-summary'),
+    path('analytics/top_voted/', async_views.analytics_top_voted, name='async-analytics-top'),
+    path('analytics/trends/', async_views.analytics_trends, name='async-analytics-trends'),
+    path('analytics/distribution/', async_views.analytics_distribution, name='async-analytics-distribution'),
+]
+
+urlpatterns += [path('async/', include(async_urlpatterns))]
@@ -1,43 +1,59 @@
 from django.shortcuts import get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Q,Count
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.contrib.auth.models import User,Group
-from rest_framework import viewsets, permissions,generics,status, filters as drf_filters
+from rest_framework import viewsets, permissions,generics,status
 from rest_framework.decorators import action,api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, UnsupportedMediaType, ValidationError
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Board, Feedback, Comment, BoardMembershipRequest, BoardInvite
-from .serializers import UserSerializer,BoardSerializer, FeedbackSerializer, CommentSerializer, FeedbackStatusSerializer, RegisterSerializer, BoardMembershipRequestSerializer, BoardInviteSerializer
+from .serializers import UserSerializer,BoardSerializer,BoardListSerializer, FeedbackSerializer, CommentSerializer, FeedbackStatusSerializer, FeedbackBulkStatusSerializer, FeedbackMergeSerializer, RegisterSerializer, BoardMembershipRequestSerializer, MembershipRequestBulkSerializer, BoardInviteSerializer
 from .permissions import (IsAdmin, IsAdminOrModerator, IsAuthorOrAdminOrModerator, is_admin_or_moderator,)
+from .access import filter_accessible
+from .filters import FullTextSearchFilter, FeedbackOrderingFilter
+from .pagination import MemberPagination, ThreadPagination
+from .ranking import update_hot_scores
+from .rollups import schedule_feedback_refresh
+from .sqlite import write_transaction
+from . import bulk, duplicates, events, invites, kanban, moderation
 
 
 class BoardViewSet(viewsets.ModelViewSet):
 
-    queryset = Board.objects.select_related('created_by').prefetch_related('members')
+    queryset = Board.objects.select_related('created_by')
     serializer_class = BoardSerializer
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
 
     def get_serializer_class(self):
-        if getattr(self, 'action', None) == 'invites':
+        action_name = getattr(self, 'action', None)
+        if action_name == 'invites':
             return BoardInviteSerializer
+        if action_name == 'list':
+            return BoardListSerializer
+        if action_name == 'members':
+            return UserSerializer
         return BoardSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        #Not logged in : public boards only
-        if not user.is_authenticated:
-            return Board.objects.filter(is_public=True)
-        
-        #Admins and Moderators: all boards
-        if is_admin_or_moderator(user):
-            return Board.objects.all()
-        
-        #Authenticated regular users: public boards + private boards where they are members
-        return Board.objects.filter(Q(is_public=True) | Q(members=user)|Q(created_by=user)).distinct()
+        qs = super().get_queryset()
+        action_name = getattr(self, 'action', None)
+        if action_name == 'list':
+            qs = qs.with_member_count()
+        elif action_name in ('retrieve', 'update', 'partial_update'):
+            qs = qs.prefetch_related('created_by__groups', 'members__groups')
+        #Anonymous: public boards, Admins and Moderators: all boards,
+        #regular users: public boards + private boards where they are members or creators
+        return filter_accessible(qs, self.request.user, board_field='id')
     
     def get_permissions(self):
         if getattr(self, 'action', None) == 'request_membership':
@@ -88,6 +104,50 @@ class BoardViewSet(viewsets.ModelViewSet):
         membership_request = BoardMembershipRequest.objects.create(board=board,user=user,message=message,status=BoardMembershipRequest.STATUS_PENDING)
         serializer = BoardMembershipRequestSerializer(membership_request,context={'request':request})
         return Response(serializer.data,status=201,)
+    #Paginated member list, kept out of the board payload
+    @action(detail=True,methods=['get'],url_path='members')
+    def members(self,request,pk=None):
+        board = self.get_object()
+        paginator = MemberPagination()
+        page = paginator.paginate_queryset(self.members_query(board), request)
+        serializer = UserSerializer(page,many=True,context={'request':request})
+        return paginator.get_paginated_response(serializer.data)
+
+    def members_query(self, board):
+        return board.members.prefetch_related('groups')
+
+    #Kanban snapshot: feedback grouped by status with one keyset page (?limit=) per column,
+    #?status=&cursor= loads the next page of a single column
+    @action(detail=True,methods=['get'],url_path='kanban')
+    def kanban(self,request,pk=None):
+        board = self.get_object()
+        limit = kanban.parse_limit(request.query_params.get('limit'))
+        statuses = kanban.STATUSES
+        position = None
+
+        status_param = request.query_params.get('status')
+        if status_param:
+            if status_param not in kanban.STATUSES:
+                raise ValidationError({"status":f"Expected one of {', '.join(kanban.STATUSES)}."})
+            statuses = [status_param]
+            encoded = request.query_params.get('cursor')
+            if encoded:
+                try:
+                    position = kanban.decode_column_cursor(encoded)
+                except ValueError:
+                    raise NotFound("Invalid cursor")
+
+        totals = kanban.column_totals(board.id)
+        base_url = request.build_absolute_uri()
+        columns = {}
+        for column_status in statuses:
+            cards, token = kanban.kanban_column(board.id, column_status, limit, position)
+            next_url = None
+            if token:
+                next_url = replace_query_param(replace_query_param(base_url,'status',column_status),'cursor',token)
+            columns[column_status] = {'total':totals[column_status],'results':cards,'next':next_url}
+        return Response({'board':board.id,'columns':columns})
+
     @action(detail=True,methods=['post','get'],url_path='invites')
     def invites(self,request,pk=None):
         user = request.user
@@ -97,7 +157,7 @@ class BoardViewSet(viewsets.ModelViewSet):
             return Response({"detail":"You do not have permission to view or create invites for this board."},status=403,)
         
         if request.method == 'GET':
-            invite_qs = board.invites.all()
+            invite_qs = board.invites.select_related('created_by').prefetch_related('created_by__groups')
             serializer = BoardInviteSerializer(invite_qs,many=True,context={'request':request})
             return Response(serializer.data)
         
@@ -110,50 +170,50 @@ class BoardViewSet(viewsets.ModelViewSet):
 
 class FeedbackViewSet(viewsets.ModelViewSet):
 
-    queryset = Feedback.objects.select_related('board','created_by').prefetch_related('upvotes').annotate(upvotes_count=Count('upvotes'))
+    queryset = (Feedback.objects.select_related('board','created_by','last_comment__created_by')
+                .prefetch_related('created_by__groups'))
     serializer_class = FeedbackSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrAdminOrModerator]
 
     serializer_class = FeedbackSerializer
 
     # Filtering / search / ordering
-    filter_backends = [DjangoFilterBackend, drf_filters.SearchFilter, drf_filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, FeedbackOrderingFilter]
     filterset_fields = ['status', 'board']
     search_fields = ['title', 'body']
-    ordering_fields = ['created_at', 'upvotes_count']
+    # ?ordering=-hot is an alias of -hot_score (FeedbackOrderingFilter)
+    ordering_fields = ['created_at', 'upvotes_count', 'hot_score']
     ordering = ['-created_at']
+    # ?search= without ?ordering= comes best match first (filters.ranks_search); export turns it off
+    rank_search = True
 
     def get_permissions(self):
-        if self.action == 'set_status':
+        if self.action in ('set_status', 'bulk_set_status', 'merge'):
             return [permissions.IsAuthenticated(), IsAdminOrModerator()]
         
-        if self.action == 'upvote_feedback':
+        if self.action in ('upvote_feedback', 'bulk_import'):
             return [permissions.IsAuthenticated()]
         return [permissions.IsAuthenticatedOrReadOnly(), IsAuthorOrAdminOrModerator()]
 
     def get_serializer_class(self):
         if self.action == 'set_status':
             return FeedbackStatusSerializer
+        if self.action == 'bulk_set_status':
+            return FeedbackBulkStatusSerializer
+        if self.action == 'merge':
+            return FeedbackMergeSerializer
         return FeedbackSerializer
     
-    def get_queryset(self):
-        qs = super().get_queryset()
-        user = self.request.user 
+    #?board= and ?status= are validated and applied by DjangoFilterBackend (filterset_fields)
+    access_board_field = 'board_id'
 
-        board_id = self.request.query_params.get('board')
-        if board_id:
-            qs = qs.filter(board_id=board_id)
+    def get_queryset(self):
+        #Only feedbacks from boards the user can read (see access.accessible_board_ids)
+        return filter_accessible(self.get_unrestricted_queryset(), self.request.user, board_field=self.access_board_field)
 
-        #Not logged in: only feedbacks from public boards
-        if not user.is_authenticated:
-            return qs.filter(board__is_public=True)
-        
-        #Admins and Moderators: all feedbacks
-        if is_admin_or_moderator(user):
-            return qs
-        
-        #Normal users: feedbacks from public boards + boards where they are members or creators
-        return qs.filter(Q(board__is_public=True) | Q(board__members=user)|Q(board__created_by=user)).distinct()
+    def get_unrestricted_queryset(self):
+        #get_queryset() before the visibility filter, which async_views applies with afilter_accessible
+        return super().get_queryset()
     
     #Creating feedback only if user is authenticated and is member/creator of the board or admin/moderator
     def perform_create(self, serializer):
@@ -169,7 +229,35 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         if not(is_admin_or_moderator(user) or is_member or is_creator):
             raise PermissionDenied("You must be a member of the board to add feedback.")
         
-        serializer.save(created_by=user)
+        feedback = serializer.save(created_by=user)
+        #near-duplicates already on the board (duplicates.py), returned with the new item
+        self.possible_duplicates = duplicates.similar_payload(
+            duplicates.similar_to(self.get_queryset(), feedback, limit=duplicates.MAX_POSSIBLE_DUPLICATES))
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.data['possible_duplicates'] = self.possible_duplicates
+        return response
+
+    #Near-duplicates of this feedback on its board, most similar first
+    @action(detail=True,methods=['get'],url_path='similar')
+    def similar(self,request,pk=None):
+        feedback = self.get_object()
+        return Response(duplicates.similar_payload(duplicates.similar_to(self.get_queryset(), feedback)))
+
+    #Admin/Moderator: fold this feedback into the canonical item `into` (upvotes and comments move, this one is deleted)
+    @action(detail=True,methods=['post'],url_path='merge')
+    def merge(self,request,pk=None):
+        duplicate = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        canonical = self.get_queryset().filter(pk=serializer.validated_data['into']).first()
+        if canonical is None:
+            raise ValidationError({"into":"Feedback does not exist."})
+        if canonical.pk == duplicate.pk or canonical.board_id != duplicate.board_id:
+            raise ValidationError({"into":"Expected another feedback on the same board."})
+        canonical = duplicates.merge_feedback(duplicate, canonical)
+        return Response(FeedbackSerializer(canonical,context={'request':request}).data)
     
     #Toggling upvote for the current user.
     @action(detail=True,methods=['post'],url_path='upvote')
@@ -188,17 +276,14 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         if not(is_admin_or_moderator(user) or is_member or is_creator):
             return Response({"detail":"You do not have permission to upvote this feedback."},status=403,)
         
-        #Toggling upvote
-        if feedback.upvotes.filter(id=user.id).exists():
-            feedback.upvotes.remove(user)
-            upvoted = False
-        else:
-            feedback.upvotes.add(user)
-            upvoted = True
-
-        feedback.refresh_from_db()
-
-        return Response({'id':feedback.id,'upvoted':upvoted,'upvotes_count':feedback.upvotes.count(),})
+        #Toggling upvote (single transaction, stored counter)
+        upvoted, upvotes_count = feedback.toggle_upvote(user)
+        update_hot_scores([feedback.pk])
+        schedule_feedback_refresh([feedback])
+        events.publish_on_commit(events.FEEDBACK_UPVOTES_CHANGED, feedback.board_id,
+                                 {'id': feedback.id, 'upvotes_count': upvotes_count})
+
+        return Response({'id':feedback.id,'upvoted':upvoted,'upvotes_count':upvotes_count,})
     
     #Admin/Moderator can change status of feedback
     @action(detail=True,methods=['post'],url_path='set_status')
@@ -213,37 +298,167 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         status_serializer.is_valid(raise_exception=True)
         new_status = status_serializer.validated_data['status']
         
+        #the status log row (status_history.py) is written by the post_save signal, in this transaction
         feedback.status = new_status
-        feedback.save(update_fields=['status'])
+        feedback._status_changed_by = user
+        write_transaction(feedback.save)(update_fields=['status'])
 
         output_serializer = FeedbackSerializer(feedback,context={'request':request})
         return Response(output_serializer.data)
 
+    #Admin/Moderator: move many feedbacks to one status in a single UPDATE, e.g. from the kanban view.
+    #Role check once for the whole set (they can read every board), compact per-id results
+    @action(detail=False,methods=['post'],url_path='bulk_set_status')
+    def bulk_set_status(self,request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk.set_status_bulk(serializer.validated_data['ids'],serializer.validated_data['status'],changed_by=request.user)
+        return Response({'status':serializer.validated_data['status'],'results':results})
+
+    #Bulk import: NDJSON or CSV (header row) body, one feedback per line, streamed and inserted in batches
+    @action(detail=False,methods=['post'],url_path='import')
+    def bulk_import(self,request):
+        content_type = request.content_type.split(';')[0].strip()
+        if content_type in bulk.NDJSON_CONTENT_TYPES:
+            parse = bulk.parse_ndjson
+        elif content_type in bulk.CSV_CONTENT_TYPES:
+            parse = bulk.parse_csv
+        else:
+            raise UnsupportedMediaType(content_type)
+
+        #read the raw body line by line instead of request.data, which would load it all
+        rows = parse(bulk.read_lines(request._request))
+        result = bulk.import_feedback(rows, request.user)
+        return Response(result,status=201 if result['created'] else 400)
+
+    #Streaming export of the feedbacks visible to the user, same filters as the list (?board=, ?status=, ?search=)
+    @action(detail=False,methods=['get'],url_path='export')
+    def export(self,request):
+        export_format = request.query_params.get('export_format','ndjson')
+        if export_format not in ('ndjson','csv'):
+            raise ValidationError({"export_format":"Expected ndjson or csv."})
+
+        #rows go out in id order, so a search only selects them: every match, nothing ranked
+        self.rank_search = False
+        queryset = self.filter_queryset(self.get_queryset())
+        #under ASGI stream from an async iterator, a sync one would be read into memory first
+        if isinstance(request._request, ASGIRequest):
+            rows = bulk.aexport_rows(queryset)
+            lines = bulk.acsv_lines(rows) if export_format == 'csv' else bulk.andjson_lines(rows)
+        else:
+            rows = bulk.export_rows(queryset)
+            lines = bulk.csv_lines(rows) if export_format == 'csv' else bulk.ndjson_lines(rows)
+        content_type = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(lines,content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="feedback.{export_format}"'
+        return response
+
 
 
 class CommentViewSet(viewsets.ModelViewSet):
 
-    queryset = Comment.objects.select_related('feedback','created_by')
+    queryset = Comment.objects.select_related('feedback','created_by').prefetch_related('created_by__groups')
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly,IsAuthorOrAdminOrModerator]
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
+    # ?feedback__in=1,2,3 (grouped_list)
+    max_grouped_feedbacks = 100
+    default_per_feedback = 3
+    max_per_feedback = 50
+
+    access_board_field = 'feedback__board_id'
 
     def get_queryset(self):
+        #only comments on feedbacks from boards the user can read
+        return filter_accessible(self.get_unrestricted_queryset(), self.request.user, board_field=self.access_board_field)
+
+    def get_unrestricted_queryset(self):
+        #get_queryset() before the visibility filter, which async_views applies with afilter_accessible
         qs = super().get_queryset()
-        user = self.request.user
         feedback_id = self.request.query_params.get('feedback')
         if feedback_id:
+            if not feedback_id.isdigit():
+                raise ValidationError({'feedback': ['A valid integer is required.']})
             qs = qs.filter(feedback_id=feedback_id)
-        
-        #not logged in: only comments on feedbacks from public boards
-        if not user.is_authenticated:
-            return qs.filter(feedback__board__is_public=True)
-        
-        #Admins and Moderators: all comments
-        if is_admin_or_moderator(user):
-            return qs
-        
-        #normal users: comments on feedbacks from public boards + boards where they are members or creators
-        return qs.filter(Q(feedback__board__is_public=True) | Q(feedback__board__members=user)|Q(feedback__board__created_by=user)).distinct()
+        return qs
+
+    #Threaded comments of a feedback in display order, ?feedback= required
+    @action(detail=False,methods=['get'],url_path='thread')
+    def thread(self,request):
+        self.require_thread_feedback(request)
+        return self.thread_page(self.get_queryset())
+
+    def require_thread_feedback(self, request):
+        if not request.query_params.get('feedback'):
+            raise ValidationError({'feedback': ['This query parameter is required.']})
+
+    #A comment and all its replies in display order
+    @action(detail=True,methods=['get'],url_path='thread',url_name='subtree')
+    def subtree(self,request,pk=None):
+        return self.thread_page(self.subtree_query(self.get_object()))
+
+    def subtree_query(self, comment):
+        # the paths starting with the comment's under any collation, from where it starts in the
+        # (feedback, path) index; SQLite compares them bytewise, so the range can also end the index scan
+        low, high = comment.subtree_range()
+        qs = (Comment.objects.select_related('created_by').prefetch_related('created_by__groups')
+              .filter(feedback_id=comment.feedback_id, path__startswith=comment.path, path__gte=low))
+        if connection.vendor == 'sqlite':
+            qs = qs.filter(path__lt=high)
+        return qs
+
+    def thread_page(self, queryset):
+        # keyset pages over the (feedback, path) index, never the whole tree
+        paginator = ThreadPagination()
+        page = paginator.paginate_queryset(queryset, self.request)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def list(self, request, *args, **kwargs):
+        if 'feedback__in' in request.query_params:
+            return self.grouped_list(request)
+        return super().list(request, *args, **kwargs)
+
+    def grouped_list(self, request):
+        """
+        GET /comment/?feedback__in=1,2,3&per_feedback=3: the newest comments of many feedbacks
+        in one query, as {feedback_id: [comments]}. Every requested id gets a list, empty when
+        the feedback has no comments or is not readable.
+        """
+        ids, per_feedback = self.grouped_params(request)
+        return Response(self.grouped_data(ids, self.grouped_query(ids, per_feedback)))
+
+    def grouped_params(self, request):
+        """The validated (feedback ids, per_feedback) of a ?feedback__in= request."""
+        try:
+            ids = list(dict.fromkeys(int(i) for i in request.query_params['feedback__in'].split(',') if i.strip()))
+        except ValueError:
+            raise ValidationError({'feedback__in': ['Expected a comma separated list of feedback ids.']})
+        if not ids or len(ids) > self.max_grouped_feedbacks:
+            raise ValidationError({'feedback__in': [f'Give between 1 and {self.max_grouped_feedbacks} feedback ids.']})
+        try:
+            per_feedback = min(int(request.query_params.get('per_feedback', self.default_per_feedback)), self.max_per_feedback)
+        except ValueError:
+            raise ValidationError({'per_feedback': ['A valid integer is required.']})
+        if per_feedback < 1:
+            raise ValidationError({'per_feedback': ['Must be at least 1.']})
+        return ids, per_feedback
+
+    def grouped_data(self, ids, comments):
+        groups = {feedback_id: [] for feedback_id in ids}
+        for comment in self.get_serializer(comments, many=True).data:
+            groups[comment['feedback']].append(comment)
+        return groups
+
+    def grouped_query(self, ids, per_feedback, queryset=None):
+        # newest per_feedback comments of each feedback: ROW_NUMBER() over the (feedback, -created_at, -id) index
+        queryset = self.get_queryset() if queryset is None else queryset
+        return (queryset.filter(feedback_id__in=ids)
+                .annotate(position=Window(RowNumber(), partition_by=F('feedback_id'),
+                                          order_by=[F('created_at').desc(), F('id').desc()]))
+                .filter(position__lte=per_feedback)
+                .order_by('feedback_id', '-created_at', '-id'))
 
     def perform_create(self, serializer):
         #runs when a new comment is created using POST request
@@ -260,7 +475,8 @@ class CommentViewSet(viewsets.ModelViewSet):
         if not(is_admin_or_moderator(user) or is_member or is_creator):
             raise PermissionDenied("You do not have the permission to comment on this feedback.")
         
-        serializer.save(created_by=user)
+        #the insert, its path and the counters (signals) commit together, retried when the database is locked
+        write_transaction(serializer.save)(created_by=user)
 
 #Public end point for user sign up
 class RegisterView(generics.CreateAPIView):
@@ -269,9 +485,17 @@ class RegisterView(generics.CreateAPIView):
 
 
 class BoardMembershipRequestViewSet(viewsets.ModelViewSet):
-    queryset = BoardMembershipRequest.objects.select_related("board", "user", "handled_by").order_by('handled_at')
+    #oldest first, the order requests are worked through; (status, requested_at, id) indexes
+    queryset = BoardMembershipRequest.objects.select_related("board", "user", "handled_by").prefetch_related('user__groups').order_by('requested_at','id')
     serializer_class = BoardMembershipRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # the moderation page reads the whole pending queue
+    pagination_class = None
+
+    def get_serializer_class(self):
+        if self.action in ('bulk_approve', 'bulk_reject'):
+            return MembershipRequestBulkSerializer
+        return BoardMembershipRequestSerializer
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -361,6 +585,22 @@ class BoardMembershipRequestViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(membership_request, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    #Many requests (ids, or all pending ones of a board) in one UPDATE and one members insert, per-id results
+    @action(detail=False, methods=["post"], url_path="bulk_approve")
+    def bulk_approve(self, request):
+        return self._bulk_moderate(request, BoardMembershipRequest.STATUS_APPROVED)
+
+    @action(detail=False, methods=["post"], url_path="bulk_reject")
+    def bulk_reject(self, request):
+        return self._bulk_moderate(request, BoardMembershipRequest.STATUS_REJECTED)
+
+    def _bulk_moderate(self, request, new_status):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = moderation.moderate_requests(request.user, new_status, ids=serializer.validated_data.get('ids'),
+                                               board_id=serializer.validated_data.get('board'))
+        return Response({'status': new_status, 'results': results})
     
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -371,25 +611,18 @@ def me_view(request):
 class InviteAcceptView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    #one conditional UPDATE of the use counter plus the membership insert (invites.py)
     def post(self, request, token):
-        try:
-            invite = BoardInvite.objects.get(token=token)
-        except BoardInvite.DoesNotExist:
+        result, board_id = invites.redeem_invite(token, request.user)
+        if result == invites.NOT_FOUND:
             return Response({"detail": "Invalid invite token."}, status=404)
-        if not invite.is_valid():
+        if result == invites.INVALID:
             return Response({"detail": "This invite is no longer valid."}, status=400)
-        
-        board = invite.board
-        user = request.user
-
-        #Check if user is already a member
-        if board.members.filter(id=user.id).exists():
+        if result == invites.ALREADY_MEMBER:
             return Response({"detail":"You are already a member of this board."},status=400,)
-        #add member
-        board.members.add(user)
-        invite.use() #mark it as used
 
-        serializer = BoardSerializer(board,context={'request':request})
+        board = Board.objects.select_related('created_by').with_member_count().get(pk=board_id)
+        serializer = BoardListSerializer(board,context={'request':request})
         return Response({"detail":"You have successfully joined the board.","board":serializer.data},status=200,)
     
 class InviteRevokeView(APIView):
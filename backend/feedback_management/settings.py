@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -46,6 +47,8 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    # first, so latency and SQL counts cover the whole middleware stack (feedback/metrics.py)
+    'feedback.metrics.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -56,6 +59,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request metrics (feedback/metrics.py): /feedback-api/v1/metrics/ answers INTERNAL_IPS, or any
+# address with "Authorization: Bearer $METRICS_TOKEN" when the token is set. Requests above
+# the optional budgets are logged as warnings.
+INTERNAL_IPS = os.environ.get('INTERNAL_IPS', '127.0.0.1').split(',')
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+METRICS_QUERY_BUDGET = int(os.environ['METRICS_QUERY_BUDGET']) if os.environ.get('METRICS_QUERY_BUDGET') else None
+METRICS_TIME_BUDGET_MS = float(os.environ['METRICS_TIME_BUDGET_MS']) if os.environ.get('METRICS_TIME_BUDGET_MS') else None
+
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:5173',
     'http://127.0.0.1:5173',
@@ -74,6 +85,8 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ),
+    "DEFAULT_PAGINATION_CLASS": "feedback.pagination.KeysetPagination",
+    "PAGE_SIZE": 25,
 }
 
 SIMPLE_JWT = {
@@ -105,14 +118,76 @@ WSGI_APPLICATION = 'feedback_management.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite production profile (feedback/sqlite.py), SQLITE_PROFILE=stock for the driver defaults.
+# The pragmas run on every new connection; busy_timeout comes first so the others wait for locks.
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -32 * 1024,  # KiB
+    'temp_store': 'MEMORY',
+} if SQLITE_PROFILE == 'production' else {}
+# runs of a write transaction (sqlite.write_transaction) that failed with "database is locked"
+SQLITE_WRITE_ATTEMPTS = 3
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # a file, not the default shared in-memory database, so tests that write from many
+        # threads wait on SQLite's file lock (busy timeout) instead of failing on table locks
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        # atomic() blocks take the write lock up front (BEGIN IMMEDIATE), see feedback/sqlite.py
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'} if SQLITE_PROFILE == 'production' else {},
     }
 }
 
 
+# Caches
+# The analytics endpoints cache their responses in a separate cache, selected with
+# ANALYTICS_CACHE_BACKEND=locmem|file|redis (any Redis-protocol server) and ANALYTICS_CACHE_LOCATION.
+
+ANALYTICS_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'analytics'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.analytics_cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+_analytics_backend, _analytics_location = ANALYTICS_CACHE_BACKENDS[os.environ.get('ANALYTICS_CACHE_BACKEND', 'locmem')]
+
+# Board visibility (feedback/access.py) is cached in its own cache, selected the same way with
+# ACCESS_CACHE_BACKEND and ACCESS_CACHE_LOCATION. Memberships and visibility changes invalidate it
+# by writing to that cache, which reaches only the processes sharing it: locmem is per process, so
+# with several server workers use file (one host) or redis. With locmem the entries expire quickly
+# (ACCESS_CACHE_TIMEOUT) to bound how long another worker can serve a removed member.
+
+ACCESS_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'access'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.access_cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/2'),
+}
+_access_backend_name = os.environ.get('ACCESS_CACHE_BACKEND', 'locmem')
+_access_backend, _access_location = ACCESS_CACHE_BACKENDS[_access_backend_name]
+ACCESS_CACHE_TIMEOUT = int(os.environ.get('ACCESS_CACHE_TIMEOUT', 10 if _access_backend_name == 'locmem' else 300))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analytics': {
+        'BACKEND': _analytics_backend,
+        'LOCATION': os.environ.get('ANALYTICS_CACHE_LOCATION', _analytics_location),
+        'TIMEOUT': 600,
+    },
+    'access': {
+        'BACKEND': _access_backend,
+        'LOCATION': os.environ.get('ACCESS_CACHE_LOCATION', _access_location),
+        'TIMEOUT': ACCESS_CACHE_TIMEOUT,
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
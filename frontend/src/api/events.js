@@ -0,0 +1,34 @@
+// src/api/events.js
+// Live board events over Server-Sent Events (GET /events/). EventSource cannot send an
+// Authorization header, so the access token goes in the query string.
+const API_BASE = import.meta.env.VITE_API_BASE || "http://127.0.0.1:8000/feedback-api/v1";
+
+const EVENT_TYPES = [
+  "feedback.created",
+  "feedback.imported",
+  "feedback.status_changed",
+  "feedback.upvotes_changed",
+  "comment.created",
+  "membership_request.created",
+  "membership_request.updated",
+  "resync",
+];
+
+// onEvent(type, data) is called for every event; returns an unsubscribe function
+export function subscribeBoardEvents(boardId, onEvent) {
+  if (typeof EventSource === "undefined") return () => {};
+  const params = new URLSearchParams();
+  if (boardId) params.set("board", boardId);
+  const token = localStorage.getItem("access_token");
+  if (token) params.set("token", token);
+
+  const source = new EventSource(`${API_BASE}/events/?${params}`);
+  EVENT_TYPES.forEach(type => {
+    source.addEventListener(type, e => {
+      let data = {};
+      try { data = JSON.parse(e.data); } catch (err) { /* keep empty */ }
+      onEvent(type, data);
+    });
+  });
+  return () => source.close();
+}
@@ -1,19 +1,38 @@
 // src/components/Comments.jsx
-import React, { useEffect, useState, useContext } from "react";
+import React, { useEffect, useRef, useState, useContext } from "react";
 import api from "../api/api";
 import { AuthContext } from "../contexts/AuthContext";
+import { useBoardEvents } from "../contexts/BoardEventsContext";
 import { userHasRole } from "../utils/roles";
 
 export default function Comments({ feedbackId }) {
   const { user } = useContext(AuthContext);
   const [comments, setComments] = useState([]);
+  const [next, setNext] = useState(null);
   const [body, setBody] = useState("");
+  const [replyTo, setReplyTo] = useState(null);
   const [loading, setLoading] = useState(false);
+  const shownIds = useRef(new Set());
 
+  useEffect(() => { shownIds.current = new Set(comments.map(c => c.id)); }, [comments]);
+
+  // thread order: each reply follows its parent, one keyset page at a time
   const load = async () => {
     try {
-      const res = await api.get(`/comment/?feedback=${feedbackId}`);
-      setComments(res.data);
+      const res = await api.get(`/comment/thread/?feedback=${feedbackId}`);
+      setComments(res.data.results ?? res.data);
+      setNext(res.data.next ?? null);
+    } catch (err) {
+      console.error("Failed to load comments", err);
+    }
+  };
+
+  const loadMore = async () => {
+    if (!next) return;
+    try {
+      const res = await api.get(next);
+      setComments(c => [...c, ...res.data.results]);
+      setNext(res.data.next);
     } catch (err) {
       console.error("Failed to load comments", err);
     }
@@ -21,15 +40,24 @@ export default function Comments({ feedbackId }) {
 
   useEffect(() => { load(); }, [feedbackId]);
 
+  // comments posted by others arrive as live events of the page's board stream instead of re-polling
+  useBoardEvents((type, data) => {
+    if (type === "resync") load();
+    if (type === "comment.created" && String(data.feedback) === String(feedbackId) && !shownIds.current.has(data.id)) {
+      load();
+    }
+  });
+
   const submit = async (e) => {
     e.preventDefault();
     if (!user) return alert("Login to comment");
     if (!body.trim()) return;
     setLoading(true);
     try {
-      const res = await api.post("/comment/", { feedback: feedbackId, body });
+      await api.post("/comment/", { feedback: feedbackId, body, ...(replyTo ? { parent: replyTo.id } : {}) });
       setBody("");
-      setComments(c => [res.data, ...c]);
+      setReplyTo(null);
+      load();
     } catch (err) {
       alert(err.response?.data?.detail || "Failed to post comment");
     } finally {
@@ -61,6 +89,12 @@ export default function Comments({ feedbackId }) {
   return (
     <div className="border-t pt-3">
       <form onSubmit={submit} className="mb-3">
+        {replyTo && (
+          <div className="text-xs text-gray-600 mb-1">
+            Replying to {replyTo.created_by?.username}{" "}
+            <button type="button" onClick={() => setReplyTo(null)} className="text-blue-600">Cancel</button>
+          </div>
+        )}
         <textarea
           value={body}
           onChange={e => setBody(e.target.value)}
@@ -82,10 +116,11 @@ export default function Comments({ feedbackId }) {
             const canManage = user && (userHasRole(user, "Admin") || userHasRole(user, "Moderator"));
             const isAuthor = user && (user.id === (c.created_by?.id ?? c.created_by));
             return (
-              <div key={c.id} className="border p-2 rounded mb-2">
+              <div key={c.id} className="border p-2 rounded mb-2" style={{ marginLeft: `${Math.min(c.depth ?? 0, 6) * 1.5}rem` }}>
                 <div className="text-sm text-gray-700">{c.body}</div>
                 <div className="text-xs text-gray-500 mt-1">By: {c.created_by?.username || c.created_by}</div>
                 <div className="mt-2">
+                  {user && <button onClick={() => setReplyTo(c)} className="mr-2 text-sm text-blue-600">Reply</button>}
                   { (isAuthor || canManage) && (
                     <>
                       <button onClick={() => handleEdit(c)} className="mr-2 text-sm text-blue-600">Edit</button>
@@ -97,6 +132,7 @@ export default function Comments({ feedbackId }) {
             );
           })
         }
+        {next && <button onClick={loadMore} className="text-sm text-blue-600">Load more comments</button>}
       </div>
     </div>
   );
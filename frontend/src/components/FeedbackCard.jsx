@@ -10,10 +10,10 @@ export default function FeedbackCard({ item, onClick }) {
       onKeyDown={(e) => { if (e.key === "Enter" && onClick) onClick(); }}
     >
       <div className="font-semibold">{item.title}</div>
-      <div className="text-sm text-gray-600 mt-1">{item.body ? item.body.slice(0, 140) : ""}</div>
+      <div className="text-sm text-gray-600 mt-1">{item.excerpt ?? (item.body ? item.body.slice(0, 140) : "")}</div>
       <div className="mt-2 text-xs text-gray-500 flex justify-between">
-        <div>By: {item.created_by?.username ?? item.created_by}</div>
-        <div>{item.upvotes_count ?? (item.upvotes ? item.upvotes.length : 0)} ▲</div>
+        <div>By: {item.created_by_username ?? item.created_by?.username ?? item.created_by}</div>
+        <div>{item.comments_count ?? 0} comments · {item.upvotes_count ?? (item.upvotes ? item.upvotes.length : 0)} ▲</div>
       </div>
     </div>
   );
@@ -6,6 +6,7 @@ export default function FeedbackForm({ boardId, onCreated }) {
   const [title, setTitle] = useState("");
   const [body, setBody] = useState("");
   const [loading, setLoading] = useState(false);
+  const [duplicates, setDuplicates] = useState([]);
 
   const submit = async (e) => {
     e.preventDefault();
@@ -14,6 +15,7 @@ export default function FeedbackForm({ boardId, onCreated }) {
     try {
       const res = await api.post("/feedback/", { board: boardId, title, body });
       setTitle(""); setBody("");
+      setDuplicates(res.data.possible_duplicates ?? []);
       onCreated && onCreated(res.data);
     } catch (err) {
       alert(err.response?.data?.detail || JSON.stringify(err.response?.data) || "Failed to create feedback");
@@ -41,6 +43,16 @@ export default function FeedbackForm({ boardId, onCreated }) {
       <button className="bg-blue-600 text-white px-4 py-2 rounded" disabled={loading}>
         {loading ? "Posting..." : "Post feedback"}
       </button>
+      {duplicates.length > 0 && (
+        <div className="mt-3 text-sm bg-yellow-50 border border-yellow-200 rounded p-2">
+          <div className="font-medium">Posted. Similar feedback already on this board:</div>
+          <ul className="list-disc ml-5">
+            {duplicates.map(d => (
+              <li key={d.id}>{d.title} ({d.upvotes_count} ▲, {Math.round(d.similarity * 100)}% similar)</li>
+            ))}
+          </ul>
+        </div>
+      )}
     </form>
   );
 }
@@ -56,6 +56,17 @@ export default function FeedbackItem({ feedback, onUpdated }) {
     }
   };
 
+  const handleMerge = async () => {
+    const into = prompt("Merge into feedback id (upvotes and comments move there, this item is deleted)");
+    if (!into) return;
+    try {
+      await api.post(`/feedback/${feedback.id}/merge/`, { into: Number(into) });
+      onUpdated && onUpdated({ id: feedback.id, deleted: true });
+    } catch (err) {
+      alert(err.response?.data?.detail || JSON.stringify(err.response?.data) || "Merge failed");
+    }
+  };
+
   const handleStatusChange = async (e) => {
     const newStatus = e.target.value;
     try {
@@ -73,6 +84,11 @@ export default function FeedbackItem({ feedback, onUpdated }) {
           <h4 className="font-semibold">{feedback.title}</h4>
           <p className="text-sm text-gray-700">{feedback.body}</p>
           <div className="text-xs text-gray-500 mt-2">Status: {feedback.status}</div>
+          {!showComments && feedback.last_comment && (
+            <div className="text-xs text-gray-600 mt-2 border-l-2 pl-2">
+              <span className="font-medium">{feedback.last_comment.created_by?.username}:</span> {feedback.last_comment.body}
+            </div>
+          )}
         </div>
 
         <div className="flex flex-col items-end">
@@ -100,6 +116,7 @@ export default function FeedbackItem({ feedback, onUpdated }) {
                 <option value="in_progress">In Progress</option>
                 <option value="completed">Completed</option>
               </select>
+              <button onClick={handleMerge} className="ml-2 text-sm text-blue-600">Merge</button>
             </div>
           )}
 
@@ -107,7 +124,7 @@ export default function FeedbackItem({ feedback, onUpdated }) {
             className="mt-2 text-sm text-blue-600"
             onClick={() => setShowComments(s => !s)}
           >
-            {showComments ? "Hide comments" : "Comments"}
+            {showComments ? "Hide comments" : `Comments (${feedback.comments_count ?? 0})`}
           </button>
         </div>
       </div>
@@ -5,23 +5,28 @@ import Pagination from "./Pagination";
 import { AuthContext } from "../contexts/AuthContext";
 import { userHasRole } from "../utils/roles";
 
+function cursorFromLink(link) {
+  return link ? new URL(link).searchParams.get("cursor") : null;
+}
+
 export default function FeedbackTable({ boardId, pageSize = 10 }) {
   const { user } = useContext(AuthContext);
   const [loading, setLoading] = useState(false);
   const [feedbacks, setFeedbacks] = useState([]);
-  const [page, setPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
+  const [cursor, setCursor] = useState(null);
+  const [links, setLinks] = useState({ next: null, previous: null });
   const [filters, setFilters] = useState({});
 
   useEffect(() => {
     fetchData();
     // eslint-disable-next-line
-  }, [boardId, page, filters]);
+  }, [boardId, cursor, filters]);
 
   async function fetchData() {
     setLoading(true);
     try {
-      const params = { board: boardId, page, page_size: pageSize };
+      const params = { board: boardId, page_size: pageSize };
+      if (cursor) params.cursor = cursor;
       if (filters.status) params.status = filters.status;
       if (filters.search) params.search = filters.search;
       if (filters.ordering) params.ordering = filters.ordering;
@@ -29,12 +34,11 @@ export default function FeedbackTable({ boardId, pageSize = 10 }) {
       const data = res.data;
       const items = data.results ?? data; // support paginated & non-paginated
       setFeedbacks(items);
-      const count = data.count ?? items.length;
-      setTotalPages(Math.max(1, Math.ceil(count / pageSize)));
+      setLinks({ next: data.next ?? null, previous: data.previous ?? null });
     } catch (err) {
       console.error("Failed to load feedbacks", err);
       setFeedbacks([]);
-      setTotalPages(1);
+      setLinks({ next: null, previous: null });
     } finally {
       setLoading(false);
     }
@@ -42,7 +46,7 @@ export default function FeedbackTable({ boardId, pageSize = 10 }) {
 
   const onFilter = (f) => {
     setFilters(f || {});
-    setPage(1);
+    setCursor(null);
   };
 
   const handleDelete = async (id) => {
@@ -106,7 +110,12 @@ export default function FeedbackTable({ boardId, pageSize = 10 }) {
           </table>
         </div>
       )}
-      <Pagination page={page} totalPages={totalPages} onPage={(p) => setPage(p)} />
+      <Pagination
+        hasPrevious={!!links.previous}
+        hasNext={!!links.next}
+        onPrevious={() => setCursor(cursorFromLink(links.previous))}
+        onNext={() => setCursor(cursorFromLink(links.next))}
+      />
     </div>
   );
 }
\ No newline at end of file
@@ -29,6 +29,7 @@ export default function FilterBar({ onFilter, defaultStatus = "" }) {
         <option value="-created_at">Newest</option>
         <option value="created_at">Oldest</option>
         <option value="-upvotes_count">Most upvotes</option>
+        <option value="-hot">Hot</option>
       </select>
 
       <button className="px-3 py-2 bg-blue-600 text-white rounded">Apply</button>
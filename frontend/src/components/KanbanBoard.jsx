@@ -10,6 +10,7 @@ import {
 } from "@dnd-kit/core";
 import { SortableContext, rectSortingStrategy } from "@dnd-kit/sortable";
 import api from "../api/api";
+import { subscribeBoardEvents } from "../api/events";
 import FeedbackCard from "./FeedbackCard";
 import { SortableItem } from "./sortable";
 import { AuthContext } from "../contexts/AuthContext";
@@ -22,14 +23,14 @@ const STATUSES = [
 ];
 
 /* Column component: droppable area with id `col_<statusKey>` */
-function Column({ statusKey, title, items }) {
+function Column({ statusKey, title, items, total, hasMore, onLoadMore }) {
   const { setNodeRef } = useDroppable({ id: `col_${statusKey}` });
 
   return (
     <div ref={setNodeRef} className="bg-gray-50 p-3 rounded min-h-[200px]">
       <div className="flex items-center justify-between mb-3">
         <h4 className="font-semibold">{title}</h4>
-        <span className="text-xs text-gray-600">{(items || []).length}</span>
+        <span className="text-xs text-gray-600">{total ?? (items || []).length}</span>
       </div>
 
       <SortableContext items={(items || []).map(i => `${statusKey}_${i.id}`)} strategy={rectSortingStrategy}>
@@ -41,6 +42,10 @@ function Column({ statusKey, title, items }) {
           ))}
         </div>
       </SortableContext>
+
+      {hasMore && (
+        <button className="text-sm text-blue-600 mt-2" onClick={onLoadMore}>Load more</button>
+      )}
     </div>
   );
 }
@@ -48,22 +53,28 @@ function Column({ statusKey, title, items }) {
 export default function KanbanBoard({ boardId, onUpdated }) {
   const { user } = useContext(AuthContext);
   const [columns, setColumns] = useState({ open: [], in_progress: [], completed: [] });
+  const [totals, setTotals] = useState({});
+  const [nextLinks, setNextLinks] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
+  // server-side snapshot: cards already grouped by status, one page per column
   const loadAll = useCallback(async () => {
     setLoading(true);
     setError(null);
     try {
-      const res = await api.get("/feedback/", { params: { board: boardId, page_size: 1000 } });
-      const items = res.data.results ?? res.data ?? [];
+      const res = await api.get(`/board/${boardId}/kanban/`, { params: { limit: 50 } });
       const grouped = { open: [], in_progress: [], completed: [] };
-      (items || []).forEach(i => {
-        const key = normalizeStatus(i.status || "open");
-        grouped[key] = grouped[key] || [];
-        grouped[key].push(i);
+      const counts = {};
+      const links = {};
+      Object.entries(res.data.columns || {}).forEach(([key, column]) => {
+        grouped[key] = column.results || [];
+        counts[key] = column.total;
+        links[key] = column.next;
       });
       setColumns(grouped);
+      setTotals(counts);
+      setNextLinks(links);
     } catch (err) {
       console.error("Kanban load error", err);
       setColumns({ open: [], in_progress: [], completed: [] });
@@ -73,8 +84,53 @@ export default function KanbanBoard({ boardId, onUpdated }) {
     }
   }, [boardId]);
 
+  // next page of a single column
+  async function loadMore(statusKey) {
+    const next = nextLinks[statusKey];
+    if (!next) return;
+    try {
+      const res = await api.get(next);
+      const column = res.data.columns[statusKey];
+      setColumns(prev => ({ ...prev, [statusKey]: [...(prev[statusKey] || []), ...(column.results || [])] }));
+      setTotals(prev => ({ ...prev, [statusKey]: column.total }));
+      setNextLinks(prev => ({ ...prev, [statusKey]: column.next }));
+    } catch (err) {
+      console.error("Kanban load more error", err);
+    }
+  }
+
   useEffect(() => { loadAll(); }, [boardId, loadAll]);
 
+  // live updates from other users: move/update cards in place, reload for new cards
+  useEffect(() => subscribeBoardEvents(boardId, (type, data) => {
+    if (type === "feedback.created" || type === "feedback.imported" || type === "feedback.merged" || type === "resync") {
+      loadAll();
+    } else if (type === "feedback.status_changed") {
+      // our own drag-and-drop moves arrive here too, those cards are already in place
+      let moved = false;
+      setColumns(prev => {
+        const from = normalizeStatus(data.previous_status);
+        const card = (prev[from] || []).find(x => x.id === data.id);
+        if (!card) return prev;
+        moved = true;
+        return {
+          ...prev,
+          [from]: prev[from].filter(x => x.id !== data.id),
+          [data.status]: [{ ...card, status: data.status }, ...(prev[data.status] || [])],
+        };
+      });
+      setTotals(prev => (!moved ? prev : {
+        ...prev,
+        [data.previous_status]: Math.max((prev[data.previous_status] || 1) - 1, 0),
+        [data.status]: (prev[data.status] || 0) + 1,
+      }));
+    } else if (type === "feedback.upvotes_changed") {
+      setColumns(prev => Object.fromEntries(Object.entries(prev).map(([key, items]) => [
+        key, items.map(x => (x.id === data.id ? { ...x, upvotes_count: data.upvotes_count } : x)),
+      ])));
+    }
+  }), [boardId, loadAll]);
+
   const sensors = useSensors(useSensor(PointerSensor));
   const canChangeStatus = user && (userHasRole(user, "Admin") || userHasRole(user, "Moderator"));
 
@@ -208,9 +264,14 @@ export default function KanbanBoard({ boardId, onUpdated }) {
       if (idx === -1) return prev;
       movedItem = fromList[idx];
       next[foundFrom] = fromList.filter((_, i) => i !== idx);
-      next[to] = [movedItem, ...(next[to] || [])];
+      next[to] = [{ ...movedItem, status: to }, ...(next[to] || [])];
       return next;
     });
+    setTotals(prev => {
+      if (!movedItem) return prev;
+      const fromKey = normalizeStatus(movedItem.status);
+      return { ...prev, [fromKey]: (prev[fromKey] || 1) - 1, [to]: (prev[to] || 0) + 1 };
+    });
 
     // call backend with numeric id and canonical status
     try {
@@ -234,7 +295,15 @@ export default function KanbanBoard({ boardId, onUpdated }) {
     <DndContext sensors={sensors} collisionDetection={closestCenter} onDragEnd={onDragEnd}>
       <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
         {STATUSES.map(s => (
-          <Column key={s.key} statusKey={s.key} title={s.title} items={columns[s.key] || []} />
+          <Column
+            key={s.key}
+            statusKey={s.key}
+            title={s.title}
+            items={columns[s.key] || []}
+            total={totals[s.key]}
+            hasMore={Boolean(nextLinks[s.key])}
+            onLoadMore={() => loadMore(s.key)}
+          />
         ))}
       </div>
     </DndContext>
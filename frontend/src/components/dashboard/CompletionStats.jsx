@@ -0,0 +1,28 @@
+// src/components/dashboard/CompletionStats.jsx
+import React from "react";
+
+function hours(value) {
+  if (value == null) return "–";
+  return value < 48 ? `${value} h` : `${Math.round(value / 24)} d`;
+}
+
+export default function CompletionStats({ timeToComplete, funnel, loading }) {
+  if (loading) return <div className="bg-white p-4 rounded shadow">Loading completion stats…</div>;
+  const total = funnel?.total;
+  const pct = timeToComplete?.percentiles_hours || {};
+
+  return (
+    <div className="bg-white p-4 rounded shadow">
+      <h3 className="font-semibold mb-2">Completion</h3>
+      {total && (
+        <div className="text-sm text-gray-700 mb-3">
+          {total.created} created → {total.started} started ({Math.round(total.started_rate * 100)}%) →{" "}
+          {total.completed} completed ({Math.round(total.completed_rate * 100)}%)
+        </div>
+      )}
+      <div className="text-xs text-gray-500">
+        Time to complete ({timeToComplete?.count ?? 0} items): p50 {hours(pct.p50)} • p90 {hours(pct.p90)} • p95 {hours(pct.p95)}
+      </div>
+    </div>
+  );
+}
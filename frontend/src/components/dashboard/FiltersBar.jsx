@@ -8,7 +8,7 @@ export default function FiltersBar({ filters, setFilters }) {
 
   useEffect(() => {
     let alive = true;
-    api.get("/board/").then(r => { if (alive) setBoards(r.data || []); }).catch(() => { if (alive) setBoards([]); });
+    api.get("/board/").then(r => { if (alive) setBoards(r.data?.results ?? r.data ?? []); }).catch(() => { if (alive) setBoards([]); });
     return () => { alive = false; };
   }, []);
 
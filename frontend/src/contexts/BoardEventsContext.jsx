@@ -0,0 +1,44 @@
+// src/contexts/BoardEventsContext.jsx
+// One live event stream (api/events.js) per board page, shared by every component on it.
+// Each EventSource keeps one of the browser's ~6 HTTP/1.1 connections to the API busy, so
+// components listen through useBoardEvents instead of opening their own.
+import React, { createContext, useCallback, useContext, useEffect, useRef } from "react";
+import { subscribeBoardEvents } from "../api/events";
+
+export const BoardEventsContext = createContext(null);
+
+export function BoardEventsProvider({ boardId, children }) {
+  const listeners = useRef(new Set());
+  const close = useRef(null);
+
+  // connected while at least one component listens; a new boardId gives a new subscribe,
+  // so the listeners unsubscribe from the old stream and open the new one
+  const subscribe = useCallback(listener => {
+    listeners.current.add(listener);
+    if (!close.current) {
+      close.current = subscribeBoardEvents(boardId, (type, data) => {
+        listeners.current.forEach(notify => notify(type, data));
+      });
+    }
+    return () => {
+      listeners.current.delete(listener);
+      if (!listeners.current.size && close.current) {
+        close.current();
+        close.current = null;
+      }
+    };
+  }, [boardId]);
+
+  return <BoardEventsContext.Provider value={subscribe}>{children}</BoardEventsContext.Provider>;
+}
+
+// onEvent(type, data) for every event of the surrounding BoardEventsProvider (none without one)
+export function useBoardEvents(onEvent) {
+  const subscribe = useContext(BoardEventsContext);
+  const handler = useRef(onEvent);
+  useEffect(() => { handler.current = onEvent; });
+  useEffect(() => {
+    if (!subscribe) return undefined;
+    return subscribe((type, data) => handler.current(type, data));
+  }, [subscribe]);
+}
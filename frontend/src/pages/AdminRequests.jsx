@@ -6,6 +6,7 @@ import { AuthContext } from "../contexts/AuthContext";
 export default function AdminRequests(){
   const { user } = useContext(AuthContext);
   const [requests, setRequests] = useState([]);
+  const [selected, setSelected] = useState([]);
 
   useEffect(() => {
     if (!user) return;
@@ -33,13 +34,41 @@ export default function AdminRequests(){
     }
   };
 
+  const toggleSelected = (id) => {
+    setSelected(prev => prev.includes(id) ? prev.filter(x => x !== id) : [...prev, id]);
+  };
+
+  // one call for all selected requests, per-id results
+  const updateSelected = async (status) => {
+    try {
+      const endpoint = status === "approved" ? "/board-membership-requests/bulk_approve/" : "/board-membership-requests/bulk_reject/";
+      const res = await api.post(endpoint, { ids: selected });
+      const handled = res.data.results.filter(r => r.result === status).map(r => r.id);
+      setRequests(prev => prev.filter(r => !handled.includes(r.id)));
+      setSelected([]);
+      const skipped = res.data.results.length - handled.length;
+      alert(`${handled.length} request(s) ${status}` + (skipped ? `, ${skipped} skipped` : ""));
+    } catch (err) {
+      alert(err.response?.data?.detail || "Failed");
+    }
+  };
+
   if (!user) return <div>Please login as admin to view.</div>;
 
   return (
     <div>
       <h2 className="text-2xl mb-4">Pending Membership Requests</h2>
+      {selected.length > 0 && (
+        <div className="flex gap-2 mb-4">
+          <button className="bg-green-600 text-white px-3 py-1 rounded" onClick={() => updateSelected("approved")}>Approve {selected.length} selected</button>
+          <button className="bg-red-600 text-white px-3 py-1 rounded" onClick={() => updateSelected("rejected")}>Reject {selected.length} selected</button>
+        </div>
+      )}
       {requests.length === 0 ? <p>No pending requests</p> : requests.map(r => (
         <div key={r.id} className="border p-3 mb-3 rounded">
+          <label className="flex items-center gap-2 mb-2 text-sm">
+            <input type="checkbox" checked={selected.includes(r.id)} onChange={() => toggleSelected(r.id)} /> Select
+          </label>
           <div className="mb-2"><strong>Board:</strong> {r.board?.name || r.board}</div>
           <div className="mb-2"><strong>User:</strong> {r.user?.username || r.user}</div>
           <div className="mb-2"><strong>Message:</strong> {r.message}</div>
@@ -8,6 +8,7 @@ import FeedbackItem from "../components/FeedbackItem";
 import { userHasRole } from "../utils/roles";
 import FeedbackTable from "../components/FeedbackTable";
 import BoardMembershipRequests from "../components/BoardMembershipRequests";
+import { BoardEventsProvider } from "../contexts/BoardEventsContext";
 import { set } from "date-fns";
 
 export default function BoardDetail() {
@@ -40,7 +41,7 @@ export default function BoardDetail() {
     api.get(`/feedback/?board=${id}`)
       .then(res => {
         if (!alive) return;
-        setFeedbacks(res.data || []);
+        setFeedbacks(res.data?.results ?? res.data ?? []);
       })
       .catch(() => {
         if (!alive) return;
@@ -71,7 +72,7 @@ export default function BoardDetail() {
   const loadFeedbacks = async () => {
     try {
       const res = await api.get(`/feedback/?board=${id}`);
-      setFeedbacks(res.data || []);
+      setFeedbacks(res.data?.results ?? res.data ?? []);
     } catch (err) {
       setFeedbacks([]);
     }
@@ -190,13 +191,16 @@ export default function BoardDetail() {
       <hr className="my-4" />
 
       <h3 className="text-xl mb-3">Feedback</h3>
-      {(!feedbacks || feedbacks.length === 0) ? (
-        <p>No feedback visible</p>
-      ) : (
-        feedbacks.map(f => (
-          <FeedbackItem key={f.id} feedback={f} onUpdated={onFeedbackUpdated} />
-        ))
-      )}
+      {/* one live event stream for the board, shared by the open comment panels */}
+      <BoardEventsProvider boardId={board.id}>
+        {(!feedbacks || feedbacks.length === 0) ? (
+          <p>No feedback visible</p>
+        ) : (
+          feedbacks.map(f => (
+            <FeedbackItem key={f.id} feedback={f} onUpdated={onFeedbackUpdated} />
+          ))
+        )}
+      </BoardEventsProvider>
     </div>
   );
 }
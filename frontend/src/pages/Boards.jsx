@@ -20,7 +20,7 @@ export default function Boards() {
     setLoading(true);
     try {
       const res = await api.get("/board/");
-      setBoards(res.data);
+      setBoards(res.data.results ?? res.data);
     } catch (err) {
       console.error("Failed to load boards", err);
       setBoards([]);
@@ -5,6 +5,7 @@ import SummaryCards from "../components/dashboard/SummaryCards";
 import TopVoted from "../components/dashboard/TopVoted";
 import TrendsChart from "../components/dashboard/TrendsChart";
 import DistributionChart from "../components/dashboard/DistributionChart";
+import CompletionStats from "../components/dashboard/CompletionStats";
 import { AuthContext } from "../contexts/AuthContext";
 import { userHasRole } from "../utils/roles";
 import { useNavigate } from "react-router-dom";
@@ -30,6 +31,8 @@ export default function Dashboard() {
   const [topVoted, setTopVoted] = useState([]);
   const [trends, setTrends] = useState([]);
   const [distribution, setDistribution] = useState([]);
+  const [timeToComplete, setTimeToComplete] = useState(null);
+  const [funnel, setFunnel] = useState(null);
 
   useEffect(() => {
     if (!user) return;
@@ -46,17 +49,21 @@ export default function Dashboard() {
         to: filters.to ?? undefined,
       };
 
-      const [sRes, tRes, trRes, dRes] = await Promise.all([
+      const [sRes, tRes, trRes, dRes, ttcRes, fRes] = await Promise.all([
         api.get("/analytics/summary/", { params }),
         api.get("/analytics/top_voted/", { params: { ...params, limit: 5 } }),
         api.get("/analytics/trends/", { params: { ...params, granularity: filters.granularity } }),
         api.get("/analytics/distribution/", { params: { ...params, by: filters.by } }),
+        api.get("/analytics/time_to_complete/", { params }),
+        api.get("/analytics/funnel/", { params }),
       ]);
 
       setSummary(sRes.data);
       setTopVoted(tRes.data);
       setTrends(trRes.data);
       setDistribution(dRes.data);
+      setTimeToComplete(ttcRes.data);
+      setFunnel(fRes.data);
     } catch (err) {
       console.error("Dashboard load error", err);
       // keep previous data if any; show console error
@@ -86,8 +93,13 @@ export default function Dashboard() {
         </div>
       </div>
 
-      <div className="mt-6">
-        <DistributionChart data={distribution} by={filters.by} loading={loading} />
+      <div className="grid md:grid-cols-3 gap-4 mt-6">
+        <div className="md:col-span-2">
+          <DistributionChart data={distribution} by={filters.by} loading={loading} />
+        </div>
+        <div>
+          <CompletionStats timeToComplete={timeToComplete} funnel={funnel} loading={loading} />
+        </div>
       </div>
     </div>
   );